@@ -0,0 +1,120 @@
+"""
+Suíte de benchmarks da API e das tarefas de correção/ranking.
+
+    python -m benchmarks --saida relatorio.json
+    python -m benchmarks --suites tarefas --tamanhos 1000 10000 100000
+    python -m benchmarks --suites correcao --tamanhos 10000 100000
+    python -m benchmarks --suites renderers --itens 1000
+    python -m benchmarks --suites middleware
+    python -m benchmarks --suites startup
+    python -m benchmarks --suites carga --workers 1 2 4 --clientes 16
+    python -m benchmarks --settings provas.settings_postgres --keepdb
+
+O banco usado é o banco de teste do settings informado (SQLite ou
+Postgres), criado e destruído a cada execução, salvo com --keepdb.
+"""
+
+import argparse
+import logging
+import platform
+from datetime import UTC, datetime
+
+from benchmarks.utils import banco_de_teste, salvar_relatorio, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--settings", default="provas.settings")
+    parser.add_argument(
+        "--suites",
+        nargs="+",
+        choices=[
+            "api",
+            "tarefas",
+            "correcao",
+            "renderers",
+            "middleware",
+            "startup",
+            "carga",
+        ],
+        default=["api", "tarefas"],
+    )
+    parser.add_argument("--amostras", type=int, default=50)
+    parser.add_argument("--endpoint", help="Mede apenas endpoints contendo o nome.")
+    parser.add_argument("--tentativas", type=int, default=1000)
+    parser.add_argument(
+        "--tamanhos", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    parser.add_argument("--itens", type=int, default=1000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clientes", type=int, default=16)
+    parser.add_argument("--duracao", type=int, default=10)
+    parser.add_argument("--keepdb", action="store_true")
+    parser.add_argument("--saida")
+    args = parser.parse_args()
+
+    setup_django(args.settings)
+    # Os logs por requisição do ninja poluiriam a saída do relatório.
+    logging.disable(logging.WARNING)
+
+    import django
+    from django.core.management import call_command
+
+    from benchmarks.api import medir_endpoints
+    from benchmarks.carga import medir_carga
+    from benchmarks.correcao import medir_motores
+    from benchmarks.middleware import medir_middleware
+    from benchmarks.renderers import medir_renderers
+    from benchmarks.seed import semear
+    from benchmarks.startup import medir_startup
+    from benchmarks.tasks import medir_tarefas
+
+    with banco_de_teste(keepdb=args.keepdb) as connection:
+        relatorio = {
+            "ambiente": {
+                "data": datetime.now(UTC).isoformat(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "banco": connection.vendor,
+            },
+        }
+
+        if "api" in args.suites:
+            call_command("flush", interactive=False, verbosity=0)
+            dados = semear(tentativas=args.tentativas)
+            relatorio["endpoints"] = medir_endpoints(
+                dados, amostras=args.amostras, filtro=args.endpoint
+            )
+
+        if "tarefas" in args.suites:
+            relatorio["tarefas"] = medir_tarefas(args.tamanhos)
+
+        if "correcao" in args.suites:
+            relatorio["correcao"] = medir_motores(args.tamanhos)
+
+        if "middleware" in args.suites:
+            call_command("flush", interactive=False, verbosity=0)
+            dados = semear(tentativas=args.tentativas)
+            relatorio["middleware"] = medir_middleware(dados, amostras=args.amostras)
+
+        if "startup" in args.suites:
+            relatorio["startup"] = medir_startup()
+
+        if "carga" in args.suites:
+            relatorio["carga"] = medir_carga(
+                workers=args.workers,
+                clientes=args.clientes,
+                duracao=args.duracao,
+                tentativas=args.tentativas,
+            )
+
+        if "renderers" in args.suites:
+            relatorio["renderers"] = medir_renderers(
+                itens=args.itens, amostras=args.amostras
+            )
+
+    salvar_relatorio(relatorio, args.saida)
+
+
+if __name__ == "__main__":
+    main()
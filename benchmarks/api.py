@@ -0,0 +1,107 @@
+"""
+Latência e número de queries de cada endpoint de provas/api.py.
+
+Cada amostra roda dentro de uma transação desfeita ao final, para que
+endpoints de escrita possam ser repetidos sobre a mesma massa de dados.
+"""
+
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.test import Client, override_settings
+from ninja_jwt.tokens import AccessToken
+
+from benchmarks.seed import SENHA, corrigir_e_ranquear
+from benchmarks.utils import avisar_status, contar_queries, percentis
+from core.models import TentativaProva
+
+
+def _endpoints(d):
+    return [
+        ("login", "post", "/api/login", None, {"email": d.participante.username, "password": SENHA}),
+        ("register", "post", "/api/register", None, {"email": "novo@bench.com", "password": SENHA, "first_name": "Novo", "last_name": "Usuário"}),
+        ("users_listagem", "get", "/api/users/listagem", "admin", None),
+        ("users_create", "post", "/api/users/create_user", "admin", {"username": "novo", "password": SENHA, "email": "novo@bench.com", "first_name": "Novo", "last_name": "Usuário"}),
+        ("users_retrieve", "post", f"/api/users/{d.participante.id}", "admin", None),
+        ("users_update", "patch", f"/api/users/update/{d.participante.id}", "admin", {"name": "Novo nome"}),
+        ("users_delete", "delete", f"/api/users/delete/{d.participante.id}", "admin", None),
+        ("provas_listagem", "get", "/api/provas/listagem", "admin", None),
+        ("provas_create", "post", "/api/provas/create", "admin", {"title": "Nova", "description": "Nova prova"}),
+        ("provas_retrieve", "post", f"/api/provas/{d.prova.id}", "admin", None),
+        ("provas_update", "patch", f"/api/provas/update/{d.prova.id}", "admin", {"title": "Novo título"}),
+        ("provas_delete", "delete", f"/api/provas/delete/{d.prova.id}", "admin", None),
+        ("provas_questoes", "get", f"/api/provas/{d.prova.id}/questoes", "admin", None),
+        ("provas_add_questoes", "post", f"/api/provas/{d.prova.id}/add_questoes", "admin", {"questao_id": [d.questao.id]}),
+        ("provas_remover_questoes", "delete", f"/api/provas/{d.prova.id}/remover_questoes", "admin", {"questao_id": [d.questao.id]}),
+        ("provas_inscrever", "post", f"/api/provas/{d.prova.id}/inscrever", "admin", {"todos": True}),
+        ("questoes_listagem", "get", "/api/questoes/listagem", "admin", None),
+        ("questoes_create", "post", "/api/questoes/create", "admin", {"text": "Nova questão", "peso": "1.00"}),
+        ("questoes_retrieve", "post", f"/api/questoes/{d.questao.id}", "admin", None),
+        ("questoes_update", "patch", f"/api/questoes/update/{d.questao.id}", "admin", {"text": "Novo enunciado"}),
+        ("questoes_delete", "delete", f"/api/questoes/delete/{d.questao.id}", "admin", None),
+        ("respostas_listagem", "get", "/api/respostas/listagem", "admin", None),
+        ("respostas_create", "post", "/api/respostas/create", "admin", {"questao_id": d.questao.id, "text": "Nova", "is_correct": False}),
+        ("respostas_retrieve", "post", f"/api/respostas/{d.resposta.id}", "admin", None),
+        ("respostas_update", "patch", f"/api/respostas/update/{d.resposta.id}", "admin", {"text": "Novo texto"}),
+        ("respostas_delete", "delete", f"/api/respostas/delete/{d.resposta.id}", "admin", None),
+        ("participante_provas", "get", "/api/participante/provas", "participante", None),
+        ("participante_update_resposta", "patch", f"/api/participante/update_resposta/{d.resposta_participante.id}", "participante", {"resposta_escolhida_id": d.resposta.id}),
+        ("resposta_participante_listagem", "get", "/api/resposta_participante/listagem", "admin", None),
+        ("resposta_participante_update", "patch", f"/api/resposta_participante/update_resposta/{d.resposta_participante.id}", "admin", {"resposta_escolhida_id": d.resposta.id}),
+        ("ranking", "get", f"/api/ranking/prova/{d.prova.id}", "participante", None),
+    ]  # fmt: skip
+
+
+def medir_endpoints(dados, amostras=50, filtro=None):
+    # Só o cache default é desligado (cache_page das listagens); os aliases
+    # gabarito e metrics continuam os do settings.
+    caches = {
+        **settings.CACHES,
+        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    }
+    with override_settings(CACHES=caches):
+        corrigir_e_ranquear(dados)
+        # O participante só altera respostas de tentativas em andamento
+        # (participante_update_resposta).
+        TentativaProva.objects.filter(id=dados.tentativa.id).update(date_completed=None)
+        return _medir(dados, amostras, filtro)
+
+
+def _medir(dados, amostras, filtro):
+    client = Client()
+    headers = {
+        "admin": f"Bearer {AccessToken.for_user(dados.admin)}",
+        "participante": f"Bearer {AccessToken.for_user(dados.participante)}",
+    }
+
+    relatorio = {}
+    for nome, metodo, caminho, auth, payload in _endpoints(dados):
+        if filtro and filtro not in nome:
+            continue
+
+        kwargs = {"content_type": "application/json"}
+        if auth:
+            kwargs["HTTP_AUTHORIZATION"] = headers[auth]
+        if payload is not None:
+            kwargs["data"] = payload
+
+        tempos, queries, status = [], [], set()
+        for _ in range(amostras):
+            with transaction.atomic():
+                with contar_queries() as contador:
+                    inicio = time.perf_counter()
+                    response = getattr(client, metodo)(caminho, **kwargs)
+                    tempos.append(time.perf_counter() - inicio)
+                queries.append(contador.queries)
+                status.add(response.status_code)
+                transaction.set_rollback(True)
+
+        relatorio[nome] = {
+            **percentis(tempos),
+            "queries": max(queries),
+            "status": sorted(status),
+            "falhas": avisar_status(nome, status),
+        }
+
+    return relatorio
@@ -0,0 +1,154 @@
+"""
+Teste de carga do gunicorn (provas.gunicorn_conf) com 1, 2, 4... workers.
+
+A massa de dados vai para um SQLite temporário (SQLITE_PATH), compartilhado
+pelos processos do gunicorn; os clientes são processos separados, cada um
+com uma conexão keep-alive, para que o GIL do gerador de carga não limite a
+vazão medida.
+"""
+
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from benchmarks.utils import percentis
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+_SEMEAR = """
+import json
+
+import django
+
+django.setup()
+
+from ninja_jwt.tokens import AccessToken
+
+from benchmarks.seed import corrigir_e_ranquear, semear
+
+dados = semear(tentativas={tentativas})
+corrigir_e_ranquear(dados)
+
+print(json.dumps({{
+    "prova": dados.prova.id,
+    "admin": str(AccessToken.for_user(dados.admin)),
+    "participante": str(AccessToken.for_user(dados.participante)),
+}}))
+"""
+
+
+def _porta_livre():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _aguardar(porta, limite=30):
+    fim = time.monotonic() + limite
+    while time.monotonic() < fim:
+        try:
+            socket.create_connection(("127.0.0.1", porta), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"gunicorn não respondeu na porta {porta}")
+
+
+def _cliente(porta, requisicoes, duracao):
+    conexao = http.client.HTTPConnection("127.0.0.1", porta, timeout=10)
+    tempos, erros = [], 0
+    fim = time.monotonic() + duracao
+    i = 0
+    while time.monotonic() < fim:
+        caminho, token = requisicoes[i % len(requisicoes)]
+        i += 1
+        inicio = time.perf_counter()
+        try:
+            conexao.request("GET", caminho, headers={"Authorization": token})
+            response = conexao.getresponse()
+            response.read()
+            if response.status != 200:
+                erros += 1
+        except (OSError, http.client.HTTPException):
+            erros += 1
+            conexao.close()
+            conexao = http.client.HTTPConnection("127.0.0.1", porta, timeout=10)
+            continue
+        tempos.append(time.perf_counter() - inicio)
+    conexao.close()
+    return tempos, erros
+
+
+def medir_carga(workers=(1, 2, 4), clientes=16, duracao=10, tentativas=1000):
+    with tempfile.TemporaryDirectory() as diretorio:
+        ambiente = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": "provas.settings",
+            "SQLITE_PATH": str(Path(diretorio) / "carga.sqlite3"),
+        }
+        executar = {"cwd": RAIZ, "env": ambiente, "check": True}
+        subprocess.run(
+            [sys.executable, "manage.py", "migrate", "--noinput", "-v", "0"],
+            **executar,
+        )
+        semeado = subprocess.run(
+            [sys.executable, "-c", _SEMEAR.format(tentativas=tentativas)],
+            capture_output=True,
+            text=True,
+            **executar,
+        )
+        dados = json.loads(semeado.stdout.strip().splitlines()[-1])
+        requisicoes = [
+            (f"/api/provas/{dados['prova']}", f"Bearer {dados['admin']}"),
+            (f"/api/ranking/prova/{dados['prova']}", f"Bearer {dados['participante']}"),
+        ]
+
+        relatorio = {"nucleos": os.cpu_count(), "clientes": clientes}
+        for n in workers:
+            porta = _porta_livre()
+            servidor = subprocess.Popen(
+                [sys.executable, "-m", "gunicorn", "-c", "python:provas.gunicorn_conf"],
+                cwd=RAIZ,
+                env={
+                    **ambiente,
+                    "DJANGO_SETTINGS_MODULE": "provas.settings_api",
+                    "GUNICORN_BIND": f"127.0.0.1:{porta}",
+                    "GUNICORN_WORKERS": str(n),
+                    "GUNICORN_ACCESSLOG": "",
+                },
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                _aguardar(porta)
+                # Aquecimento: conexões e cache de tokens de cada worker.
+                _cliente(porta, requisicoes, 1)
+
+                with ProcessPoolExecutor(max_workers=clientes) as executor:
+                    resultados = list(
+                        executor.map(
+                            _cliente,
+                            [porta] * clientes,
+                            [requisicoes] * clientes,
+                            [duracao] * clientes,
+                        )
+                    )
+            finally:
+                servidor.terminate()
+                servidor.wait()
+
+            tempos = [tempo for parte, _ in resultados for tempo in parte]
+            relatorio[f"workers_{n}"] = {
+                **percentis(tempos),
+                "requisicoes_por_segundo": len(tempos) / duracao,
+                "erros": sum(erros for _, erros in resultados),
+            }
+
+    return relatorio
@@ -0,0 +1,46 @@
+"""
+Compara os motores de provas.correcao (aggregate, gabarito e, com NumPy
+instalado, numpy) calculando as notas das mesmas tentativas.
+"""
+
+import time
+
+from django.core.cache import caches
+from django.core.management import call_command
+
+from benchmarks.seed import semear
+from benchmarks.utils import contar_queries
+from core.models import TentativaProva
+from provas import correcao
+
+
+def medir_motores(tamanhos, provas=10, questoes_por_prova=10):
+    relatorio = {}
+    for tamanho in tamanhos:
+        call_command("flush", interactive=False, verbosity=0)
+        semear(tentativas=tamanho, provas=provas, questoes_por_prova=questoes_por_prova)
+        tentativas = TentativaProva.objects.all()
+
+        resultados = {}
+        referencia = None
+        for motor in correcao.MOTORES:
+            caches["gabarito"].clear()
+            with contar_queries() as queries:
+                inicio = time.perf_counter()
+                notas = correcao.calcular_notas(tentativas, motor=motor)
+                segundos = time.perf_counter() - inicio
+
+            notas = {tentativa.id: tentativa.nota for tentativa in notas}
+            if referencia is None:
+                referencia = notas
+
+            resultados[motor] = {
+                "segundos": segundos,
+                "queries": queries.queries,
+                "segundos_db": queries.tempo,
+                "mesmo_resultado": notas == referencia,
+            }
+
+        relatorio[str(tamanho)] = resultados
+
+    return relatorio
@@ -0,0 +1,78 @@
+"""
+Logins por segundo, por núcleo, para cada perfil de PASSWORD_HASHER_PROFILES.
+
+    python -m benchmarks.hashing --duracao 5 --processos 4 --saida hashing.json
+"""
+
+import argparse
+import time
+from multiprocessing import Pool
+
+from benchmarks.utils import salvar_relatorio, setup_django
+
+SENHA = "senha-de-benchmark"
+
+
+def _medir(perfil, duracao):
+    setup_django()
+
+    from django.conf import settings
+    from django.contrib.auth.hashers import check_password, make_password
+    from django.test import override_settings
+
+    with override_settings(PASSWORD_HASHERS=settings.PASSWORD_HASHER_PROFILES[perfil]):
+        encoded = make_password(SENHA)
+        logins = 0
+        inicio = time.perf_counter()
+        while time.perf_counter() - inicio < duracao:
+            check_password(SENHA, encoded)
+            logins += 1
+
+    return logins / (time.perf_counter() - inicio)
+
+
+def _disponivel(perfil):
+    from django.conf import settings
+    from django.contrib.auth.hashers import get_hasher
+    from django.test import override_settings
+
+    with override_settings(PASSWORD_HASHERS=settings.PASSWORD_HASHER_PROFILES[perfil]):
+        hasher = get_hasher()
+        if hasher.library is None:
+            return True
+        try:
+            hasher._load_library()
+        except ValueError:
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--duracao", type=float, default=3.0)
+    parser.add_argument("--processos", type=int, default=1)
+    parser.add_argument("--saida")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+
+    relatorio = {"processos": args.processos, "perfis": {}}
+    for perfil in settings.PASSWORD_HASHER_PROFILES:
+        if not _disponivel(perfil):
+            relatorio["perfis"][perfil] = {"erro": "biblioteca não instalada"}
+            continue
+
+        with Pool(args.processos) as pool:
+            taxas = pool.starmap(_medir, [(perfil, args.duracao)] * args.processos)
+
+        relatorio["perfis"][perfil] = {
+            "logins_por_segundo": sum(taxas),
+            "logins_por_segundo_por_nucleo": sum(taxas) / args.processos,
+        }
+
+    salvar_relatorio(relatorio, args.saida)
+
+
+if __name__ == "__main__":
+    main()
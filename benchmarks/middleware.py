@@ -0,0 +1,57 @@
+"""
+Custo por requisição das listas de MIDDLEWARE de provas.settings (completa)
+e provas.settings_api (enxuta), nos mesmos endpoints de leitura.
+"""
+
+import importlib
+import time
+
+from django.test import Client, override_settings
+from ninja_jwt.tokens import AccessToken
+
+from benchmarks.seed import corrigir_e_ranquear
+from benchmarks.utils import avisar_status, percentis
+
+PERFIS = {"completo": "provas.settings", "api": "provas.settings_api"}
+
+
+def medir_middleware(dados, amostras=200):
+    corrigir_e_ranquear(dados)
+    headers = {
+        "admin": f"Bearer {AccessToken.for_user(dados.admin)}",
+        "participante": f"Bearer {AccessToken.for_user(dados.participante)}",
+    }
+    endpoints = [
+        ("provas_retrieve", f"/api/provas/{dados.prova.id}", "admin"),
+        ("ranking", f"/api/ranking/prova/{dados.prova.id}", "participante"),
+    ]
+
+    relatorio = {}
+    for perfil, modulo in PERFIS.items():
+        middleware = importlib.import_module(modulo).MIDDLEWARE
+        with override_settings(MIDDLEWARE=middleware):
+            # O Client monta a cadeia de middleware na primeira requisição.
+            client = Client()
+            resultados = {}
+            for nome, caminho, auth in endpoints:
+                client.get(caminho, HTTP_AUTHORIZATION=headers[auth])
+                tempos, status = [], set()
+                for _ in range(amostras):
+                    inicio = time.perf_counter()
+                    response = client.get(caminho, HTTP_AUTHORIZATION=headers[auth])
+                    tempos.append(time.perf_counter() - inicio)
+                    status.add(response.status_code)
+                resultados[nome] = {
+                    **percentis(tempos),
+                    "status": sorted(status),
+                    "falhas": avisar_status(f"{perfil}/{nome}", status),
+                }
+        relatorio[perfil] = {"middleware": len(middleware), **resultados}
+
+    for nome, _, _ in endpoints:
+        completo = relatorio["completo"][nome]["media_ms"]
+        relatorio.setdefault("diferenca_media_ms", {})[nome] = (
+            completo - relatorio["api"][nome]["media_ms"]
+        )
+
+    return relatorio
@@ -0,0 +1,56 @@
+"""
+Compara os renderers de provas.renderers serializando páginas de listagem
+com o formato devolvido pela API (Decimal, datetime, UUID).
+"""
+
+import time
+from datetime import timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+from django.test import RequestFactory
+from django.utils import timezone
+
+from benchmarks.utils import percentis
+from provas import renderers
+
+
+def _pagina(itens):
+    agora = timezone.now()
+    return {
+        "items": [
+            {
+                "id": i,
+                "text": f"Questão {i}: qual alternativa está correta?",
+                "peso": Decimal("1.50"),
+                "active": True,
+                "date_created": agora - timedelta(minutes=i),
+                "date_changed": agora,
+                "assinatura": uuid4(),
+                "provas": [1, 2, 3],
+            }
+            for i in range(itens)
+        ],
+        "count": itens,
+    }
+
+
+def medir_renderers(itens=1000, amostras=50):
+    request = RequestFactory().get("/")
+    pagina = _pagina(itens)
+
+    relatorio = {}
+    for nome, classe in renderers.RENDERERS.items():
+        renderer = classe()
+        tempos = []
+        for _ in range(amostras):
+            inicio = time.perf_counter()
+            corpo = renderer.render(request, pagina, response_status=200)
+            tempos.append(time.perf_counter() - inicio)
+
+        resultado = percentis(tempos)
+        resultado["itens_por_segundo"] = itens * len(tempos) / sum(tempos)
+        resultado["bytes"] = len(corpo)
+        relatorio[nome] = resultado
+
+    return relatorio
@@ -0,0 +1,147 @@
+import random
+from decimal import Decimal
+from types import SimpleNamespace
+
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+from core.models import (
+    Prova,
+    Questao,
+    Resposta,
+    RespostaParticipante,
+    TentativaProva,
+    User,
+)
+
+SENHA = "senha-de-benchmark"
+BATCH_SIZE = 5000
+
+
+def semear(
+    tentativas=1000,
+    provas=10,
+    questoes_por_prova=10,
+    respostas_por_questao=4,
+    concluidas=True,
+    seed=42,
+):
+    aleatorio = random.Random(seed)
+    senha = make_password(SENHA)
+
+    admin = User.objects.create(
+        username="bench-admin",
+        email="bench-admin@bench.com",
+        password=senha,
+        role=User.Role.ADMIN,
+    )
+
+    n_usuarios = -(-tentativas // provas)
+    User.objects.bulk_create(
+        (
+            User(
+                username=f"bench-{i}",
+                email=f"bench-{i}@bench.com",
+                name=f"Participante {i}",
+                password=senha,
+            )
+            for i in range(n_usuarios)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    usuarios_ids = list(
+        User.objects.filter(role=User.Role.PARTICIPANTE).values_list("id", flat=True)
+    )
+
+    Prova.objects.bulk_create(
+        Prova(title=f"Prova {i}", description="Descrição " * 50) for i in range(provas)
+    )
+    provas_ids = list(Prova.objects.values_list("id", flat=True))
+
+    Questao.objects.bulk_create(
+        Questao(
+            text=f"Enunciado da questão {i} " * 10,
+            peso=Decimal(aleatorio.choice(["1.00", "1.50", "2.00", "2.50"])),
+            order=i,
+        )
+        for i in range(provas * questoes_por_prova)
+    )
+    questoes_ids = list(Questao.objects.values_list("id", flat=True))
+
+    questoes_prova = {}
+    relacoes = []
+    for indice, prova_id in enumerate(provas_ids):
+        ids = questoes_ids[
+            indice * questoes_por_prova : (indice + 1) * questoes_por_prova
+        ]
+        questoes_prova[prova_id] = ids
+        relacoes += [
+            Questao.provas.through(questao_id=questao_id, prova_id=prova_id)
+            for questao_id in ids
+        ]
+    Questao.provas.through.objects.bulk_create(relacoes, batch_size=BATCH_SIZE)
+
+    Resposta.objects.bulk_create(
+        (
+            Resposta(questao_id=questao_id, text=f"Alternativa {j}", is_correct=j == 0)
+            for questao_id in questoes_ids
+            for j in range(respostas_por_questao)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    respostas_questao = {}
+    for resposta_id, questao_id in Resposta.objects.values_list("id", "questao_id"):
+        respostas_questao.setdefault(questao_id, []).append(resposta_id)
+
+    agora = timezone.now() if concluidas else None
+    TentativaProva.objects.bulk_create(
+        (
+            TentativaProva(
+                user_id=usuarios_ids[i // provas],
+                prova_id=provas_ids[i % provas],
+                date_completed=agora,
+            )
+            for i in range(tentativas)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+    RespostaParticipante.objects.bulk_create(
+        (
+            RespostaParticipante(
+                tentativa_prova_id=tentativa_id,
+                questao_id=questao_id,
+                resposta_escolhida_id=aleatorio.choice(respostas_questao[questao_id]),
+            )
+            for tentativa_id, prova_id in TentativaProva.objects.values_list(
+                "id", "prova_id"
+            ).iterator()
+            for questao_id in questoes_prova[prova_id]
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+    tentativa = TentativaProva.objects.order_by("id").first()
+    return SimpleNamespace(
+        admin=admin,
+        participante=tentativa.user,
+        prova=tentativa.prova,
+        questao=Questao.objects.get(id=questoes_prova[tentativa.prova_id][0]),
+        resposta=Resposta.objects.filter(
+            questao_id=questoes_prova[tentativa.prova_id][0]
+        ).first(),
+        tentativa=tentativa,
+        resposta_participante=tentativa.tentativas_resposta.first(),
+    )
+
+
+def corrigir_e_ranquear(dados):
+    """Corrige as tentativas semeadas e calcula o ranking da prova medida."""
+    from unittest import mock
+
+    from provas import tasks
+
+    with mock.patch.object(tasks.calcular_ranking, "delay"):
+        tasks.corrigir_provas()
+    with mock.patch.object(tasks.limpar_rankings, "delay"):
+        tasks.calcular_ranking(dados.prova.id)
@@ -0,0 +1,83 @@
+"""
+Tempo de boot dos processos da API e do worker do Celery, com o perfil
+completo (provas.settings) e os enxutos (settings_api, settings_worker).
+Cada medição roda num interpretador novo com ``python -X importtime``.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+_API = (
+    "from provas.wsgi import application\n"
+    "from django.urls import get_resolver\n"
+    "get_resolver().url_patterns\n"
+)
+_WORKER = "import django\ndjango.setup()\nimport provas.tasks\n"
+_MODULOS = ("ninja", "ninja_jwt", "provas.api", "django.contrib.admin", "numpy")
+_CARREGADOS = (
+    f"import sys\nprint(','.join(m for m in {_MODULOS!r} if m in sys.modules))\n"
+)
+
+PERFIS = {
+    "api_completo": ("provas.settings", _API),
+    "api": ("provas.settings_api", _API),
+    "worker_completo": ("provas.settings", _WORKER),
+    "worker": ("provas.settings_worker", _WORKER),
+}
+
+
+def _rodar(settings_module, codigo, importtime=False):
+    ambiente = {**os.environ, "DJANGO_SETTINGS_MODULE": settings_module}
+    comando = [sys.executable, *(["-X", "importtime"] if importtime else []), "-c"]
+    return subprocess.run(
+        [*comando, codigo + _CARREGADOS],
+        cwd=RAIZ,
+        env=ambiente,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _importtime(saida, top):
+    # Linhas "import time: self | cumulativo | módulo"; só os módulos de
+    # primeiro nível (sem indentação) entram na soma.
+    modulos = []
+    for linha in saida.splitlines():
+        if not linha.startswith("import time:") or "[us]" in linha:
+            continue
+        _, cumulativo, modulo = linha.split("|")
+        if not modulo.startswith("  "):
+            modulos.append((int(cumulativo) / 1000, modulo.strip()))
+
+    modulos.sort(reverse=True)
+    return {
+        "imports_ms": sum(ms for ms, _ in modulos),
+        "mais_lentos_ms": {modulo: ms for ms, modulo in modulos[:top]},
+    }
+
+
+def medir_startup(amostras=5, top=10):
+    relatorio = {}
+    for perfil, (settings_module, codigo) in PERFIS.items():
+        tempos = []
+        for _ in range(amostras):
+            inicio = time.perf_counter()
+            _rodar(settings_module, codigo)
+            tempos.append(time.perf_counter() - inicio)
+
+        processo = _rodar(settings_module, codigo, importtime=True)
+        relatorio[perfil] = {
+            "settings": settings_module,
+            "boot_mediana_ms": statistics.median(tempos) * 1000,
+            **_importtime(processo.stderr, top),
+            "carregados": [m for m in processo.stdout.strip().split(",") if m],
+        }
+
+    return relatorio
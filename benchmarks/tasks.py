@@ -0,0 +1,53 @@
+"""
+Tempo e número de queries de corrigir_provas e calcular_ranking para
+diferentes quantidades de tentativas.
+"""
+
+import time
+from unittest import mock
+
+from django.core.management import call_command
+
+from benchmarks.seed import semear
+from benchmarks.utils import contar_queries
+from core.models import Prova
+from provas import tasks
+
+
+def medir_tarefas(tamanhos, provas=10, questoes_por_prova=10):
+    relatorio = {}
+    for tamanho in tamanhos:
+        call_command("flush", interactive=False, verbosity=0)
+        semear(tentativas=tamanho, provas=provas, questoes_por_prova=questoes_por_prova)
+
+        # Os rankings são medidos separadamente abaixo.
+        with mock.patch.object(tasks.calcular_ranking, "delay"):
+            with contar_queries() as correcao:
+                inicio = time.perf_counter()
+                tasks.corrigir_provas()
+                tempo_correcao = time.perf_counter() - inicio
+
+        with (
+            mock.patch.object(tasks.limpar_rankings, "delay"),
+            contar_queries() as ranking,
+        ):
+            inicio = time.perf_counter()
+            for prova_id in Prova.objects.values_list("id", flat=True):
+                tasks.calcular_ranking(prova_id)
+            tempo_ranking = time.perf_counter() - inicio
+
+        relatorio[str(tamanho)] = {
+            "corrigir_provas": {
+                "segundos": tempo_correcao,
+                "queries": correcao.queries,
+                "segundos_db": correcao.tempo,
+            },
+            "calcular_ranking": {
+                "segundos": tempo_ranking,
+                "queries": ranking.queries,
+                "segundos_db": ranking.tempo,
+                "provas": provas,
+            },
+        }
+
+    return relatorio
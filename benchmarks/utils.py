@@ -0,0 +1,96 @@
+import json
+import os
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def setup_django(settings_module="provas.settings"):
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    # A suíte roda em um processo só; sem Redis, o gabarito e as versões dos
+    # tokens ficam na memória.
+    os.environ.setdefault("GABARITO_CACHE_URL", "locmem")
+    os.environ.setdefault("TOKEN_CACHE_URL", "locmem")
+
+    import django
+
+    django.setup()
+
+
+def percentis(amostras):
+    amostras = sorted(amostras)
+    if not amostras:
+        return {}
+
+    def p(q):
+        return amostras[min(len(amostras) - 1, int(q * len(amostras)))]
+
+    return {
+        "n": len(amostras),
+        "media_ms": statistics.fmean(amostras) * 1000,
+        "p50_ms": p(0.50) * 1000,
+        "p90_ms": p(0.90) * 1000,
+        "p95_ms": p(0.95) * 1000,
+        "p99_ms": p(0.99) * 1000,
+        "max_ms": amostras[-1] * 1000,
+    }
+
+
+def avisar_status(nome, status):
+    """Avisa, no stderr, quando a medição de um endpoint não foi só de 2xx."""
+    falhas = sorted(codigo for codigo in status if not 200 <= codigo < 300)
+    if falhas:
+        print(
+            f"aviso: {nome} respondeu {falhas}; a medição não reflete o caminho de sucesso",
+            file=sys.stderr,
+        )
+    return falhas
+
+
+def salvar_relatorio(relatorio, caminho=None):
+    conteudo = json.dumps(relatorio, indent=2, default=str)
+    if caminho:
+        Path(caminho).write_text(conteudo)
+    else:
+        print(conteudo)
+
+
+@contextmanager
+def banco_de_teste(keepdb=False):
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    nome_original = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, keepdb=keepdb)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(nome_original, verbosity=0, keepdb=keepdb)
+        teardown_test_environment()
+
+
+class ContadorQueries:
+    def __init__(self):
+        self.queries = 0
+        self.tempo = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.tempo += time.perf_counter() - inicio
+
+
+@contextmanager
+def contar_queries():
+    from django.db import connection
+
+    contador = ContadorQueries()
+    with connection.execute_wrapper(contador):
+        yield contador
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.8 on 2026-10-19 14:18
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_ranking_registroranking'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='tentativaprova',
+            unique_together={('user', 'prova')},
+        ),
+    ]
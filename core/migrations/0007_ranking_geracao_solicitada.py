@@ -0,0 +1,18 @@
+# Generated by Django 5.1.8 on 2026-10-19 14:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_alter_tentativaprova_unique_together'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ranking',
+            name='geracao_solicitada',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
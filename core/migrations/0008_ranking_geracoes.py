@@ -0,0 +1,31 @@
+# Generated by Django 5.1.8 on 2026-10-19 14:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_ranking_geracao_solicitada'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='registroranking',
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name='ranking',
+            name='geracao_ativa',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='registroranking',
+            name='geracao',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AlterUniqueTogether(
+            name='registroranking',
+            unique_together={('ranking', 'geracao', 'posicao')},
+        ),
+    ]
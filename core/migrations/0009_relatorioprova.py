@@ -0,0 +1,31 @@
+# Generated by Django 5.1.8 on 2026-10-19 14:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_ranking_geracoes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatorioProva',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date_created', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('date_changed', models.DateTimeField(auto_now=True, verbose_name='Modificado em')),
+                ('active', models.BooleanField(default=True, verbose_name='Ativo')),
+                ('assinatura', models.CharField(max_length=64)),
+                ('status', models.CharField(choices=[('PENDENTE', 'Pendente'), ('PROCESSANDO', 'Processando'), ('PRONTO', 'Pronto'), ('ERRO', 'Erro')], default='PENDENTE', max_length=20)),
+                ('arquivo', models.FileField(blank=True, upload_to='relatorios/')),
+                ('erro', models.TextField(blank=True)),
+                ('prova', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.prova')),
+            ],
+            options={
+                'unique_together': {('prova', 'assinatura')},
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.1.8 on 2026-10-19 14:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_relatorioprova'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EstatisticaQuestao',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('respostas', models.BigIntegerField(default=0)),
+                ('acertos', models.BigIntegerField(default=0)),
+                ('corrigidas', models.BigIntegerField(default=0)),
+                ('acertos_corrigidas', models.BigIntegerField(default=0)),
+                ('soma_notas', models.BigIntegerField(default=0)),
+                ('soma_notas_quadrado', models.BigIntegerField(default=0)),
+                ('soma_notas_acertos', models.BigIntegerField(default=0)),
+                ('prova', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.prova')),
+                ('questao', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.questao')),
+            ],
+            options={
+                'unique_together': {('prova', 'questao')},
+            },
+        ),
+        migrations.CreateModel(
+            name='EstatisticaResposta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('escolhas', models.BigIntegerField(default=0)),
+                ('prova', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.prova')),
+                ('questao', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.questao')),
+                ('resposta', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.resposta')),
+            ],
+            options={
+                'unique_together': {('prova', 'resposta')},
+            },
+        ),
+    ]
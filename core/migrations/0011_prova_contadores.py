@@ -0,0 +1,61 @@
+# Generated by Django 5.1.8 on 2026-10-19 14:50
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def preencher_contadores(apps, schema_editor):
+    Prova = apps.get_model("core", "Prova")
+
+    provas = list(
+        Prova.objects.annotate(
+            real_inscritos=Count("tentativaprova"),
+            real_concluidas=Count(
+                "tentativaprova",
+                filter=Q(tentativaprova__date_completed__isnull=False),
+            ),
+            real_corrigidas=Count(
+                "tentativaprova", filter=Q(tentativaprova__nota__isnull=False)
+            ),
+            real_soma_notas=Sum("tentativaprova__nota", default=0),
+        )
+    )
+    for prova in provas:
+        prova.inscritos = prova.real_inscritos
+        prova.concluidas = prova.real_concluidas
+        prova.corrigidas = prova.real_corrigidas
+        prova.soma_notas = prova.real_soma_notas
+    Prova.objects.bulk_update(
+        provas, ["inscritos", "concluidas", "corrigidas", "soma_notas"]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_estatisticas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='prova',
+            name='concluidas',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='prova',
+            name='corrigidas',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='prova',
+            name='inscritos',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='prova',
+            name='soma_notas',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.RunPython(preencher_contadores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.8 on 2026-10-19 15:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_prova_contadores'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EstatisticaPendente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sinal', models.SmallIntegerField()),
+                ('nota', models.PositiveIntegerField(null=True)),
+                ('prova', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.prova')),
+                ('questao', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.questao')),
+                ('resposta', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.resposta')),
+            ],
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.1.8 on 2026-10-19 15:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copiar_contadores(apps, schema_editor):
+    Prova = apps.get_model("core", "Prova")
+    ResumoProva = apps.get_model("core", "ResumoProva")
+
+    ResumoProva.objects.bulk_create(
+        ResumoProva(
+            prova_id=prova["id"],
+            inscritos=prova["inscritos"],
+            concluidas=prova["concluidas"],
+            corrigidas=prova["corrigidas"],
+            soma_notas=prova["soma_notas"],
+        )
+        for prova in Prova.objects.values(
+            "id", "inscritos", "concluidas", "corrigidas", "soma_notas"
+        ).iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_estatisticapendente'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumoProva',
+            fields=[
+                ('prova', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='resumo', serialize=False, to='core.prova')),
+                ('inscritos', models.PositiveIntegerField(default=0)),
+                ('concluidas', models.PositiveIntegerField(default=0)),
+                ('corrigidas', models.PositiveIntegerField(default=0)),
+                ('soma_notas', models.PositiveBigIntegerField(default=0)),
+                ('date_changed', models.DateTimeField(auto_now=True, verbose_name='Modificado em')),
+            ],
+        ),
+        migrations.RunPython(copiar_contadores, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='prova',
+            name='concluidas',
+        ),
+        migrations.RemoveField(
+            model_name='prova',
+            name='corrigidas',
+        ),
+        migrations.RemoveField(
+            model_name='prova',
+            name='inscritos',
+        ),
+        migrations.RemoveField(
+            model_name='prova',
+            name='soma_notas',
+        ),
+    ]
@@ -37,6 +37,24 @@ class Prova(AuditedModel):
         return self.title
 
 
+class ResumoProva(models.Model):
+    """
+    Contadores das tentativas de uma prova, mantidos por provas.contadores;
+    reconciliar_contadores corrige eventuais desvios periodicamente. Ficam
+    fora de Prova para que a atualização a cada tentativa não trave a linha
+    da prova nem mude o seu date_changed.
+    """
+
+    prova = models.OneToOneField(
+        Prova, on_delete=models.CASCADE, primary_key=True, related_name="resumo"
+    )
+    inscritos = models.PositiveIntegerField(default=0)
+    concluidas = models.PositiveIntegerField(default=0)
+    corrigidas = models.PositiveIntegerField(default=0)
+    soma_notas = models.PositiveBigIntegerField(default=0)
+    date_changed = models.DateTimeField("Modificado em", auto_now=True)
+
+
 class Questao(AuditedModel):
     provas = models.ManyToManyField(Prova, related_name="questoes")
     text = models.TextField()
@@ -69,6 +87,9 @@ class TentativaProva(AuditedModel):
     date_completed = models.DateTimeField(null=True, blank=True)
     nota = models.PositiveIntegerField(null=True)
 
+    class Meta:
+        unique_together = [["user", "prova"]]
+
 
 class RespostaParticipante(AuditedModel):
     tentativa_prova = models.ForeignKey(
@@ -86,6 +107,12 @@ class RespostaParticipante(AuditedModel):
 
 class Ranking(AuditedModel):
     prova = models.OneToOneField(Prova, on_delete=models.CASCADE)
+    # Incrementada a cada recálculo solicitado; um calcular_ranking com geração
+    # menor já foi superado e não precisa rodar.
+    geracao_solicitada = models.PositiveBigIntegerField(default=0)
+    # Geração de RegistroRanking exibida. Cada recálculo grava uma geração
+    # nova ao lado da ativa e só então troca este ponteiro.
+    geracao_ativa = models.PositiveBigIntegerField(default=0)
 
     def __str__(self):
         return f"Ranking da {self.prova}"
@@ -95,9 +122,81 @@ class RegistroRanking(AuditedModel):
     ranking = models.ForeignKey(Ranking, on_delete=models.CASCADE)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     tentativa_prova = models.ForeignKey(TentativaProva, on_delete=models.CASCADE)
+    geracao = models.PositiveBigIntegerField(default=0)
     posicao = models.PositiveIntegerField()
     nota = models.PositiveIntegerField()
 
     class Meta:
         ordering = ["posicao"]
-        unique_together = ["ranking", "posicao"]
+        unique_together = ["ranking", "geracao", "posicao"]
+
+
+class RelatorioProva(AuditedModel):
+    class Status(models.TextChoices):
+        PENDENTE = "PENDENTE", "Pendente"
+        PROCESSANDO = "PROCESSANDO", "Processando"
+        PRONTO = "PRONTO", "Pronto"
+        ERRO = "ERRO", "Erro"
+
+    prova = models.ForeignKey(Prova, on_delete=models.CASCADE)
+    # Resumo do estado da prova (questões, respostas e tentativas) quando o
+    # relatório foi pedido; enquanto não mudar, o mesmo arquivo é reaproveitado.
+    assinatura = models.CharField(max_length=64)
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.PENDENTE
+    )
+    arquivo = models.FileField(upload_to="relatorios/", blank=True)
+    erro = models.TextField(blank=True)
+
+    class Meta:
+        unique_together = [["prova", "assinatura"]]
+
+    def __str__(self):
+        return f"Relatório da {self.prova} ({self.status})"
+
+
+class EstatisticaQuestao(models.Model):
+    """
+    Resumo das respostas de uma questão em uma prova, mantido de forma
+    incremental (provas.estatisticas). As somas sobre as notas permitem
+    calcular o índice de discriminação sem reler as respostas.
+    """
+
+    prova = models.ForeignKey(Prova, on_delete=models.CASCADE)
+    questao = models.ForeignKey(Questao, on_delete=models.CASCADE)
+    respostas = models.BigIntegerField(default=0)
+    acertos = models.BigIntegerField(default=0)
+    # Apenas respostas de tentativas já corrigidas
+    corrigidas = models.BigIntegerField(default=0)
+    acertos_corrigidas = models.BigIntegerField(default=0)
+    soma_notas = models.BigIntegerField(default=0)
+    soma_notas_quadrado = models.BigIntegerField(default=0)
+    soma_notas_acertos = models.BigIntegerField(default=0)
+
+    class Meta:
+        unique_together = [["prova", "questao"]]
+
+
+class EstatisticaResposta(models.Model):
+    prova = models.ForeignKey(Prova, on_delete=models.CASCADE)
+    questao = models.ForeignKey(Questao, on_delete=models.CASCADE)
+    resposta = models.ForeignKey(Resposta, on_delete=models.CASCADE)
+    escolhas = models.BigIntegerField(default=0)
+
+    class Meta:
+        unique_together = [["prova", "resposta"]]
+
+
+class EstatisticaPendente(models.Model):
+    """
+    Resposta de participante registrada (sinal=1) ou descontada (sinal=-1)
+    e ainda não consolidada em EstatisticaQuestao e EstatisticaResposta.
+    Salvar uma resposta só insere aqui, sem disputar as linhas de resumo.
+    """
+
+    prova = models.ForeignKey(Prova, on_delete=models.CASCADE)
+    questao = models.ForeignKey(Questao, on_delete=models.CASCADE)
+    resposta = models.ForeignKey(Resposta, on_delete=models.CASCADE)
+    sinal = models.SmallIntegerField()
+    # Nota da tentativa quando a resposta mudou (None se ainda não corrigida)
+    nota = models.PositiveIntegerField(null=True)
@@ -1,4 +1,10 @@
+import asyncio
+
+from django.test import override_settings
+from ninja.errors import HttpError
+
 from core.tests.tests import BaseTestCase
+from provas import hashing
 
 
 class LoginTestCase(BaseTestCase):
@@ -31,3 +37,74 @@ class RegisterTestCase(BaseTestCase):
         self.assertIn("access", response.json())
         self.assertIn("refresh", response.json())
         self.assertEqual(response.data["message"], "Usuário criado com sucesso")
+
+    def test_register_existente(self):
+        payload = {
+            "email": "regular",
+            "password": "regular",
+            "first_name": "new",
+            "last_name": "user",
+        }
+
+        response = self.client.post("/register", json=payload)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["detail"], "Usuário já existente.")
+
+
+class LoginRateLimitTestCase(BaseTestCase):
+    @override_settings(LOGIN_RATE_LIMIT=(2, 60))
+    def test_login_bloqueado_apos_falhas(self):
+        payload = {"email": "regular", "password": "errada"}
+
+        for _ in range(2):
+            response = self.client.post("/login", json=payload)
+            self.assertEqual(response.status_code, 404)
+
+        response = self.client.post(
+            "/login", json={"email": "regular", "password": "regular"}
+        )
+        self.assertEqual(response.status_code, 429)
+
+    @override_settings(LOGIN_RATE_LIMIT=(2, 60))
+    def test_login_sucesso_limpa_falhas(self):
+        self.client.post("/login", json={"email": "regular", "password": "errada"})
+        response = self.client.post(
+            "/login", json={"email": "regular", "password": "regular"}
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.client.post("/login", json={"email": "regular", "password": "errada"})
+        response = self.client.post(
+            "/login", json={"email": "regular", "password": "regular"}
+        )
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(LOGIN_QUEUE_TIMEOUT=0.05)
+class LoginConcorrenciaTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        # Ocupa todas as vagas de hash, como logins em andamento.
+        self.vagas = hashing.settings.LOGIN_MAX_CONCURRENCY
+        for _ in range(self.vagas):
+            hashing._semaforo.acquire()
+
+    def tearDown(self):
+        for _ in range(self.vagas):
+            hashing._semaforo.release()
+        super().tearDown()
+
+    def test_login_ocupado_responde_429(self):
+        response = self.client.post(
+            "/login", json={"email": "regular", "password": "regular"}
+        )
+        self.assertEqual(response.status_code, 429)
+
+    def test_hash_assincrono_nao_enfileira(self):
+        with self.assertRaises(HttpError) as contexto:
+            asyncio.run(hashing.amake_password("senha"))
+        self.assertEqual(contexto.exception.status_code, 429)
+
+    def test_make_passwords_nao_usa_vagas_do_login(self):
+        self.assertEqual(len(hashing.make_passwords(["a", "b"])), 2)
@@ -0,0 +1,85 @@
+import gzip
+import json
+
+from django.test import Client, SimpleTestCase, override_settings
+
+from core import models
+from core.tests.tests import BaseTestCase
+from provas import compressao
+
+
+class NegociacaoTestCase(SimpleTestCase):
+    @override_settings(COMPRESSION_ENCODINGS=["br", "gzip"])
+    def test_negociar(self):
+        self.assertEqual(compressao.negociar("gzip, deflate"), "gzip")
+        self.assertEqual(compressao.negociar("gzip, br;q=0"), "gzip")
+        self.assertIsNone(compressao.negociar("identity"))
+        self.assertIsNone(compressao.negociar(""))
+        if compressao.brotli is not None:
+            self.assertEqual(compressao.negociar("gzip;q=0.5, *"), "br")
+
+
+@override_settings(COMPRESSION_ENCODINGS=["gzip"])
+class CompressaoTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.http = Client()
+        models.Prova.objects.bulk_create(
+            models.Prova(title=f"Prova {i}", description="Prova sobre conjuntos" * 5)
+            for i in range(30)
+        )
+
+    def listar(self, accept_encoding):
+        return self.http.get(
+            "/api/provas/listagem",
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_token}",
+            HTTP_ACCEPT_ENCODING=accept_encoding,
+        )
+
+    def test_listagem_comprimida(self):
+        response = self.listar("gzip, deflate")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(json.loads(gzip.decompress(response.content))["count"], 30)
+
+    def test_sem_compressao(self):
+        response = self.listar("identity")
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response.json()["count"], 30)
+
+    def test_cache_guarda_variante_comprimida(self):
+        primeira = self.listar("gzip")
+
+        # Outro Accept-Encoding com a mesma codificação negociada cai na
+        # mesma entrada do cache, já comprimida.
+        with self.assertNumQueries(0):
+            segunda = self.listar("deflate, gzip;q=0.8")
+
+        self.assertEqual(segunda["Content-Encoding"], "gzip")
+        self.assertEqual(segunda.content, primeira.content)
+
+    def test_resposta_pequena_nao_comprime(self):
+        prova = models.Prova.objects.first()
+        response = self.http.get(
+            f"/api/provas/{prova.id}",
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_token}",
+            HTTP_ACCEPT_ENCODING="gzip",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_exportacao_em_streaming(self):
+        prova = models.Prova.objects.first()
+        response = self.http.get(
+            f"/api/provas/{prova.id}/exportar/tentativas?formato=csv",
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_token}",
+            HTTP_ACCEPT_ENCODING="gzip",
+        )
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        conteudo = gzip.decompress(b"".join(response.streaming_content)).decode()
+        self.assertTrue(conteudo.startswith("id,"))
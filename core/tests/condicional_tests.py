@@ -0,0 +1,98 @@
+from django.test import Client
+
+from core import models
+from core.tests.tests import BaseTestCase
+from provas import tasks
+
+
+class RequisicaoCondicionalTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.http = Client()
+        self.prova = models.Prova.objects.create(
+            title="Prova de Matemática", description="Prova sobre conjuntos"
+        )
+        self.tentativa = models.TentativaProva.objects.create(
+            user=self.regular_user, prova=self.prova
+        )
+
+    def get(self, url, token, **headers):
+        return self.http.get(url, HTTP_AUTHORIZATION=f"Bearer {token}", **headers)
+
+    def test_retrieve_prova_304(self):
+        url = f"/api/provas/{self.prova.id}"
+        response = self.get(url, self.admin_token)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Last-Modified", response)
+        etag = response["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.get(url, self.admin_token, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+        self.prova.title = "Prova de Álgebra"
+        self.prova.save()
+
+        response = self.get(url, self.admin_token, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_contadores_mudam_a_versao_da_prova(self):
+        url = f"/api/provas/{self.prova.id}"
+        etag = self.get(url, self.admin_token)["ETag"]
+        date_changed = self.prova.date_changed
+
+        models.TentativaProva.objects.create(user=self.admin_user, prova=self.prova)
+
+        response = self.get(url, self.admin_token, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["inscritos"], 2)
+        self.prova.refresh_from_db()
+        self.assertEqual(self.prova.date_changed, date_changed)
+
+    def test_sem_autenticacao_nao_responde_304(self):
+        url = f"/api/provas/{self.prova.id}"
+        etag = self.get(url, self.admin_token)["ETag"]
+
+        response = self.get(url, self.regular_token, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_ranking_muda_de_versao_com_nova_tentativa(self):
+        outra = models.TentativaProva.objects.create(
+            user=self.admin_user, prova=self.prova, nota=5
+        )
+        tasks.inserir_no_ranking(outra)
+        url = f"/api/ranking/prova/{self.prova.id}"
+        etag = self.get(url, self.regular_token)["ETag"]
+
+        response = self.get(url, self.regular_token, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.tentativa.nota = 8
+        self.tentativa.save()
+        tasks.inserir_no_ranking(self.tentativa)
+
+        response = self.get(url, self.regular_token, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 2)
+
+    def test_portal_muda_de_versao_ao_finalizar(self):
+        url = "/api/participante/provas"
+        etag = self.get(url, self.regular_token)["ETag"]
+
+        self.assertEqual(
+            self.get(url, self.regular_token, HTTP_IF_NONE_MATCH=etag).status_code,
+            304,
+        )
+
+        with self.settings(GRADING_REALTIME=False):
+            self.http.post(
+                f"/api/participante/finalizar/{self.tentativa.id}",
+                HTTP_AUTHORIZATION=f"Bearer {self.regular_token}",
+            )
+
+        response = self.get(url, self.regular_token, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
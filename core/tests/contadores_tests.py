@@ -0,0 +1,96 @@
+from unittest import mock
+
+from django.db import connection
+
+from core import models
+from core.tests.correcao_tests import CorrecaoBaseTestCase
+from provas import contadores, tasks
+
+
+class ContadoresProvaTestCase(CorrecaoBaseTestCase):
+    def _contadores(self):
+        prova = contadores.com_contadores(models.Prova.objects).get(id=self.prova.id)
+        return {campo: getattr(prova, campo) for campo in contadores.CAMPOS}
+
+    def test_contadores_acompanham_correcao(self):
+        self.assertEqual(
+            self._contadores(),
+            {"inscritos": 2, "concluidas": 2, "corrigidas": 0, "soma_notas": 0},
+        )
+
+        with mock.patch.object(tasks.calcular_ranking, "delay"):
+            tasks.corrigir_provas(paralelo=False)
+
+        self.assertEqual(
+            self._contadores(),
+            {"inscritos": 2, "concluidas": 2, "corrigidas": 2, "soma_notas": 7},
+        )
+
+        response = self.client.get("/provas/listagem", headers=self.get_admin_headers())
+        prova = response.json()["items"][0]
+        self.assertEqual(prova["corrigidas"], 2)
+        self.assertEqual(prova["media_nota"], 3.5)
+
+    def test_inscricao_e_remocao(self):
+        participante = models.User.objects.create_user(
+            username="novo", email="novo@user.com", password="novo"
+        )
+        response = self.client.post(
+            f"/provas/{self.prova.id}/inscrever",
+            json={"user_ids": [participante.id]},
+            headers=self.get_admin_headers(),
+        )
+        self.assertEqual(response.json()["inscritos"], 1)
+        self.assertEqual(self._contadores()["inscritos"], 3)
+
+        self.tentativa_admin.delete()
+        self.assertEqual(
+            self._contadores(),
+            {"inscritos": 2, "concluidas": 1, "corrigidas": 0, "soma_notas": 0},
+        )
+
+    def test_contadores_nao_alteram_a_prova(self):
+        date_changed = self.prova.date_changed
+        resumo = models.ResumoProva.objects.get(prova=self.prova).date_changed
+
+        with mock.patch.object(tasks.calcular_ranking, "delay"):
+            tasks.corrigir_provas(paralelo=False)
+
+        self.prova.refresh_from_db()
+        self.assertEqual(self.prova.date_changed, date_changed)
+        self.assertGreater(
+            models.ResumoProva.objects.get(prova=self.prova).date_changed, resumo
+        )
+
+    def test_reconciliar_cria_resumo_ausente(self):
+        models.ResumoProva.objects.filter(prova=self.prova).delete()
+
+        self.assertEqual(contadores.reconciliar(), 1)
+        self.assertEqual(self._contadores()["inscritos"], 2)
+
+    def test_reconciliar_corrige_desvios(self):
+        models.ResumoProva.objects.filter(prova=self.prova).update(inscritos=10)
+
+        self.assertEqual(contadores.reconciliar(), 1)
+        self.assertEqual(self._contadores()["inscritos"], 2)
+        self.assertEqual(contadores.reconciliar(), 0)
+
+    def test_apagar_prova_com_tentativas(self):
+        prova = models.Prova.objects.create(title="Prova de Física")
+        models.TentativaProva.objects.create(user=self.regular_user, prova=prova)
+
+        response = self.client.delete(
+            f"/provas/delete/{prova.id}", headers=self.get_admin_headers()
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(models.ResumoProva.objects.filter(prova_id=prova.id).exists())
+        # As chaves estrangeiras do SQLite só são verificadas no commit.
+        connection.check_constraints()
+
+    def test_remocao_nao_cria_resumo(self):
+        models.ResumoProva.objects.filter(prova=self.prova).delete()
+
+        self.tentativa_admin.delete()
+
+        self.assertFalse(models.ResumoProva.objects.exists())
@@ -0,0 +1,413 @@
+from unittest import mock
+
+from celery.exceptions import SoftTimeLimitExceeded
+from django.test import override_settings
+from django.utils import timezone
+
+from core import models
+from core.tests.tests import BaseTestCase
+from provas import celery_app, correcao, estatisticas, tasks
+
+
+class CorrecaoBaseTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.prova = models.Prova.objects.create(
+            title="Prova de Matemática", description="Prova sobre conjuntos"
+        )
+        self.questao1 = models.Questao.objects.create(text="Questão 01", peso=3)
+        self.questao2 = models.Questao.objects.create(text="Questão 02", peso=2)
+        self.prova.questoes.set([self.questao1, self.questao2])
+
+        self.certa1 = models.Resposta.objects.create(
+            questao=self.questao1, text="Certa", is_correct=True
+        )
+        self.errada1 = models.Resposta.objects.create(
+            questao=self.questao1, text="Errada", is_correct=False
+        )
+        self.certa2 = models.Resposta.objects.create(
+            questao=self.questao2, text="Certa", is_correct=True
+        )
+
+        self.tentativa_regular = self._tentativa(
+            self.regular_user, [self.certa1, self.certa2]
+        )
+        self.tentativa_admin = self._tentativa(
+            self.admin_user, [self.errada1, self.certa2]
+        )
+
+    def _tentativa(self, user, respostas, prova=None):
+        tentativa = models.TentativaProva.objects.create(
+            user=user, prova=prova or self.prova, date_completed=timezone.now()
+        )
+        for resposta in respostas:
+            models.RespostaParticipante.objects.create(
+                tentativa_prova=tentativa,
+                questao=resposta.questao,
+                resposta_escolhida=resposta,
+            )
+        return tentativa
+
+    def assertNotas(self):
+        self.tentativa_regular.refresh_from_db()
+        self.tentativa_admin.refresh_from_db()
+        self.assertEqual(self.tentativa_regular.nota, 5)
+        self.assertEqual(self.tentativa_admin.nota, 2)
+
+
+class CorrigirProvasTestCase(CorrecaoBaseTestCase):
+    def test_corrigir_provas_serial(self):
+        with mock.patch.object(tasks.calcular_ranking, "delay") as delay:
+            tasks.corrigir_provas(paralelo=False)
+
+        self.assertNotas()
+        delay.assert_called_once_with(self.prova.id, 1)
+
+    @override_settings(GRADING_CHUNK_SIZE=1)
+    def test_corrigir_provas_paralelo(self):
+        outra_prova = models.Prova.objects.create(title="Prova de Física")
+        outra_prova.questoes.add(self.questao1)
+        outra = self._tentativa(self.regular_user, [self.certa1], prova=outra_prova)
+
+        celery_app.conf.task_always_eager = True
+        self.addCleanup(setattr, celery_app.conf, "task_always_eager", False)
+
+        with (
+            mock.patch.object(
+                tasks.corrigir_lote, "s", wraps=tasks.corrigir_lote.s
+            ) as lote,
+            mock.patch.object(tasks.calcular_ranking, "delay") as delay,
+        ):
+            tasks.corrigir_provas(paralelo=True)
+
+        self.assertNotas()
+        outra.refresh_from_db()
+        self.assertEqual(outra.nota, 3)
+        self.assertEqual(lote.call_count, 3)
+        self.assertEqual(
+            sorted(call.args[0] for call in delay.call_args_list),
+            sorted([self.prova.id, outra_prova.id]),
+        )
+
+    def test_corrigir_lote_ignora_tentativas_ja_corrigidas(self):
+        self.tentativa_admin.nota = 10
+        self.tentativa_admin.save()
+
+        provas = tasks.corrigir_lote(
+            [self.tentativa_regular.id, self.tentativa_admin.id]
+        )
+
+        self.assertEqual(provas, [self.prova.id])
+        self.tentativa_admin.refresh_from_db()
+        self.assertEqual(self.tentativa_admin.nota, 10)
+
+    @override_settings(GRADING_CHUNK_SIZE=1)
+    def test_varredura_interrompida_mantem_lotes_gravados(self):
+        calcular = tasks.calcular_notas
+        chamadas = []
+
+        def estourar_no_segundo_lote(tentativas):
+            chamadas.append(tentativas)
+            if len(chamadas) == 2:
+                raise SoftTimeLimitExceeded()
+            return calcular(tentativas)
+
+        with (
+            mock.patch.object(
+                tasks, "calcular_notas", side_effect=estourar_no_segundo_lote
+            ),
+            mock.patch.object(tasks.calcular_ranking, "delay") as delay,
+            self.assertRaises(SoftTimeLimitExceeded),
+        ):
+            tasks.corrigir_provas(paralelo=False)
+
+        self.assertEqual(correcao.pendentes().count(), 1)
+        delay.assert_called_once_with(self.prova.id, 1)
+
+        with mock.patch.object(tasks.calcular_ranking, "delay"):
+            tasks.corrigir_provas(paralelo=False)
+        self.assertNotas()
+
+    def test_correcao_repetida_nao_soma_de_novo(self):
+        # Varredura e corrigir_tentativa calculando a mesma tentativa.
+        primeira = correcao.calcular_notas(correcao.pendentes())
+        segunda = correcao.calcular_notas(correcao.pendentes())
+
+        self.assertEqual(len(correcao.gravar_notas(primeira)), 2)
+        self.assertEqual(correcao.gravar_notas(segunda), [])
+
+        resumo = models.ResumoProva.objects.get(prova=self.prova)
+        self.assertEqual((resumo.corrigidas, resumo.soma_notas), (2, 7))
+        campos = ("questao_id", "corrigidas", "soma_notas", "soma_notas_acertos")
+        estatisticas.consolidar()
+        incremental = list(
+            models.EstatisticaQuestao.objects.order_by(*campos).values_list(*campos)
+        )
+        estatisticas.recalcular(self.prova.id)
+        self.assertEqual(
+            incremental,
+            list(
+                models.EstatisticaQuestao.objects.order_by(*campos).values_list(*campos)
+            ),
+        )
+
+    def test_corrigir_tentativa_ja_corrigida(self):
+        correcao.gravar_notas(correcao.calcular_notas(correcao.pendentes()))
+
+        with mock.patch.object(tasks, "inserir_no_ranking") as inserir:
+            tasks.corrigir_tentativa(self.tentativa_regular.id)
+
+        inserir.assert_not_called()
+
+
+class GabaritoTestCase(CorrecaoBaseTestCase):
+    def test_gabarito_da_prova(self):
+        self.assertEqual(
+            correcao.gabarito(self.prova.id),
+            {
+                self.questao1.id: (frozenset([self.certa1.id]), 3),
+                self.questao2.id: (frozenset([self.certa2.id]), 2),
+            },
+        )
+
+        with self.assertNumQueries(0):
+            correcao.gabarito(self.prova.id)
+
+    def test_alterar_resposta_invalida_gabarito(self):
+        correcao.gabarito(self.prova.id)
+
+        with (
+            mock.patch.object(tasks.recalcular_estatisticas, "delay") as delay,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            self.errada1.is_correct = True
+            self.errada1.save()
+        delay.assert_called_once_with(self.prova.id)
+
+        corretas, _ = correcao.gabarito(self.prova.id)[self.questao1.id]
+        self.assertEqual(corretas, {self.certa1.id, self.errada1.id})
+
+    def test_remover_questao_da_prova_invalida_gabarito(self):
+        correcao.gabarito(self.prova.id)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.prova.questoes.remove(self.questao2)
+
+        self.assertEqual(list(correcao.gabarito(self.prova.id)), [self.questao1.id])
+
+    def test_motores_dao_o_mesmo_resultado(self):
+        tentativas = models.TentativaProva.objects.filter(prova=self.prova)
+
+        for motor in correcao.MOTORES:
+            with self.subTest(motor=motor):
+                notas = {
+                    tentativa.id: tentativa.nota
+                    for tentativa in correcao.calcular_notas(tentativas, motor=motor)
+                }
+                self.assertEqual(
+                    notas,
+                    {self.tentativa_regular.id: 5, self.tentativa_admin.id: 2},
+                )
+
+    def test_corrigir_prova_endpoint(self):
+        with mock.patch.object(tasks.calcular_ranking, "delay") as delay:
+            response = self.client.post(
+                f"/provas/{self.prova.id}/corrigir", headers=self.get_admin_headers()
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["corrigidas"], 2)
+        self.assertNotas()
+        delay.assert_called_once_with(self.prova.id, 1)
+
+        response = self.client.post(
+            f"/provas/{self.prova.id}/corrigir", headers=self.get_regular_headers()
+        )
+        self.assertEqual(response.status_code, 403)
+
+
+class FinalizarTentativaTestCase(CorrecaoBaseTestCase):
+    def setUp(self):
+        super().setUp()
+        models.TentativaProva.objects.filter(id=self.tentativa_regular.id).update(
+            date_completed=None
+        )
+
+        models.TentativaProva.objects.filter(id=self.tentativa_admin.id).update(nota=2)
+        tasks.calcular_ranking(self.prova.id)
+
+    def _finalizar(self, tentativa, headers):
+        with (
+            mock.patch.object(
+                tasks.corrigir_tentativa,
+                "delay",
+                side_effect=tasks.corrigir_tentativa,
+            ) as delay,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            response = self.client.post(
+                f"/participante/finalizar/{tentativa.id}", headers=headers
+            )
+        return response, delay
+
+    def test_finalizar_corrige_e_atualiza_ranking(self):
+        response, delay = self._finalizar(
+            self.tentativa_regular, self.get_regular_headers()
+        )
+
+        self.assertEqual(response.status_code, 200)
+        delay.assert_called_once_with(self.tentativa_regular.id)
+        self.assertNotas()
+        self.assertEqual(
+            list(
+                models.RegistroRanking.objects.filter(
+                    ranking__prova=self.prova
+                ).values_list("tentativa_prova_id", "posicao", "nota")
+            ),
+            [(self.tentativa_regular.id, 1, 5), (self.tentativa_admin.id, 2, 2)],
+        )
+
+    def test_varredura_nao_corrige_tentativa_em_andamento(self):
+        models.RespostaParticipante.objects.filter(
+            tentativa_prova=self.tentativa_regular
+        ).delete()
+        with mock.patch.object(tasks.calcular_ranking, "delay"):
+            tasks.corrigir_provas(paralelo=False)
+            tasks.corrigir_lote([self.tentativa_regular.id])
+
+        self.tentativa_regular.refresh_from_db()
+        self.assertIsNone(self.tentativa_regular.nota)
+
+        for resposta in [self.certa1, self.certa2]:
+            models.RespostaParticipante.objects.create(
+                tentativa_prova=self.tentativa_regular,
+                questao=resposta.questao,
+                resposta_escolhida=resposta,
+            )
+        response, _ = self._finalizar(
+            self.tentativa_regular, self.get_regular_headers()
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotas()
+
+    def test_corrigir_prova_antes_de_finalizar(self):
+        with mock.patch.object(tasks.calcular_ranking, "delay"):
+            response = self.client.post(
+                f"/provas/{self.prova.id}/corrigir", headers=self.get_admin_headers()
+            )
+
+        self.assertEqual(response.json()["corrigidas"], 0)
+        self.tentativa_regular.refresh_from_db()
+        self.assertIsNone(self.tentativa_regular.nota)
+
+        self._finalizar(self.tentativa_regular, self.get_regular_headers())
+        self.assertNotas()
+
+    def test_finalizar_duas_vezes_enfileira_uma_correcao(self):
+        self._finalizar(self.tentativa_regular, self.get_regular_headers())
+        response, delay = self._finalizar(
+            self.tentativa_regular, self.get_regular_headers()
+        )
+
+        self.assertEqual(response.status_code, 400)
+        delay.assert_not_called()
+
+    def test_finalizar_tentativa_de_outro_usuario(self):
+        response, delay = self._finalizar(
+            self.tentativa_admin, self.get_regular_headers()
+        )
+
+        self.assertEqual(response.status_code, 404)
+        delay.assert_not_called()
+
+
+class FilasTestCase(BaseTestCase):
+    def test_correcao_de_tentativa_nao_divide_fila_com_tarefas_longas(self):
+        def fila(tarefa):
+            return celery_app.amqp.router.route({}, tarefa)["queue"].name
+
+        self.assertEqual(fila("provas.tasks.corrigir_tentativa"), "correcao")
+        for tarefa in (
+            "provas.tasks.corrigir_lote",
+            "provas.tasks.calcular_ranking",
+            "provas.tasks.importar_usuarios",
+        ):
+            self.assertNotEqual(fila(tarefa), "correcao")
+
+
+class CalcularRankingTestCase(CorrecaoBaseTestCase):
+    def setUp(self):
+        super().setUp()
+        models.TentativaProva.objects.filter(id=self.tentativa_regular.id).update(
+            nota=5
+        )
+        models.TentativaProva.objects.filter(id=self.tentativa_admin.id).update(nota=2)
+
+    def test_tarefa_reentregue_regrava_a_geracao(self):
+        with mock.patch.object(tasks.calcular_ranking, "delay"):
+            tasks.solicitar_ranking(self.prova.id)
+
+        with mock.patch.object(tasks.limpar_rankings, "delay"):
+            tasks.calcular_ranking(self.prova.id, 1)
+            tasks.calcular_ranking(self.prova.id, 1)
+
+        self.assertEqual(
+            list(
+                models.RegistroRanking.objects.filter(
+                    ranking__prova=self.prova
+                ).values_list("geracao", "posicao", "nota")
+            ),
+            [(1, 1, 5), (1, 2, 2)],
+        )
+
+    def test_geracao_superada_e_descartada(self):
+        with mock.patch.object(tasks.calcular_ranking, "delay") as delay:
+            tasks.solicitar_ranking(self.prova.id)
+            tasks.solicitar_ranking(self.prova.id)
+
+        self.assertEqual(
+            [call.args for call in delay.call_args_list],
+            [(self.prova.id, 1), (self.prova.id, 2)],
+        )
+
+        tasks.calcular_ranking(self.prova.id, 1)
+        self.assertFalse(models.RegistroRanking.objects.exists())
+
+        tasks.calcular_ranking(self.prova.id, 2)
+        self.assertEqual(
+            list(
+                models.RegistroRanking.objects.values_list(
+                    "tentativa_prova_id", "posicao"
+                )
+            ),
+            [(self.tentativa_regular.id, 1), (self.tentativa_admin.id, 2)],
+        )
+
+    def test_recalcular_publica_nova_geracao_e_limpa_as_antigas(self):
+        tasks.calcular_ranking(self.prova.id)
+        models.TentativaProva.objects.filter(id=self.tentativa_admin.id).update(nota=9)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            tasks.calcular_ranking(self.prova.id)
+
+        # Antes da limpeza as duas gerações coexistem, mas só a ativa é lida.
+        self.assertEqual(models.RegistroRanking.objects.count(), 4)
+        response = self.client.get(
+            f"/ranking/prova/{self.prova.id}", headers=self.get_regular_headers()
+        )
+        self.assertEqual(
+            [item["tentativa_prova"] for item in response.json()["items"]],
+            [self.tentativa_admin.id, self.tentativa_regular.id],
+        )
+
+        with mock.patch.object(
+            tasks.limpar_rankings, "delay", side_effect=tasks.limpar_rankings
+        ):
+            for callback in callbacks:
+                callback()
+        self.assertEqual(
+            set(models.RegistroRanking.objects.values_list("geracao", flat=True)),
+            {2},
+        )
@@ -0,0 +1,162 @@
+from unittest import mock
+
+from django.db import connection
+
+from core import models
+from core.tests.correcao_tests import CorrecaoBaseTestCase
+from provas import estatisticas, tasks
+
+
+class EstatisticasTestCase(CorrecaoBaseTestCase):
+    def _estatisticas(self):
+        return {
+            estatistica["questao_id"]: estatistica
+            for estatistica in estatisticas.da_prova(self.prova.id)
+        }
+
+    def _tabelas(self):
+        estatisticas.consolidar()
+        return (
+            sorted(
+                models.EstatisticaQuestao.objects.values_list(
+                    "questao_id",
+                    "respostas",
+                    "acertos",
+                    "corrigidas",
+                    "acertos_corrigidas",
+                    "soma_notas",
+                    "soma_notas_quadrado",
+                    "soma_notas_acertos",
+                )
+            ),
+            sorted(
+                models.EstatisticaResposta.objects.filter(escolhas__gt=0).values_list(
+                    "resposta_id", "escolhas"
+                )
+            ),
+        )
+
+    def test_respostas_atualizam_estatisticas(self):
+        questao1 = self._estatisticas()[self.questao1.id]
+
+        self.assertEqual(questao1["respostas"], 2)
+        self.assertEqual(questao1["percentual_acerto"], 0.5)
+        self.assertEqual(questao1["escolhas"], {self.certa1.id: 1, self.errada1.id: 1})
+        self.assertIsNone(questao1["discriminacao"])
+
+    def test_notas_e_alteracoes_mantem_resultado_igual_ao_recalculo(self):
+        with mock.patch.object(tasks.calcular_ranking, "delay"):
+            tasks.corrigir_provas(paralelo=False)
+
+        resposta = models.RespostaParticipante.objects.get(
+            tentativa_prova=self.tentativa_admin, questao=self.questao1
+        )
+        resposta.resposta_escolhida = self.certa1
+        resposta.save()
+        models.RespostaParticipante.objects.filter(
+            tentativa_prova=self.tentativa_regular, questao=self.questao2
+        ).delete()
+
+        incremental = self._tabelas()
+        estatisticas.recalcular(self.prova.id)
+        self.assertEqual(incremental, self._tabelas())
+
+    def test_salvar_resposta_nao_atualiza_resumo(self):
+        estatisticas.consolidar()
+        antes = self._tabelas()
+
+        resposta = models.RespostaParticipante.objects.get(
+            tentativa_prova=self.tentativa_admin, questao=self.questao1
+        )
+        resposta.resposta_escolhida = self.certa1
+        with self.assertNumQueries(3):
+            resposta.save()
+        self.assertEqual(models.EstatisticaPendente.objects.count(), 2)
+
+        self.assertNotEqual(antes, self._tabelas())
+        self.assertFalse(models.EstatisticaPendente.objects.exists())
+        incremental = self._tabelas()
+        estatisticas.recalcular(self.prova.id)
+        self.assertEqual(incremental, self._tabelas())
+
+    def test_apagar_tentativa_desconta_em_lote(self):
+        with mock.patch.object(tasks.calcular_ranking, "delay"):
+            tasks.corrigir_provas(paralelo=False)
+        estatisticas.consolidar()
+
+        self.tentativa_admin.delete()
+
+        self.assertEqual(models.EstatisticaPendente.objects.count(), 2)
+        incremental = self._tabelas()
+        estatisticas.recalcular(self.prova.id)
+        self.assertEqual(incremental, self._tabelas())
+
+    def test_apagar_usuario_nao_registra_por_resposta(self):
+        self._tentativa(self.regular_user, [self.certa1], prova=self._outra_prova())
+
+        # Duas queries por tentativa (ler as respostas e inserir as
+        # pendências) e nenhuma por resposta apagada.
+        with self.assertNumQueries(16):
+            self.regular_user.delete()
+
+        self.assertEqual(models.EstatisticaPendente.objects.filter(sinal=-1).count(), 3)
+
+    def _outra_prova(self):
+        prova = models.Prova.objects.create(title="Prova de Física")
+        prova.questoes.add(self.questao1)
+        return prova
+
+    def _apagar(self, objeto):
+        with (
+            mock.patch.object(tasks.recalcular_estatisticas, "delay") as delay,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            objeto.delete()
+        # As chaves estrangeiras do SQLite só são verificadas no commit.
+        connection.check_constraints()
+        return delay
+
+    def test_apagar_prova(self):
+        self._apagar(self.prova)
+
+        self.assertFalse(models.EstatisticaPendente.objects.exists())
+        self.assertFalse(models.EstatisticaQuestao.objects.exists())
+
+    def test_apagar_questao(self):
+        self._apagar(self.questao1)
+
+        self.assertEqual(
+            set(
+                models.EstatisticaPendente.objects.values_list("questao_id", flat=True)
+            ),
+            {self.questao2.id},
+        )
+
+    def test_apagar_resposta_recalcula(self):
+        delay = self._apagar(self.errada1)
+
+        delay.assert_called_once_with(self.prova.id)
+        self.assertFalse(
+            models.EstatisticaPendente.objects.filter(resposta=self.errada1.id).exists()
+        )
+
+    def test_discriminacao(self):
+        with mock.patch.object(tasks.calcular_ranking, "delay"):
+            tasks.corrigir_provas(paralelo=False)
+
+        # Quem acertou a questão 1 teve nota maior.
+        self.assertAlmostEqual(
+            self._estatisticas()[self.questao1.id]["discriminacao"], 1.0
+        )
+
+    def test_endpoint_exige_admin(self):
+        response = self.client.get(
+            f"/provas/{self.prova.id}/estatisticas", headers=self.get_admin_headers()
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 2)
+
+        response = self.client.get(
+            f"/provas/{self.prova.id}/estatisticas", headers=self.get_regular_headers()
+        )
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,49 @@
+import csv
+import io
+import json
+
+from core.tests.correcao_tests import CorrecaoBaseTestCase
+from provas import tasks
+
+
+class ExportacaoTestCase(CorrecaoBaseTestCase):
+    def setUp(self):
+        super().setUp()
+        tasks.corrigir_tentativa(self.tentativa_regular.id)
+        tasks.corrigir_tentativa(self.tentativa_admin.id)
+
+    def _exportar(self, recurso, formato="csv", headers=None):
+        response = self.client.get(
+            f"/provas/{self.prova.id}/exportar/{recurso}?formato={formato}",
+            headers=headers or self.get_admin_headers(),
+        )
+        return response, response.content.decode()
+
+    def test_exportar_ranking_csv(self):
+        response, conteudo = self._exportar("ranking")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        linhas = list(csv.DictReader(io.StringIO(conteudo)))
+        self.assertEqual(
+            [(linha["posicao"], linha["tentativa_prova_id"]) for linha in linhas],
+            [
+                ("1", str(self.tentativa_regular.id)),
+                ("2", str(self.tentativa_admin.id)),
+            ],
+        )
+
+    def test_exportar_respostas_ndjson(self):
+        response, conteudo = self._exportar("respostas", formato="ndjson")
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        linhas = [json.loads(linha) for linha in conteudo.splitlines()]
+        self.assertEqual(len(linhas), 4)
+        self.assertEqual(
+            sum(linha["resposta_escolhida__is_correct"] for linha in linhas), 3
+        )
+
+    def test_exportar_exige_admin(self):
+        response, _ = self._exportar("tentativas", headers=self.get_regular_headers())
+        self.assertEqual(response.status_code, 403)
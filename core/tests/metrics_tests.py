@@ -0,0 +1,56 @@
+from django.test import Client, override_settings
+
+from core import models
+from core.tests.tests import BaseTestCase
+
+
+class InstrumentationMiddlewareTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.http = Client()
+        self.prova = models.Prova.objects.create(
+            title="Prova de Matemática", description="Prova sobre conjuntos"
+        )
+
+    def test_server_timing_header(self):
+        response = self.http.post(
+            f"/api/provas/{self.prova.id}",
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_token}",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("db;dur=", response["Server-Timing"])
+        self.assertIn("render;dur=", response["Server-Timing"])
+        self.assertIn("total;dur=", response["Server-Timing"])
+
+    def test_metrics_endpoint(self):
+        self.http.post(
+            f"/api/provas/{self.prova.id}",
+            HTTP_AUTHORIZATION=f"Bearer {self.admin_token}",
+        )
+
+        response = self.http.get("/metrics", REMOTE_ADDR="127.0.0.1")
+
+        self.assertEqual(response.status_code, 200)
+        conteudo = response.content.decode()
+        self.assertIn(
+            'http_requests_total{route="api/provas/<prova_id>",method="POST",status="200"}',
+            conteudo,
+        )
+        self.assertIn("http_request_db_queries_bucket", conteudo)
+        self.assertIn("jwt_token_cache_hits_total", conteudo)
+
+    def test_metrics_endpoint_ip_nao_permitido(self):
+        response = self.http.get("/metrics", REMOTE_ADDR="10.0.0.1")
+
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_log_de_query_lenta(self):
+        with self.assertLogs("provas.sql_lento", level="WARNING") as logs:
+            self.http.post(
+                f"/api/provas/{self.prova.id}",
+                HTTP_AUTHORIZATION=f"Bearer {self.admin_token}",
+            )
+
+        self.assertTrue(any("core_prova" in linha for linha in logs.output))
@@ -74,7 +74,7 @@ class ParticipanteCreateTentativaRespostaTestCase(BaseTestCase):
         response = self.client.post(
             "/participante/create_resposta",
             json=payload,
-            headers=self.get_admin_headers(),
+            headers=self.get_regular_headers(),
         )
 
         self.assertEqual(response.status_code, 200)
@@ -92,6 +92,40 @@ class ParticipanteCreateTentativaRespostaTestCase(BaseTestCase):
             payload["resposta_escolhida_id"],
         )
 
+    def test_create_em_tentativa_de_outro_usuario(self):
+        payload = {
+            "tentativa_prova_id": self.tentativa_prova.id,
+            "questao_id": self.questao.id,
+            "resposta_escolhida_id": self.resposta3.id,
+        }
+
+        response = self.client.post(
+            "/participante/create_resposta",
+            json=payload,
+            headers=self.get_admin_headers(),
+        )
+
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(models.RespostaParticipante.objects.exists())
+
+    def test_create_em_tentativa_finalizada(self):
+        self.tentativa_prova.date_completed = timezone.now()
+        self.tentativa_prova.save()
+        payload = {
+            "tentativa_prova_id": self.tentativa_prova.id,
+            "questao_id": self.questao.id,
+            "resposta_escolhida_id": self.resposta3.id,
+        }
+
+        response = self.client.post(
+            "/participante/create_resposta",
+            json=payload,
+            headers=self.get_regular_headers(),
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(models.RespostaParticipante.objects.exists())
+
 
 class ParticipantePatchTentativaRespostaTestCase(BaseTestCase):
     def setUp(self):
@@ -142,3 +176,17 @@ class ParticipantePatchTentativaRespostaTestCase(BaseTestCase):
         self.assertEqual(
             updated_resposta.resposta_escolhida.id, payload["resposta_escolhida_id"]
         )
+
+    def test_update_em_tentativa_finalizada(self):
+        self.tentativa_prova.date_completed = timezone.now()
+        self.tentativa_prova.save()
+
+        response = self.client.patch(
+            f"/participante/update_resposta/{self.resposta_participante.id}",
+            json={"resposta_escolhida_id": self.resposta3.id},
+            headers=self.get_regular_headers(),
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.resposta_participante.refresh_from_db()
+        self.assertEqual(self.resposta_participante.resposta_escolhida, self.resposta1)
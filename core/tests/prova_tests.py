@@ -1,5 +1,7 @@
 from core import models
 from core.tests.tests import BaseTestCase
+from provas import bulk
+from provas.api import api
 
 
 class ProvaListagemTestCase(BaseTestCase):
@@ -26,6 +28,32 @@ class ProvaListagemTestCase(BaseTestCase):
         self.assertIn("Prova de Biologia", titles)
         self.assertIn("Prova de História", titles)
 
+    def test_fields_restringe_campos(self):
+        response = self.client.get(
+            "/provas/listagem?fields=id,title,media_nota",
+            headers=self.get_admin_headers(),
+        )
+
+        self.assertEqual(response.status_code, 200)
+        item = response.json()["items"][0]
+        self.assertEqual(set(item), {"id", "title", "media_nota"})
+        self.assertIsNone(item["media_nota"])
+
+    def test_sem_fields_devolve_tudo(self):
+        response = self.client.get("/provas/listagem", headers=self.get_admin_headers())
+
+        item = response.json()["items"][0]
+        self.assertLessEqual(
+            {"id", "title", "active", "inscritos", "media_nota"}, set(item)
+        )
+
+    def test_fields_invalido(self):
+        response = self.client.get(
+            "/provas/listagem?fields=title,senha", headers=self.get_admin_headers()
+        )
+
+        self.assertEqual(response.status_code, 400)
+
 
 class ProvaCreateTestCase(BaseTestCase):
     def test_create_prova_success(self):
@@ -63,6 +91,13 @@ class ProvaRetrieveTestCase(BaseTestCase):
         self.assertEqual(response.json()["title"], self.prova.title)
         self.assertEqual(response.json()["description"], self.prova.description)
 
+    def test_schema_do_retrieve_tem_campos_obrigatorios(self):
+        schemas = api.get_openapi_schema()["components"]["schemas"]
+
+        self.assertIn("title", schemas["ProvasOut"]["required"])
+        self.assertIn("media_nota", schemas["ProvasOut"]["required"])
+        self.assertNotIn("required", schemas["ProvasProjecao"])
+
 
 class ProvaPatchTestCase(BaseTestCase):
     def setUp(self):
@@ -207,3 +242,65 @@ class ProvaDeleteQuestoesTestCase(BaseTestCase):
 
         count = self.prova.questoes.count()
         self.assertEqual(count, 2)
+
+
+class ProvaInscreverParticipantesTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.prova = models.Prova.objects.create(
+            title="Prova de Física", description="Prova sobre termodinâmica"
+        )
+        self.alunos = [
+            models.User.objects.create(
+                username=f"aluno{i}", email=f"aluno{i}@escola.com", name="Aluno"
+            )
+            for i in range(3)
+        ]
+        models.TentativaProva.objects.create(user=self.alunos[0], prova=self.prova)
+
+    def test_inscrever_por_ids(self):
+        payload = {"user_ids": [aluno.id for aluno in self.alunos]}
+
+        response = self.client.post(
+            f"/provas/{self.prova.id}/inscrever",
+            json=payload,
+            headers=self.get_admin_headers(),
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["inscritos"], 2)
+        self.assertEqual(
+            models.TentativaProva.objects.filter(prova=self.prova).count(), 3
+        )
+        self.assertEqual(models.ResumoProva.objects.get(prova=self.prova).inscritos, 3)
+
+    def test_inscrever_em_lotes_conta_so_os_inseridos(self):
+        usuarios = models.User.objects.filter(username__startswith="aluno")
+
+        self.assertEqual(bulk.inscrever_participantes(self.prova, usuarios, 1), 2)
+        self.assertEqual(bulk.inscrever_participantes(self.prova, usuarios, 1), 0)
+        self.assertEqual(models.ResumoProva.objects.get(prova=self.prova).inscritos, 3)
+
+    def test_inscrever_todos(self):
+        response = self.client.post(
+            f"/provas/{self.prova.id}/inscrever",
+            json={"todos": True},
+            headers=self.get_admin_headers(),
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["inscritos"], 3)
+        self.assertFalse(
+            models.TentativaProva.objects.filter(
+                prova=self.prova, user=self.admin_user
+            ).exists()
+        )
+
+    def test_inscrever_sem_filtro(self):
+        response = self.client.post(
+            f"/provas/{self.prova.id}/inscrever",
+            json={},
+            headers=self.get_admin_headers(),
+        )
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,118 @@
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.test import override_settings
+from django.utils import timezone
+
+from core import models
+from core.tests.correcao_tests import CorrecaoBaseTestCase
+from provas import tasks
+
+
+class RelatorioTestCase(CorrecaoBaseTestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        tasks.corrigir_tentativa(self.tentativa_regular.id)
+        tasks.corrigir_tentativa(self.tentativa_admin.id)
+
+    def _solicitar(self):
+        with (
+            mock.patch.object(
+                tasks.gerar_relatorio, "delay", side_effect=tasks.gerar_relatorio
+            ) as delay,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            response = self.client.post(
+                f"/provas/{self.prova.id}/relatorios",
+                headers=self.get_admin_headers(),
+            )
+        return response, delay
+
+    def test_gera_e_baixa_relatorio(self):
+        response, _ = self._solicitar()
+        self.assertEqual(response.status_code, 200)
+
+        relatorio_id = response.json()["id"]
+        response = self.client.get(
+            f"/relatorios/{relatorio_id}", headers=self.get_admin_headers()
+        )
+        self.assertEqual(response.json()["status"], "PRONTO")
+
+        response = self.client.get(
+            f"/relatorios/{relatorio_id}/download", headers=self.get_admin_headers()
+        )
+        self.assertEqual(response.status_code, 200)
+        relatorio = json.loads(response.content)
+        self.assertEqual(relatorio["notas"]["total"], 2)
+        self.assertEqual(relatorio["distribuicao_notas"], {"2": 1, "5": 1})
+
+        questao1 = next(
+            q for q in relatorio["questoes"] if q["questao_id"] == self.questao1.id
+        )
+        self.assertEqual(questao1["dificuldade"], 0.5)
+        self.assertEqual(
+            questao1["frequencia_respostas"],
+            {str(self.certa1.id): 1, str(self.errada1.id): 1},
+        )
+
+    def test_prova_inalterada_reaproveita_relatorio(self):
+        primeiro, _ = self._solicitar()
+        segundo, delay = self._solicitar()
+
+        self.assertEqual(primeiro.json()["id"], segundo.json()["id"])
+        delay.assert_not_called()
+
+        models.Resposta.objects.create(questao=self.questao2, text="Nova")
+        terceiro, delay = self._solicitar()
+
+        self.assertNotEqual(primeiro.json()["id"], terceiro.json()["id"])
+        delay.assert_called_once()
+
+    def _travar(self, relatorio_id, ha):
+        # update() não aplica auto_now: simula o worker que caiu no meio.
+        models.RelatorioProva.objects.filter(id=relatorio_id).update(
+            status=models.RelatorioProva.Status.PROCESSANDO,
+            date_changed=timezone.now() - ha,
+        )
+
+    def test_reentrega_retoma_relatorio_orfao(self):
+        relatorio_id = self._solicitar()[0].json()["id"]
+        self._travar(relatorio_id, timedelta(seconds=settings.RELATORIO_TIMEOUT + 1))
+
+        tasks.gerar_relatorio(relatorio_id)
+
+        relatorio = models.RelatorioProva.objects.get(id=relatorio_id)
+        self.assertEqual(relatorio.status, models.RelatorioProva.Status.PRONTO)
+
+    def test_reentrega_nao_duplica_relatorio_em_andamento(self):
+        relatorio_id = self._solicitar()[0].json()["id"]
+        self._travar(relatorio_id, timedelta(seconds=1))
+
+        with mock.patch("provas.relatorios.gerar") as gerar:
+            tasks.gerar_relatorio(relatorio_id)
+            response, delay = self._solicitar()
+
+        gerar.assert_not_called()
+        delay.assert_not_called()
+        self.assertEqual(response.json()["status"], "PROCESSANDO")
+
+    def test_novo_pedido_reenfileira_relatorio_orfao(self):
+        relatorio_id = self._solicitar()[0].json()["id"]
+        self._travar(relatorio_id, timedelta(seconds=settings.RELATORIO_TIMEOUT + 1))
+
+        response, delay = self._solicitar()
+
+        self.assertEqual(response.json()["status"], "PENDENTE")
+        delay.assert_called_once_with(relatorio_id)
+        relatorio = models.RelatorioProva.objects.get(id=relatorio_id)
+        self.assertEqual(relatorio.status, models.RelatorioProva.Status.PRONTO)
@@ -0,0 +1,49 @@
+import json
+import unittest
+from datetime import UTC, datetime
+from decimal import Decimal
+from uuid import uuid4
+
+from django.test import RequestFactory, SimpleTestCase
+
+from provas import renderers
+
+
+@unittest.skipUnless(renderers.orjson, "orjson não instalado")
+class OrjsonRendererTestCase(SimpleTestCase):
+    def setUp(self):
+        self.request = RequestFactory().get("/")
+
+    def render(self, renderer, data):
+        return renderer.render(self.request, data, response_status=200)
+
+    def test_mesmo_json_do_renderer_padrao(self):
+        data = {
+            "peso": Decimal("1.50"),
+            "date_created": datetime(2024, 1, 1, 12, 0, 0, 123456, tzinfo=UTC),
+            "assinatura": uuid4(),
+            "escolhas": {1: 2, 3: 4},
+            "items": [{"id": 1, "nota": None}],
+        }
+
+        orjson_ = self.render(renderers.OrjsonRenderer(), data)
+        padrao = self.render(renderers.TimedJSONRenderer(), data)
+
+        self.assertIsInstance(orjson_, bytes)
+        self.assertEqual(json.loads(orjson_), json.loads(padrao))
+        self.assertEqual(json.loads(orjson_)["peso"], "1.50")
+        self.assertEqual(
+            json.loads(orjson_)["date_created"], "2024-01-01T12:00:00.123Z"
+        )
+
+    def test_bytes_prontos(self):
+        corpo = b'{"id":1}'
+
+        self.assertIs(self.render(renderers.OrjsonRenderer(), corpo), corpo)
+        self.assertTrue(hasattr(self.request, "tempo_render"))
+
+    def test_renderer_configurado(self):
+        with self.settings(API_JSON_RENDERER="json"):
+            self.assertIs(type(renderers.renderer()), renderers.TimedJSONRenderer)
+
+        self.assertIsInstance(renderers.renderer("orjson"), renderers.OrjsonRenderer)
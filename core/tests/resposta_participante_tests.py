@@ -44,7 +44,7 @@ class RespostaParticipanteListagemTestCase(BaseTestCase):
         )
 
         self.tentativa_prova2 = models.TentativaProva.objects.create(
-            user=self.regular_user,
+            user=self.admin_user,
             prova=self.prova,
         )
 
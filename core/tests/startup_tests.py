@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+
+class StartupWorkerTestCase(SimpleTestCase):
+    def test_worker_nao_importa_a_api(self):
+        codigo = (
+            "import sys, django\n"
+            "django.setup()\n"
+            "import provas.tasks\n"
+            "modulos = ('ninja', 'ninja_jwt', 'provas.api', 'provas.schemas',\n"
+            "           'django.contrib.admin', 'numpy')\n"
+            "print(','.join(m for m in modulos if m in sys.modules))\n"
+        )
+        processo = subprocess.run(
+            [sys.executable, "-c", codigo],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": "provas.settings_worker"},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        self.assertEqual(processo.stdout.strip(), "")
@@ -0,0 +1,57 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.utils import timezone
+
+from core import models
+from core.tests.tests import BaseTestCase
+from provas import task_metrics, tasks
+
+
+class TaskMetricsTestCase(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        caches["metrics"].clear()
+
+        self.prova = models.Prova.objects.create(
+            title="Prova de Matemática", description="Prova sobre conjuntos"
+        )
+        self.questao = models.Questao.objects.create(text="Questão 01", peso=3)
+        self.prova.questoes.add(self.questao)
+        self.resposta = models.Resposta.objects.create(
+            questao=self.questao, text="Resposta 01", is_correct=True
+        )
+        tentativa = models.TentativaProva.objects.create(
+            user=self.regular_user, prova=self.prova, date_completed=timezone.now()
+        )
+        models.RespostaParticipante.objects.create(
+            tentativa_prova=tentativa,
+            questao=self.questao,
+            resposta_escolhida=self.resposta,
+        )
+
+    def test_metricas_de_duracao_fases_e_contadores(self):
+        with mock.patch.object(tasks.calcular_ranking, "delay"):
+            tasks.corrigir_provas.apply()
+        tasks.calcular_ranking.apply(args=[self.prova.id])
+
+        linhas = "\n".join(task_metrics.render())
+
+        self.assertIn(
+            'celery_task_duration_seconds_count{task="provas.tasks.corrigir_provas"} 1',
+            linhas,
+        )
+        self.assertIn(
+            'celery_task_phase_duration_seconds_count{task="provas.tasks.corrigir_provas",phase="aggregate"} 1',
+            linhas,
+        )
+        self.assertIn(
+            'celery_task_phase_duration_seconds_count{task="provas.tasks.calcular_ranking",phase="write"} 1',
+            linhas,
+        )
+        self.assertIn(
+            'celery_tasks_total{task="provas.tasks.calcular_ranking",state="SUCCESS"} 1',
+            linhas,
+        )
+        self.assertIn("celery_tentativas_corrigidas_total 1", linhas)
+        self.assertIn("celery_registros_ranking_total 1", linhas)
@@ -1,16 +1,32 @@
 import os
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.cache import cache
-from django.test import RequestFactory, TestCase
+from django.core.cache import cache, caches
+from django.test import RequestFactory, TestCase, override_settings
 from ninja.testing import TestClient
 from ninja_jwt.tokens import AccessToken
 
 from provas.api import api
+from provas.auth import token_cache
 
 User = get_user_model()
 
 
+# Os testes rodam em um processo só, sem depender do Redis.
+@override_settings(
+    CACHES={
+        **settings.CACHES,
+        "gabarito": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "gabarito",
+        },
+        "tokens": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "tokens",
+        },
+    }
+)
 class BaseTestCase(TestCase):
     def setUp(self):
         # self.settings_override = override_settings(
@@ -50,6 +66,9 @@ class BaseTestCase(TestCase):
 
     def tearDown(self):
         cache.clear()
+        caches["gabarito"].clear()
+        caches["tokens"].clear()
+        token_cache.clear()
 
     #     super().tearDown()
     #     self.settings_override.disable()
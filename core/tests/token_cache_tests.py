@@ -0,0 +1,76 @@
+import time
+
+from core.tests.tests import BaseTestCase
+from provas.auth import TokenCache, token_cache
+
+
+class TokenCacheTestCase(BaseTestCase):
+    def test_token_reutilizado_nao_e_verificado_novamente(self):
+        token_cache.clear()
+
+        for _ in range(3):
+            response = self.client.post(
+                f"/users/{self.regular_user.id}", headers=self.get_admin_headers()
+            )
+            self.assertEqual(response.status_code, 200)
+
+        stats = token_cache.stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 2)
+
+    def test_update_user_invalida_tokens_do_usuario(self):
+        self.client.get("/participante/provas", headers=self.get_regular_headers())
+        self.assertEqual(token_cache.get(self.regular_token), self.regular_user)
+
+        self.client.patch(
+            f"/users/update/{self.regular_user.id}",
+            json={"is_active": False},
+            headers=self.get_admin_headers(),
+        )
+
+        self.assertIsNone(token_cache.get(self.regular_token))
+        response = self.client.patch(
+            "/participante/update_resposta/0",
+            json={},
+            headers=self.get_regular_headers(),
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_invalidacao_chega_a_outros_processos(self):
+        # Outro worker do gunicorn: LRU próprio, mesmo cache "tokens".
+        outro_worker = TokenCache(max_size=10, ttl=60)
+        outro_worker.set(
+            self.regular_token,
+            self.regular_user,
+            time.time() + 60,
+            outro_worker.versao(self.regular_user.pk),
+        )
+        self.assertEqual(outro_worker.get(self.regular_token), self.regular_user)
+
+        token_cache.invalidar_usuario(self.regular_user.pk)
+
+        self.assertIsNone(outro_worker.get(self.regular_token))
+        self.assertEqual(outro_worker.stats()["size"], 0)
+
+    def test_admin_com_token_cacheado_continua_exigindo_admin(self):
+        self.client.get("/participante/provas", headers=self.get_regular_headers())
+
+        response = self.client.post(
+            f"/users/{self.regular_user.id}", headers=self.get_regular_headers()
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_expiracao_e_limite_de_tamanho(self):
+        cache = TokenCache(max_size=2, ttl=60)
+
+        cache.set("expirado", self.regular_user, time.time() - 1)
+        self.assertIsNone(cache.get("expirado"))
+
+        cache.set("a", self.regular_user, time.time() + 60)
+        cache.set("b", self.admin_user, time.time() + 60)
+        cache.get("a")
+        cache.set("c", self.admin_user, time.time() + 60)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), self.regular_user)
+        self.assertEqual(cache.get("c"), self.admin_user)
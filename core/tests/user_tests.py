@@ -1,5 +1,8 @@
+from django.contrib.auth.hashers import make_password
+
 from core import models
 from core.tests.tests import BaseTestCase
+from provas import bulk
 
 
 class UserListagemTestCase(BaseTestCase):
@@ -40,6 +43,126 @@ class UserCreateTestCase(BaseTestCase):
         self.assertEqual(user.role, payload["role"])
         self.assertEqual(user.email, payload["email"])
 
+    def test_create_user_existente(self):
+        payload = {
+            "username": "regular",
+            "password": "django123",
+            "email": "outro@python.com",
+        }
+
+        response = self.client.post(
+            "users/create_user", json=payload, headers=self.get_admin_headers()
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+
+class UserBulkCreateTestCase(BaseTestCase):
+    def test_bulk_create_users(self):
+        payload = {
+            "users": [
+                {
+                    "username": f"aluno{i}",
+                    "password": "senha-aluno",
+                    "email": f"aluno{i}@escola.com",
+                }
+                for i in range(5)
+            ]
+            + [{"username": "regular", "password": "x", "email": "r@escola.com"}],
+        }
+
+        response = self.client.post(
+            "users/bulk_create", json=payload, headers=self.get_admin_headers()
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["criados"], 5)
+        self.assertEqual(response.json()["ignorados"], 1)
+        self.assertEqual(
+            response.json()["usuarios_ignorados"],
+            [{"username": "regular", "motivo": "username já existente"}],
+        )
+        aluno = models.User.objects.get(username="aluno3")
+        self.assertTrue(aluno.check_password("senha-aluno"))
+        self.assertEqual(aluno.role, models.User.Role.PARTICIPANTE)
+
+    def test_provisionar_sem_email(self):
+        criados, ignorados = bulk.provisionar_usuarios(
+            [
+                {"username": "sem_email1", "password": "x"},
+                {"username": "sem_email2", "password": "x"},
+                {"username": "com_email", "password": "x", "email": "c@escola.com"},
+            ]
+        )
+
+        self.assertEqual(criados, 1)
+        self.assertEqual(
+            ignorados,
+            [
+                {"username": "sem_email1", "motivo": "email ausente"},
+                {"username": "sem_email2", "motivo": "email ausente"},
+            ],
+        )
+        self.assertFalse(models.User.objects.filter(email="").exists())
+
+    def test_provisionar_username_repetido_no_lote(self):
+        criados, ignorados = bulk.provisionar_usuarios(
+            [
+                {"username": "aluno", "password": "x", "email": "a1@escola.com"},
+                {"username": "aluno", "password": "y", "email": "a2@escola.com"},
+            ]
+        )
+
+        self.assertEqual(criados, 1)
+        self.assertEqual(
+            ignorados, [{"username": "aluno", "motivo": "username repetido"}]
+        )
+        self.assertEqual(
+            models.User.objects.get(username="aluno").email, "a1@escola.com"
+        )
+
+    def test_provisionar_hash_invalido_nao_grava_lotes_anteriores(self):
+        usuarios = [
+            {"username": "aluno1", "password": make_password("x"), "email": "1@e.com"},
+            {"username": "aluno2", "password": "texto", "email": "2@e.com"},
+        ]
+
+        with self.assertRaises(ValueError):
+            bulk.provisionar_usuarios(usuarios, senhas_hash=True, batch_size=1)
+
+        self.assertFalse(models.User.objects.filter(username="aluno1").exists())
+
+    def test_bulk_create_senhas_hash(self):
+        senha_hash = make_password("pre-hash")
+        payload = {
+            "users": [
+                {"username": "aluno", "password": senha_hash, "email": "a@escola.com"}
+            ],
+            "senhas_hash": True,
+        }
+
+        response = self.client.post(
+            "users/bulk_create", json=payload, headers=self.get_admin_headers()
+        )
+
+        self.assertEqual(response.status_code, 200)
+        aluno = models.User.objects.get(username="aluno")
+        self.assertEqual(aluno.password, senha_hash)
+        self.assertTrue(aluno.check_password("pre-hash"))
+
+    def test_bulk_create_senhas_hash_invalido(self):
+        payload = {
+            "users": [{"username": "aluno", "password": "texto", "email": "a@e.com"}],
+            "senhas_hash": True,
+        }
+
+        response = self.client.post(
+            "users/bulk_create", json=payload, headers=self.get_admin_headers()
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(models.User.objects.filter(username="aluno").exists())
+
 
 class UserRetrieveTestCase(BaseTestCase):
     def test_retrieve_user(self):
@@ -1,12 +1,19 @@
+from typing import Literal
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import IntegrityError, transaction
 from django.db.models import Q
+from django.http import FileResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_headers
 from ninja import Query
 from ninja.decorators import decorate_view
 from ninja.errors import HttpError
 from ninja.pagination import paginate
 from ninja_extra import NinjaExtraAPI
-from ninja_jwt.authentication import JWTAuth
 from ninja_jwt.controller import NinjaJWTDefaultController
 from ninja_jwt.tokens import RefreshToken
 
@@ -15,18 +22,34 @@ from core.models import (
     Questao,
     Ranking,
     RegistroRanking,
+    RelatorioProva,
     Resposta,
     RespostaParticipante,
     TentativaProva,
     User,
 )
-from provas import schemas
+from provas import (
+    bulk,
+    condicional,
+    contadores,
+    correcao,
+    estatisticas,
+    exportacao,
+    hashing,
+    projecao,
+    relatorios,
+    renderers,
+    schemas,
+    tasks,
+)
+from provas.auth import CachedJWTAuth, token_cache
+from provas.middleware import comprimir
 
-api = NinjaExtraAPI()
+api = NinjaExtraAPI(renderer=renderers.renderer())
 api.register_controllers(NinjaJWTDefaultController)
 
 
-class AdminJWTAuth(JWTAuth):
+class AdminJWTAuth(CachedJWTAuth):
     def authenticate(self, request, token: str) -> User:
         user = super().authenticate(request, token)
         if not user.is_admin():
@@ -40,44 +63,76 @@ class AdminJWTAuth(JWTAuth):
 ######################################################################
 
 
-@api.post("/login", tags=["auth"])
-def login(request, data: schemas.LoginSchema):
-    try:
-        user = User.objects.get(username=data.email)
-        if not user.check_password(data.password):
-            raise HttpError(404, "Usuário não registrado ou senha incorreta.")
-
-        refresh = RefreshToken.for_user(user)
-        return {
-            "message": "Login realizado com sucesso",
-            "access": str(refresh.access_token),
-            "refresh": str(refresh),
-        }
-    except User.DoesNotExist as err:
-        raise HttpError(404, "Usuário não registrado ou senha incorreta.") from err
-
-
-@api.post("/register", tags=["auth"])
-def register(request, data: schemas.RegisterSchema):
-    if User.objects.filter(username=data.email).exists():
-        raise HttpError(400, "Usuário já existente.")
-
-    user = User.objects.create_user(
-        username=data.email,
-        password=data.password,
-        first_name=data.first_name,
-        last_name=data.last_name,
-    )
-
+def _tokens(user, message):
     refresh = RefreshToken.for_user(user)
-
     return {
-        "message": "Usuário criado com sucesso",
+        "message": message,
         "access": str(refresh.access_token),
         "refresh": str(refresh),
     }
 
 
+def _salvar_novo_usuario(user):
+    try:
+        with transaction.atomic():
+            user.save()
+    except IntegrityError as err:
+        raise HttpError(400, "Usuário já existente.") from err
+
+
+if settings.PASSWORD_HASHING_ASYNC:
+
+    @api.post("/login", tags=["auth"])
+    async def login(request, data: schemas.LoginSchema):
+        hashing.verificar_limite_login(data.email)
+        user = await User.objects.filter(username=data.email).afirst()
+        if not await hashing.acheck_password(user, data.password):
+            hashing.registrar_falha_login(data.email)
+            raise HttpError(404, "Usuário não registrado ou senha incorreta.")
+
+        hashing.limpar_falhas_login(data.email)
+        return _tokens(user, "Login realizado com sucesso")
+
+    @api.post("/register", tags=["auth"])
+    async def register(request, data: schemas.RegisterSchema):
+        user = User(
+            username=User.normalize_username(data.email),
+            email=data.email,
+            first_name=data.first_name,
+            last_name=data.last_name,
+        )
+        user.password = await hashing.amake_password(data.password)
+        await sync_to_async(_salvar_novo_usuario)(user)
+
+        return _tokens(user, "Usuário criado com sucesso")
+
+else:
+
+    @api.post("/login", tags=["auth"])
+    def login(request, data: schemas.LoginSchema):
+        hashing.verificar_limite_login(data.email)
+        user = User.objects.filter(username=data.email).first()
+        if not hashing.check_password(user, data.password):
+            hashing.registrar_falha_login(data.email)
+            raise HttpError(404, "Usuário não registrado ou senha incorreta.")
+
+        hashing.limpar_falhas_login(data.email)
+        return _tokens(user, "Login realizado com sucesso")
+
+    @api.post("/register", tags=["auth"])
+    def register(request, data: schemas.RegisterSchema):
+        user = User(
+            username=User.normalize_username(data.email),
+            email=data.email,
+            first_name=data.first_name,
+            last_name=data.last_name,
+        )
+        user.password = hashing.make_password(data.password)
+        _salvar_novo_usuario(user)
+
+        return _tokens(user, "Usuário criado com sucesso")
+
+
 ######################################################################
 # Users
 ######################################################################
@@ -89,7 +144,7 @@ def register(request, data: schemas.RegisterSchema):
     auth=AdminJWTAuth(),
     tags=["users"],
 )
-@decorate_view(cache_page(60 * 15))
+@decorate_view(vary_on_headers("Authorization"), comprimir, cache_page(60 * 15))
 @paginate
 def get_users(
     request,
@@ -113,10 +168,11 @@ def get_users(
 
 @api.post("users/create_user", auth=AdminJWTAuth(), tags=["users"])
 def create_user(request, payload: schemas.UserIn):
-    if User.objects.filter(username=payload.username).exists():
-        raise HttpError(400, "Usuário já existente.")
-
-    user = User.objects.create_user(**payload.dict())
+    try:
+        with transaction.atomic():
+            user = User.objects.create_user(**payload.dict())
+    except IntegrityError as err:
+        raise HttpError(400, "Usuário já existente.") from err
 
     RefreshToken.for_user(user)
 
@@ -126,6 +182,24 @@ def create_user(request, payload: schemas.UserIn):
     }
 
 
+@api.post("users/bulk_create", auth=AdminJWTAuth(), tags=["users"])
+def bulk_create_users(request, payload: schemas.UsersBulkIn):
+    try:
+        criados, ignorados = bulk.provisionar_usuarios(
+            [user.dict(exclude_none=True) for user in payload.users],
+            senhas_hash=payload.senhas_hash,
+        )
+    except ValueError as err:
+        raise HttpError(400, "Hash de senha em formato desconhecido.") from err
+
+    return {
+        "message": f"{criados} usuário(s) criado(s), {len(ignorados)} ignorado(s).",
+        "criados": criados,
+        "ignorados": len(ignorados),
+        "usuarios_ignorados": ignorados,
+    }
+
+
 @api.post(
     "/users/{user_id}", auth=AdminJWTAuth(), response=schemas.UserOut, tags=["users"]
 )
@@ -140,6 +214,7 @@ def update_user(request, user_id: int, payload: schemas.UserPatch):
     for attr, value in payload.dict(exclude_unset=True).items():
         setattr(user, attr, value)
     user.save()
+    token_cache.invalidar_usuario(user.id)
     return {"message": "Usuário modificado com sucesso.", "id": f"{user.id}"}
 
 
@@ -147,6 +222,7 @@ def update_user(request, user_id: int, payload: schemas.UserPatch):
 def delete_user(request, user_id: int):
     user = get_object_or_404(User, id=user_id)
     user.delete()
+    token_cache.invalidar_usuario(user_id)
     return {"message": "Usuário deletado.", "id": f"{user_id}"}
 
 
@@ -157,18 +233,22 @@ def delete_user(request, user_id: int):
 
 @api.get(
     "/provas/listagem",
-    response=list[schemas.ProvasOut],
+    response=list[schemas.ProvasOut | schemas.ProvasProjecao],
+    exclude_unset=True,
     tags=["provas"],
     auth=AdminJWTAuth(),
 )
-@decorate_view(cache_page(60 * 15))
+@decorate_view(vary_on_headers("Authorization"), comprimir, cache_page(60 * 15))
 @paginate
 def get_prova(
     request,
     q: str = None,
     order_by: str | None = Query(None, description="Ordenar por campo. Ex: '-nome'"),
+    fields: str | None = Query(
+        None, description="Campos devolvidos, separados por vírgula. Ex: 'id,title'"
+    ),
 ):
-    queryset = Prova.objects.all()
+    queryset = contadores.com_contadores(Prova.objects.all())
 
     if q:
         queryset = queryset.filter(Q(title__icontains=q) | Q(description__icontains=q))
@@ -176,7 +256,7 @@ def get_prova(
     if order_by:
         queryset = queryset.order_by(order_by)
 
-    return queryset
+    return projecao.projetar(queryset, schemas.ProvasProjecao, fields)
 
 
 @api.post("/provas/create", tags=["provas"], auth=AdminJWTAuth())
@@ -189,14 +269,16 @@ def create_prova(request, payload: schemas.ProvasIn):
     }
 
 
-@api.post(
+@api.api_operation(
+    ["GET", "POST"],
     "/provas/{prova_id}",
     response=schemas.ProvasOut,
     tags=["provas"],
     auth=AdminJWTAuth(),
 )
+@decorate_view(condicional.validar(condicional.da_prova, AdminJWTAuth()))
 def retrieve_prova(request, prova_id: int):
-    prova = get_object_or_404(Prova, id=prova_id)
+    prova = get_object_or_404(contadores.com_contadores(Prova.objects), id=prova_id)
     return prova
 
 
@@ -222,7 +304,7 @@ def delete_prova(request, prova_id: int):
     tags=["provas"],
     auth=AdminJWTAuth(),
 )
-@decorate_view(cache_page(60 * 15))
+@decorate_view(vary_on_headers("Authorization"), comprimir, cache_page(60 * 15))
 @paginate
 def retrieve_questoes_from_prova(request, prova_id: int):
     prova = get_object_or_404(Prova, id=prova_id)
@@ -251,6 +333,127 @@ def remove_questao_from_prova(request, prova_id: int, payload: schemas.QuestoesP
     }
 
 
+@api.post("/provas/{prova_id}/inscrever", tags=["provas"], auth=AdminJWTAuth())
+def inscrever_participantes(request, prova_id: int, payload: schemas.InscricaoIn):
+    prova = get_object_or_404(Prova, id=prova_id)
+
+    if payload.user_ids is None and not payload.q and not payload.todos:
+        raise HttpError(400, "Informe user_ids, q ou todos.")
+
+    usuarios = User.objects.filter(role=User.Role.PARTICIPANTE)
+
+    if payload.user_ids is not None:
+        usuarios = usuarios.filter(id__in=payload.user_ids)
+
+    if payload.q:
+        usuarios = usuarios.filter(
+            Q(name__icontains=payload.q)
+            | Q(first_name__iexact=payload.q)
+            | Q(last_name__iexact=payload.q)
+        )
+
+    inscritos = bulk.inscrever_participantes(prova, usuarios)
+
+    return {
+        "message": f"{inscritos} participante(s) inscrito(s) na prova ID {prova.id}.",
+        "inscritos": inscritos,
+    }
+
+
+@api.post("/provas/{prova_id}/corrigir", tags=["provas"], auth=AdminJWTAuth())
+def corrigir_prova(request, prova_id: int):
+    prova = get_object_or_404(Prova, id=prova_id)
+
+    tentativas = correcao.gravar_notas(
+        correcao.calcular_notas(correcao.pendentes().filter(prova=prova))
+    )
+    if tentativas:
+        tasks.solicitar_ranking(prova.id)
+
+    return {
+        "message": f"{len(tentativas)} tentativa(s) corrigida(s) na prova ID {prova.id}.",
+        "corrigidas": len(tentativas),
+    }
+
+
+@api.get("/provas/{prova_id}/exportar/{recurso}", tags=["provas"], auth=AdminJWTAuth())
+def exportar_prova(
+    request,
+    prova_id: int,
+    recurso: Literal["ranking", "tentativas", "respostas"],
+    formato: Literal["csv", "ndjson"] = "csv",
+):
+    prova = get_object_or_404(Prova, id=prova_id)
+
+    conteudo, content_type = exportacao.exportar(prova.id, recurso, formato)
+    response = StreamingHttpResponse(conteudo, content_type=content_type)
+    response["Content-Disposition"] = (
+        f'attachment; filename="prova_{prova.id}_{recurso}.{formato}"'
+    )
+    return response
+
+
+@api.post(
+    "/provas/{prova_id}/relatorios",
+    response=schemas.RelatorioOut,
+    tags=["provas"],
+    auth=AdminJWTAuth(),
+)
+def solicitar_relatorio(request, prova_id: int):
+    prova = get_object_or_404(Prova, id=prova_id)
+
+    relatorio, criado = RelatorioProva.objects.get_or_create(
+        prova=prova, assinatura=relatorios.assinatura(prova.id)
+    )
+    if not criado and (
+        relatorio.status == RelatorioProva.Status.ERRO or relatorios.orfao(relatorio)
+    ):
+        relatorio.status = RelatorioProva.Status.PENDENTE
+        relatorio.erro = ""
+        relatorio.save(update_fields=["status", "erro", "date_changed"])
+        criado = True
+
+    if criado:
+        transaction.on_commit(lambda: tasks.gerar_relatorio.delay(relatorio.id))
+    return relatorio
+
+
+@api.get(
+    "/provas/{prova_id}/estatisticas",
+    response=list[schemas.EstatisticaQuestaoOut],
+    tags=["provas"],
+    auth=AdminJWTAuth(),
+)
+def retrieve_estatisticas_prova(request, prova_id: int):
+    prova = get_object_or_404(Prova, id=prova_id)
+    return estatisticas.da_prova(prova.id)
+
+
+@api.get(
+    "/relatorios/{relatorio_id}",
+    response=schemas.RelatorioOut,
+    tags=["provas"],
+    auth=AdminJWTAuth(),
+)
+def retrieve_relatorio(request, relatorio_id: int):
+    return get_object_or_404(RelatorioProva, id=relatorio_id)
+
+
+@api.get("/relatorios/{relatorio_id}/download", tags=["provas"], auth=AdminJWTAuth())
+def download_relatorio(request, relatorio_id: int):
+    relatorio = get_object_or_404(RelatorioProva, id=relatorio_id)
+
+    if relatorio.status != RelatorioProva.Status.PRONTO:
+        raise HttpError(409, "Relatório ainda não está pronto.")
+
+    return FileResponse(
+        relatorio.arquivo.open("rb"),
+        as_attachment=True,
+        filename=relatorio.arquivo.name.rsplit("/", 1)[-1],
+        content_type="application/json",
+    )
+
+
 ######################################################################
 # Questões
 ######################################################################
@@ -258,16 +461,20 @@ def remove_questao_from_prova(request, prova_id: int, payload: schemas.QuestoesP
 
 @api.get(
     "/questoes/listagem",
-    response=list[schemas.QuestoesOut],
+    response=list[schemas.QuestoesOut | schemas.QuestoesProjecao],
+    exclude_unset=True,
     tags=["questoes"],
     auth=AdminJWTAuth(),
 )
-@decorate_view(cache_page(60 * 15))
+@decorate_view(vary_on_headers("Authorization"), comprimir, cache_page(60 * 15))
 @paginate
 def get_questao(
     request,
     q: str = None,
     order_by: str | None = Query(None, description="Ordenar por campo. Ex: '-nome'"),
+    fields: str | None = Query(
+        None, description="Campos devolvidos, separados por vírgula. Ex: 'id,title'"
+    ),
 ):
     queryset = Questao.objects.all()
 
@@ -277,7 +484,7 @@ def get_questao(
     if order_by:
         queryset = queryset.order_by(order_by)
 
-    return queryset
+    return projecao.projetar(queryset, schemas.QuestoesProjecao, fields)
 
 
 @api.post("/questoes/create", tags=["questoes"], auth=AdminJWTAuth())
@@ -290,12 +497,16 @@ def create_questao(request, payload: schemas.QuestoesIn):
     }
 
 
-@api.post(
+@api.api_operation(
+    ["GET", "POST"],
     "/questoes/{questao_id}",
     response=schemas.QuestoesOut,
     tags=["questoes"],
     auth=AdminJWTAuth(),
 )
+@decorate_view(
+    condicional.validar(condicional.do_registro(Questao, "questao_id"), AdminJWTAuth())
+)
 def retrieve_questao(request, questao_id: int):
     questao = get_object_or_404(Questao, id=questao_id)
     return questao
@@ -324,16 +535,20 @@ def delete_questao(request, questao_id: int):
 
 @api.get(
     "/respostas/listagem",
-    response=list[schemas.RespostasOut],
+    response=list[schemas.RespostasOut | schemas.RespostasProjecao],
+    exclude_unset=True,
     tags=["respostas"],
     auth=AdminJWTAuth(),
 )
-@decorate_view(cache_page(60 * 15))
+@decorate_view(vary_on_headers("Authorization"), comprimir, cache_page(60 * 15))
 @paginate
 def get_respostas(
     request,
     q: str = None,
     order_by: str | None = Query(None, description="Ordenar por campo. Ex: '-nome'"),
+    fields: str | None = Query(
+        None, description="Campos devolvidos, separados por vírgula. Ex: 'id,title'"
+    ),
 ):
     queryset = Resposta.objects.all()
 
@@ -343,7 +558,7 @@ def get_respostas(
     if order_by:
         queryset = queryset.order_by(order_by)
 
-    return queryset
+    return projecao.projetar(queryset, schemas.RespostasProjecao, fields)
 
 
 @api.post("/respostas/create", tags=["respostas"], auth=AdminJWTAuth())
@@ -361,12 +576,18 @@ def create_resposta(request, payload: schemas.RespostasIn):
     }
 
 
-@api.post(
+@api.api_operation(
+    ["GET", "POST"],
     "/respostas/{resposta_id}",
     response=schemas.RespostasOut,
     tags=["respostas"],
     auth=AdminJWTAuth(),
 )
+@decorate_view(
+    condicional.validar(
+        condicional.do_registro(Resposta, "resposta_id"), AdminJWTAuth()
+    )
+)
 def retrieve_resposta(request, resposta_id: int):
     resposta = get_object_or_404(Resposta, id=resposta_id)
     return resposta
@@ -397,9 +618,14 @@ def delete_resposta(request, resposta_id: int):
     path="/participante/provas",
     response=list[schemas.TentativaProvaOut],
     tags=["portal_participante"],
-    auth=JWTAuth(),
+    auth=CachedJWTAuth(),
+)
+@decorate_view(
+    vary_on_headers("Authorization"),
+    comprimir,
+    cache_page(60 * 15),
+    condicional.validar(condicional.do_participante, CachedJWTAuth()),
 )
-@decorate_view(cache_page(60 * 15))
 @paginate
 def get_participante_prova(
     request,
@@ -418,16 +644,34 @@ def get_participante_prova(
     return tentativas
 
 
-@api.post("/participante/create_resposta", tags=["portal_participante"], auth=JWTAuth())
+def _verificar_em_andamento(tentativa):
+    # Finalizada, a tentativa já foi (ou está sendo) corrigida: mudar as
+    # respostas deixaria a nota desatualizada.
+    if tentativa.date_completed is not None:
+        raise HttpError(400, "Tentativa já finalizada.")
+
+
+@api.post(
+    "/participante/create_resposta", tags=["portal_participante"], auth=CachedJWTAuth()
+)
 def create_participante_resposta(request, payload: schemas.RespostaParticipanteIn):
-    tentativa_prova = TentativaProva.objects.get(id=payload.tentativa_prova)
     questao = Questao.objects.get(id=payload.questao)
     resposta_escolhida = Resposta.objects.get(id=payload.resposta_escolhida)
-    resposta_participante = RespostaParticipante.objects.create(
-        tentativa_prova=tentativa_prova,
-        questao=questao,
-        resposta_escolhida=resposta_escolhida,
-    )
+
+    # O lock na tentativa impede que ela seja finalizada (e corrigida) entre
+    # a verificação e a gravação da resposta.
+    with transaction.atomic():
+        tentativa_prova = get_object_or_404(
+            TentativaProva.objects.select_for_update(),
+            id=payload.tentativa_prova,
+            user=request.user,
+        )
+        _verificar_em_andamento(tentativa_prova)
+        resposta_participante = RespostaParticipante.objects.create(
+            tentativa_prova=tentativa_prova,
+            questao=questao,
+            resposta_escolhida=resposta_escolhida,
+        )
 
     return {
         "message": "Resposta de participante criada com sucesso",
@@ -438,28 +682,60 @@ def create_participante_resposta(request, payload: schemas.RespostaParticipanteI
 @api.patch(
     "/participante/update_resposta/{resposta_participante_id}",
     tags=["portal_participante"],
-    auth=JWTAuth(),
+    auth=CachedJWTAuth(),
 )
 def update_participante_resposta(
     request, resposta_participante_id: int, payload: schemas.RespostaParticipantePatch
 ):
-    resposta_participante = get_object_or_404(
-        RespostaParticipante, id=resposta_participante_id
-    )
+    with transaction.atomic():
+        resposta_participante = get_object_or_404(
+            RespostaParticipante.objects.select_related(
+                "tentativa_prova"
+            ).select_for_update(),
+            id=resposta_participante_id,
+        )
 
-    if resposta_participante.tentativa_prova.user != request.user:
-        return {"message": "Sem permissão para modificar essa resposta."}
+        if resposta_participante.tentativa_prova.user != request.user:
+            return {"message": "Sem permissão para modificar essa resposta."}
+        _verificar_em_andamento(resposta_participante.tentativa_prova)
 
-    for attr, value in payload.dict(exclude_unset=True).items():
-        print(attr, value)
-        field = attr.replace("_id", "")
-        setattr(resposta_participante, f"{field}_id", value)
-    resposta_participante.save()
+        for attr, value in payload.dict(exclude_unset=True).items():
+            print(attr, value)
+            field = attr.replace("_id", "")
+            setattr(resposta_participante, f"{field}_id", value)
+        resposta_participante.save()
     return {
         "message": f"Resposta da Questão {resposta_participante.questao} modificada com sucesso."
     }
 
 
+@api.post(
+    "/participante/finalizar/{tentativa_prova_id}",
+    tags=["portal_participante"],
+    auth=CachedJWTAuth(),
+)
+def finalizar_tentativa(request, tentativa_prova_id: int):
+    tentativa = get_object_or_404(
+        TentativaProva, id=tentativa_prova_id, user=request.user
+    )
+
+    # O update condicional garante que só a primeira finalização enfileira a
+    # correção, mesmo com requisições simultâneas.
+    agora = timezone.now()
+    with transaction.atomic():
+        finalizada = TentativaProva.objects.filter(
+            id=tentativa.id, date_completed=None
+        ).update(date_completed=agora, date_changed=agora)
+        if not finalizada:
+            raise HttpError(400, "Tentativa já finalizada.")
+        contadores.somar(tentativa.prova_id, concluidas=1)
+
+    if settings.GRADING_REALTIME:
+        transaction.on_commit(lambda: tasks.corrigir_tentativa.delay(tentativa.id))
+
+    return {"message": "Tentativa finalizada com sucesso.", "id": tentativa.id}
+
+
 ######################################################################
 # Respostas de Participantes
 ######################################################################
@@ -467,16 +743,22 @@ def update_participante_resposta(
 
 @api.get(
     "/resposta_participante/listagem",
-    response=list[schemas.RespostaParticipanteOut],
+    response=list[
+        schemas.RespostaParticipanteOut | schemas.RespostaParticipanteProjecao
+    ],
+    exclude_unset=True,
     tags=["respostas_participantes"],
     auth=AdminJWTAuth(),
 )
-@decorate_view(cache_page(60 * 15))
+@decorate_view(vary_on_headers("Authorization"), comprimir, cache_page(60 * 15))
 @paginate
 def get_respostas_participante(
     request,
     q: str = None,
     order_by: str | None = Query(None, description="Ordenar por campo. Ex: '-nome'"),
+    fields: str | None = Query(
+        None, description="Campos devolvidos, separados por vírgula. Ex: 'id,title'"
+    ),
 ):
     queryset = RespostaParticipante.objects.all()
 
@@ -488,7 +770,7 @@ def get_respostas_participante(
     if order_by:
         queryset = queryset.order_by(order_by)
 
-    return queryset
+    return projecao.projetar(queryset, schemas.RespostaParticipanteProjecao, fields)
 
 
 @api.post(
@@ -536,13 +818,19 @@ def update_resposta_participante(
 ######################################################################
 
 
-@api.post(
+@api.get(
     "/ranking/prova/{prova_id}",
-    response=schemas.RankingOut,
+    response=list[schemas.RankingOut],
     tags=["ranking"],
-    auth=JWTAuth(),
+    auth=CachedJWTAuth(),
 )
+@decorate_view(condicional.validar(condicional.do_ranking, CachedJWTAuth()))
+@paginate
 def retrieve_ranking_from_prova(request, prova_id: int):
     ranking = get_object_or_404(Ranking, prova_id=prova_id)
 
-    return RegistroRanking.objects.filter(ranking=ranking).order_by("posicao")
+    # Só a geração ativa: um recálculo em andamento grava outra geração e não
+    # aparece aqui até a troca.
+    return RegistroRanking.objects.filter(
+        ranking=ranking, geracao=ranking.geracao_ativa
+    ).order_by("posicao")
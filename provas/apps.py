@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class ProvasConfig(AppConfig):
+    name = "provas"
+
+    def ready(self):
+        from provas import signals  # noqa: F401
@@ -0,0 +1,124 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from ninja_jwt.authentication import JWTAuth
+from ninja_jwt.settings import api_settings
+
+
+def _versoes():
+    return caches["tokens"]
+
+
+def _chave_versao(user_id):
+    return f"tokens:versao:{user_id}"
+
+
+class TokenCache:
+    """
+    LRU de tokens verificados, por processo. Cada entrada guarda a versão
+    dos tokens do usuário no cache compartilhado "tokens"; invalidar_usuario
+    troca essa versão, e os demais processos descartam a entrada no próximo
+    acerto em vez de servir o usuário antigo até o TTL.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def chave(token):
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token):
+        chave = self.chave(token)
+        with self._lock:
+            entrada = self._entradas.get(chave)
+        # A versão é lida fora do lock: é uma ida ao Redis.
+        if (
+            entrada is None
+            or entrada[0] <= time.time()
+            or entrada[2] != self.versao(entrada[1].pk)
+        ):
+            with self._lock:
+                if entrada is not None and self._entradas.get(chave) is entrada:
+                    del self._entradas[chave]
+                self.misses += 1
+            return None
+
+        with self._lock:
+            if chave in self._entradas:
+                self._entradas.move_to_end(chave)
+            self.hits += 1
+        return entrada[1]
+
+    def set(self, token, user, expira_em, versao=None):
+        chave = self.chave(token)
+        expira_em = min(expira_em, time.time() + self.ttl)
+        with self._lock:
+            self._entradas[chave] = (expira_em, user, versao)
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.max_size:
+                self._entradas.popitem(last=False)
+
+    def versao(self, user_id):
+        return _versoes().get(_chave_versao(user_id))
+
+    def invalidar_usuario(self, user_id):
+        # Entradas anteriores a esta troca expiram em até ttl segundos; depois
+        # disso a versão pode sumir sem que nenhuma volte a valer.
+        _versoes().set(_chave_versao(user_id), uuid4().hex, timeout=self.ttl)
+        with self._lock:
+            for chave in [
+                chave
+                for chave, (_, user, _) in self._entradas.items()
+                if user.pk == user_id
+            ]:
+                del self._entradas[chave]
+
+    def clear(self):
+        with self._lock:
+            self._entradas.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._entradas),
+            "max_size": self.max_size,
+        }
+
+
+token_cache = TokenCache(
+    max_size=settings.JWT_TOKEN_CACHE["MAX_SIZE"],
+    ttl=settings.JWT_TOKEN_CACHE["TTL"],
+)
+
+
+class CachedJWTAuth(JWTAuth):
+    def authenticate(self, request, token: str):
+        user = token_cache.get(token)
+        if user is not None:
+            request.user = user
+            return user
+
+        validated_token = self.get_validated_token(token)
+        # A versão é lida antes do usuário: uma invalidação entre as duas
+        # leituras deixa a entrada já desatualizada, e não o contrário.
+        versao = token_cache.versao(validated_token[api_settings.USER_ID_CLAIM])
+        user = self.get_user(validated_token)
+        request.user = user
+        token_cache.set(token, user, validated_token["exp"], versao)
+        return user
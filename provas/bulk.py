@@ -0,0 +1,105 @@
+from itertools import batched
+
+from django.conf import settings
+from django.contrib.auth.hashers import identify_hasher
+from django.db import transaction
+
+from core.models import ResumoProva, TentativaProva, User
+from provas import contadores, hashing
+
+
+def provisionar_usuarios(usuarios, senhas_hash=False, batch_size=None):
+    """
+    Cria os usuários em lotes. Devolve (criados, ignorados), onde ignorados
+    é a lista de {"username", "motivo"} das linhas que não foram criadas.
+    """
+    batch_size = batch_size or settings.BULK_BATCH_SIZE
+    criados = 0
+    ignorados = []
+    vistos = set()
+
+    if senhas_hash:
+        # Todos os hashes são validados antes do primeiro lote: um hash
+        # inválido no fim não deixa os lotes anteriores gravados.
+        usuarios = list(usuarios)
+        for dados in usuarios:
+            identify_hasher(dados["password"])
+
+    for lote in batched(usuarios, batch_size):
+        existentes = set(
+            User.objects.filter(
+                username__in=[dados["username"] for dados in lote]
+            ).values_list("username", flat=True)
+        )
+        novos = []
+        for dados in lote:
+            if dados["username"] in vistos:
+                motivo = "username repetido"
+            elif dados["username"] in existentes:
+                motivo = "username já existente"
+            elif not dados.get("email"):
+                # email é único: sem ele, todas as linhas teriam email="" e
+                # só a primeira seria criada.
+                motivo = "email ausente"
+            else:
+                novos.append(dados)
+                vistos.add(dados["username"])
+                continue
+            ignorados.append({"username": dados["username"], "motivo": motivo})
+
+        senhas = [dados["password"] for dados in novos]
+        if not senhas_hash:
+            senhas = hashing.make_passwords(senhas)
+
+        User.objects.bulk_create(
+            [
+                User(**{**dados, "password": senha})
+                for dados, senha in zip(novos, senhas, strict=True)
+            ],
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+
+        criados_lote = set(
+            User.objects.filter(
+                username__in=[dados["username"] for dados in novos]
+            ).values_list("username", flat=True)
+        )
+        criados += len(criados_lote)
+        ignorados.extend(
+            {"username": dados["username"], "motivo": "username ou email em conflito"}
+            for dados in novos
+            if dados["username"] not in criados_lote
+        )
+
+    return criados, ignorados
+
+
+def inscrever_participantes(prova, usuarios, batch_size=None):
+    batch_size = batch_size or settings.BULK_BATCH_SIZE
+    inscritos = 0
+
+    with transaction.atomic():
+        # O lock no resumo serializa as inscrições na prova: quem já está
+        # inscrito não muda até o commit, e o contador soma exatamente as
+        # tentativas inseridas aqui.
+        ResumoProva.objects.select_for_update().get_or_create(prova=prova)
+        for ids in batched(
+            usuarios.values_list("id", flat=True).iterator(), batch_size
+        ):
+            ja_inscritos = set(
+                TentativaProva.objects.filter(prova=prova, user_id__in=ids).values_list(
+                    "user_id", flat=True
+                )
+            )
+            novas = [
+                TentativaProva(user_id=user_id, prova=prova)
+                for user_id in ids
+                if user_id not in ja_inscritos
+            ]
+            TentativaProva.objects.bulk_create(novas, ignore_conflicts=True)
+            inscritos += len(novas)
+        # bulk_create não dispara post_save: o contador é somado aqui.
+        contadores.somar(prova.id, inscritos=inscritos)
+
+    return inscritos
@@ -0,0 +1,92 @@
+import gzip
+import zlib
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+TIPOS_COMPRESSIVEIS = {"application/json", "application/x-ndjson"}
+
+
+def _gzip(conteudo):
+    return gzip.compress(conteudo, compresslevel=settings.COMPRESSION_LEVELS["gzip"])
+
+
+def _gzip_sequencia(partes):
+    # wbits 31: zlib com cabeçalho gzip
+    compressor = zlib.compressobj(settings.COMPRESSION_LEVELS["gzip"], wbits=31)
+    for parte in partes:
+        yield compressor.compress(parte) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def _brotli(conteudo):
+    return brotli.compress(conteudo, quality=settings.COMPRESSION_LEVELS["br"])
+
+
+def _brotli_sequencia(partes):
+    compressor = brotli.Compressor(quality=settings.COMPRESSION_LEVELS["br"])
+    for parte in partes:
+        yield compressor.process(parte) + compressor.flush()
+    yield compressor.finish()
+
+
+def _zstd(conteudo):
+    return zstandard.ZstdCompressor(level=settings.COMPRESSION_LEVELS["zstd"]).compress(
+        conteudo
+    )
+
+
+def _zstd_sequencia(partes):
+    compressor = zstandard.ZstdCompressor(
+        level=settings.COMPRESSION_LEVELS["zstd"]
+    ).compressobj()
+    for parte in partes:
+        yield compressor.compress(parte) + compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+    yield compressor.flush()
+
+
+# codificação -> (corpo inteiro, streaming)
+CODIFICADORES = {"gzip": (_gzip, _gzip_sequencia)}
+if brotli is not None:
+    CODIFICADORES["br"] = (_brotli, _brotli_sequencia)
+if zstandard is not None:
+    CODIFICADORES["zstd"] = (_zstd, _zstd_sequencia)
+
+
+def negociar(accept_encoding):
+    """
+    Escolhe, na ordem de COMPRESSION_ENCODINGS, a primeira codificação
+    disponível que o cliente aceita (q > 0) em Accept-Encoding.
+    """
+    aceitas = {}
+    for item in accept_encoding.split(","):
+        nome, _, parametros = item.partition(";")
+        qualidade = 1.0
+        parametros = parametros.strip()
+        if parametros.startswith("q="):
+            try:
+                qualidade = float(parametros[2:])
+            except ValueError:
+                qualidade = 0.0
+        aceitas[nome.strip().lower()] = qualidade
+
+    for nome in settings.COMPRESSION_ENCODINGS:
+        if nome in CODIFICADORES and aceitas.get(nome, aceitas.get("*", 0)) > 0:
+            return nome
+    return None
+
+
+def compressivel(content_type):
+    tipo = content_type.partition(";")[0].strip().lower()
+    return tipo.startswith("text/") or tipo in TIPOS_COMPRESSIVEIS
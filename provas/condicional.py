@@ -0,0 +1,120 @@
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from ninja.errors import HttpError
+from ninja_extra.exceptions import APIException
+
+from core.models import Prova, Ranking, TentativaProva
+
+
+def validar(versao, auth):
+    """
+    Responde GET/HEAD com 304 quando If-None-Match/If-Modified-Since batem
+    com a versão atual do recurso, sem rodar o endpoint nem serializar o
+    corpo. ``versao(request, **kwargs)`` devolve (etag, last_modified) com
+    uma query barata, ou None se o recurso não existe.
+
+    Usado com decorate_view, roda antes da autenticação do ninja; por isso
+    autentica com ``auth`` (o cache de tokens torna a segunda verificação
+    barata) e, sem usuário válido, deixa o endpoint responder o erro.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def inner(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return func(request, *args, **kwargs)
+
+            try:
+                user = auth(request)
+            except (HttpError, APIException):
+                user = None
+            atual = user and versao(request, *args, **kwargs)
+            if not atual:
+                return func(request, *args, **kwargs)
+
+            etag, last_modified = atual
+            # Fraco: a mesma versão pode sair comprimida ou não.
+            etag = f"W/{quote_etag(etag)}"
+            last_modified = int(last_modified.timestamp()) if last_modified else None
+
+            response = get_conditional_response(
+                request, etag=etag, last_modified=last_modified
+            )
+            if response is None:
+                response = func(request, *args, **kwargs)
+                if response.status_code == 200:
+                    response.headers.setdefault("ETag", etag)
+                    if last_modified:
+                        response.headers.setdefault(
+                            "Last-Modified", http_date(last_modified)
+                        )
+            return response
+
+        return inner
+
+    return decorator
+
+
+def _versao(*partes):
+    return ".".join(str(parte) for parte in partes)
+
+
+def do_registro(model, parametro):
+    """Versão de um registro pelo date_changed, buscado pela chave primária."""
+
+    def versao(request, **kwargs):
+        date_changed = (
+            model.objects.filter(pk=kwargs[parametro])
+            .values_list("date_changed", flat=True)
+            .first()
+        )
+        if date_changed is not None:
+            return _versao(
+                model._meta.model_name, date_changed.timestamp()
+            ), date_changed
+
+    return versao
+
+
+def da_prova(request, prova_id, **kwargs):
+    """A prova muda de versão quando é editada ou quando seus contadores mudam."""
+    atual = (
+        Prova.objects.filter(pk=prova_id)
+        .values_list("date_changed", "resumo__date_changed")
+        .first()
+    )
+    if atual is not None:
+        date_changed, resumo = atual
+        return _versao(
+            "prova", date_changed.timestamp(), resumo.timestamp() if resumo else 0
+        ), max(date_changed, resumo or date_changed)
+
+
+def do_ranking(request, prova_id, **kwargs):
+    atual = (
+        Ranking.objects.filter(prova_id=prova_id)
+        .values_list("geracao_ativa", "date_changed")
+        .first()
+    )
+    if atual is not None:
+        geracao, date_changed = atual
+        return _versao("ranking", geracao, date_changed.timestamp()), date_changed
+
+
+def do_participante(request, **kwargs):
+    atual = TentativaProva.objects.filter(user=request.user).aggregate(
+        total=Count("id"), date_changed=Max("date_changed")
+    )
+    date_changed = atual["date_changed"]
+    return (
+        _versao(
+            "participante",
+            request.user.pk,
+            atual["total"],
+            date_changed.timestamp() if date_changed else 0,
+        ),
+        date_changed,
+    )
@@ -0,0 +1,101 @@
+from collections import defaultdict
+
+from django.db.models import Case, Count, F, FloatField, Q, Sum, When
+from django.db.models.functions import Cast, Coalesce, Greatest, Now
+
+from core.models import Prova, ResumoProva
+
+CAMPOS = ("inscritos", "concluidas", "corrigidas", "soma_notas")
+
+# Contadores do resumo e média das notas como anotações de Prova, para que a
+# listagem continue uma query só (sem resumo, os contadores valem 0).
+ANOTACOES = {
+    **{campo: Coalesce(F(f"resumo__{campo}"), 0) for campo in CAMPOS},
+    "media_nota": Case(
+        When(
+            resumo__corrigidas__gt=0,
+            then=Cast("resumo__soma_notas", FloatField()) / F("resumo__corrigidas"),
+        ),
+        default=None,
+        output_field=FloatField(),
+    ),
+}
+
+
+def com_contadores(provas):
+    return provas.annotate(**ANOTACOES)
+
+
+def somar(prova_id, criar=True, **valores):
+    # Greatest evita violar os campos positivos se um contador já estiver
+    # abaixo do real; a reconciliação acerta o valor depois. Sem ``criar``,
+    # uma prova sem resumo fica como está (não há o que descontar).
+    valores = {
+        campo: Greatest(F(campo) + valor, 0)
+        for campo, valor in valores.items()
+        if valor
+    }
+    if not valores:
+        return
+
+    resumo = ResumoProva.objects.filter(prova_id=prova_id)
+    if not resumo.update(**valores, date_changed=Now()) and criar:
+        ResumoProva.objects.get_or_create(prova_id=prova_id)
+        resumo.update(**valores, date_changed=Now())
+
+
+def valores_da_tentativa(tentativa, sinal=1):
+    return {
+        "inscritos": sinal,
+        "concluidas": sinal if tentativa.date_completed else 0,
+        "corrigidas": sinal if tentativa.nota is not None else 0,
+        "soma_notas": sinal * int(tentativa.nota or 0),
+    }
+
+
+def registrar_notas(tentativas):
+    """Soma aos contadores das provas as tentativas recém-corrigidas."""
+    por_prova = defaultdict(lambda: {"corrigidas": 0, "soma_notas": 0})
+    for tentativa in tentativas:
+        por_prova[tentativa.prova_id]["corrigidas"] += 1
+        por_prova[tentativa.prova_id]["soma_notas"] += int(tentativa.nota)
+
+    for prova_id, valores in por_prova.items():
+        somar(prova_id, **valores)
+
+
+def reconciliar(provas_ids=None):
+    """
+    Recalcula os contadores a partir de TentativaProva e grava apenas os
+    que divergem. Devolve quantas provas foram corrigidas.
+    """
+    provas = Prova.objects.all()
+    if provas_ids is not None:
+        provas = provas.filter(id__in=provas_ids)
+
+    divergentes = []
+    for prova in (
+        com_contadores(provas)
+        .annotate(
+            real_inscritos=Count("tentativaprova"),
+            real_concluidas=Count(
+                "tentativaprova", filter=Q(tentativaprova__date_completed__isnull=False)
+            ),
+            real_corrigidas=Count(
+                "tentativaprova", filter=Q(tentativaprova__nota__isnull=False)
+            ),
+            real_soma_notas=Sum("tentativaprova__nota", default=0),
+        )
+        .only("id")
+    ):
+        reais = {campo: getattr(prova, f"real_{campo}") for campo in CAMPOS}
+        if any(getattr(prova, campo) != valor for campo, valor in reais.items()):
+            divergentes.append(ResumoProva(prova_id=prova.id, **reais))
+
+    ResumoProva.objects.bulk_create(
+        divergentes,
+        update_conflicts=True,
+        unique_fields=["prova"],
+        update_fields=[*CAMPOS, "date_changed"],
+    )
+    return len(divergentes)
@@ -0,0 +1,245 @@
+from collections import defaultdict
+from decimal import Decimal
+from importlib.util import find_spec
+from itertools import batched
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, Sum, When
+from django.utils import timezone
+
+from core.models import Questao, Resposta, RespostaParticipante, TentativaProva
+
+######################################################################
+# Gabarito
+######################################################################
+
+
+def _cache():
+    return caches["gabarito"]
+
+
+def _chave_versao(prova_id):
+    return f"gabarito:versao:{prova_id}"
+
+
+def gabarito(prova_id):
+    """
+    Mapeia questao_id -> (ids das respostas corretas, peso) para a prova.
+
+    O resultado fica no cache sob uma chave versionada; invalidar_gabaritos
+    troca a versão quando questões ou respostas da prova mudam.
+    """
+    cache = _cache()
+    versao = cache.get_or_set(_chave_versao(prova_id), uuid4().hex, timeout=None)
+    chave = f"gabarito:{prova_id}:{versao}"
+
+    resultado = cache.get(chave)
+    if resultado is None:
+        resultado = {
+            questao_id: (frozenset(), peso)
+            for questao_id, peso in Questao.objects.filter(provas=prova_id).values_list(
+                "id", "peso"
+            )
+        }
+        corretas = defaultdict(set)
+        for questao_id, resposta_id in Resposta.objects.filter(
+            questao_id__in=resultado, is_correct=True
+        ).values_list("questao_id", "id"):
+            corretas[questao_id].add(resposta_id)
+        for questao_id, ids in corretas.items():
+            resultado[questao_id] = (frozenset(ids), resultado[questao_id][1])
+
+        cache.set(chave, resultado, timeout=settings.GABARITO_CACHE_TIMEOUT)
+
+    return resultado
+
+
+def invalidar_gabaritos(provas_ids):
+    cache = _cache()
+    cache.set_many(
+        {_chave_versao(prova_id): uuid4().hex for prova_id in set(provas_ids)},
+        timeout=None,
+    )
+
+
+######################################################################
+# Notas
+######################################################################
+
+
+def _notas_aggregate(tentativas):
+    tentativas = tentativas.annotate(
+        resultado_nota=Sum(
+            Case(
+                When(
+                    tentativas_resposta__resposta_escolhida__is_correct=True,
+                    then=F("tentativas_resposta__questao__peso"),
+                ),
+                default=0,
+                output_field=DecimalField(),
+            )
+        )
+    )
+
+    resultado = list(tentativas.only("id", "prova_id", "user_id"))
+    for tentativa in resultado:
+        tentativa.nota = tentativa.resultado_nota
+    return resultado
+
+
+def _notas_gabarito(tentativas):
+    resultado = {
+        tentativa_id: TentativaProva(id=tentativa_id, prova_id=prova_id, nota=0)
+        for tentativa_id, prova_id in tentativas.values_list("id", "prova_id")
+    }
+    gabaritos = {}
+    pontos = defaultdict(Decimal)
+
+    for tentativa_id, questao_id, resposta_id in RespostaParticipante.objects.filter(
+        tentativa_prova_id__in=resultado
+    ).values_list("tentativa_prova_id", "questao_id", "resposta_escolhida_id"):
+        prova_id = resultado[tentativa_id].prova_id
+        if prova_id not in gabaritos:
+            gabaritos[prova_id] = gabarito(prova_id)
+
+        corretas, peso = gabaritos[prova_id].get(questao_id, (frozenset(), 0))
+        if resposta_id in corretas:
+            pontos[tentativa_id] += peso
+
+    for tentativa_id, nota in pontos.items():
+        resultado[tentativa_id].nota = nota
+    return list(resultado.values())
+
+
+def _gabarito_em_arrays(provas_ids):
+    """
+    Junta os gabaritos das provas em arrays ordenados por chave, onde a chave
+    é (prova_id << 32) | resposta_id de cada resposta correta.
+    """
+    import numpy as np
+
+    linhas = [
+        ((prova_id << 32) | resposta_id, questao_id, int(peso * 100))
+        for prova_id in provas_ids
+        for questao_id, (corretas, peso) in gabarito(prova_id).items()
+        for resposta_id in corretas
+    ]
+    linhas.sort()
+    chaves, questoes, centavos = zip(*linhas, strict=True) if linhas else ((), (), ())
+    return (
+        np.array(chaves, dtype=np.int64),
+        np.array(questoes, dtype=np.int64),
+        np.array(centavos, dtype=np.int64),
+    )
+
+
+def _notas_numpy(tentativas):
+    import numpy as np
+
+    pares = np.fromiter(
+        tentativas.order_by("id").values_list("id", "prova_id").iterator(),
+        dtype=[("id", np.int64), ("prova_id", np.int64)],
+    )
+    if not len(pares):
+        return []
+
+    triplas = np.fromiter(
+        RespostaParticipante.objects.filter(tentativa_prova_id__in=tentativas)
+        .values_list("tentativa_prova_id", "questao_id", "resposta_escolhida_id")
+        .iterator(chunk_size=settings.BULK_BATCH_SIZE),
+        dtype=[("tentativa", np.int64), ("questao", np.int64), ("resposta", np.int64)],
+    )
+
+    chaves, questoes, centavos = _gabarito_em_arrays(
+        np.unique(pares["prova_id"]).tolist()
+    )
+
+    pontos = np.zeros(len(pares))
+    if len(chaves) and len(triplas):
+        posicoes = np.searchsorted(pares["id"], triplas["tentativa"])
+        chave = (pares["prova_id"][posicoes] << 32) | triplas["resposta"]
+        indices = np.minimum(np.searchsorted(chaves, chave), len(chaves) - 1)
+        acertos = (chaves[indices] == chave) & (questoes[indices] == triplas["questao"])
+        pontos = np.bincount(
+            posicoes[acertos],
+            weights=centavos[indices[acertos]],
+            minlength=len(pares),
+        )
+
+    return [
+        TentativaProva(
+            id=tentativa_id, prova_id=prova_id, nota=Decimal(int(nota)) / 100
+        )
+        for tentativa_id, prova_id, nota in zip(
+            pares["id"].tolist(),
+            pares["prova_id"].tolist(),
+            pontos.round().tolist(),
+            strict=True,
+        )
+    ]
+
+
+MOTORES = {
+    "aggregate": _notas_aggregate,
+    "gabarito": _notas_gabarito,
+}
+# O NumPy só é importado na primeira correção com esse motor: quem não o usa
+# (API, workers com outro GRADING_ENGINE) não paga o import no boot.
+if find_spec("numpy") is not None:
+    MOTORES["numpy"] = _notas_numpy
+
+
+def pendentes():
+    """
+    Tentativas a corrigir: finalizadas e ainda sem nota. Uma tentativa em
+    andamento fica de fora; corrigida antes da hora, ficaria com nota parcial
+    e não seria corrigida de novo ao ser finalizada.
+    """
+    return TentativaProva.objects.filter(nota=None, date_completed__isnull=False)
+
+
+def calcular_notas(tentativas, motor=None):
+    """
+    Calcula a nota das tentativas do queryset e devolve instâncias de
+    TentativaProva (id, prova_id e nota) prontas para gravar_notas.
+    """
+    return MOTORES[motor or settings.GRADING_ENGINE](tentativas)
+
+
+def gravar_notas(tentativas):
+    """
+    Grava as notas calculadas e devolve as tentativas efetivamente gravadas.
+    A varredura, corrigir_tentativa e um corrigir_lote reentregue podem
+    calcular a mesma tentativa: só a primeira a reservá-la grava a nota e
+    soma aos contadores e às estatísticas.
+    """
+    from provas import contadores, estatisticas
+
+    # bulk_update não aplica auto_now; date_changed muda a versão da
+    # tentativa para as requisições condicionais do portal.
+    agora = timezone.now()
+
+    with transaction.atomic():
+        # skip_locked: a tentativa que outra correção está gravando fica
+        # com ela; relida sob o lock, a que já tem nota sai do filtro.
+        reservadas = set()
+        for ids in batched((t.id for t in tentativas), settings.BULK_BATCH_SIZE):
+            reservadas.update(
+                pendentes()
+                .filter(id__in=ids)
+                .select_for_update(skip_locked=True)
+                .values_list("id", flat=True)
+            )
+        tentativas = [t for t in tentativas if t.id in reservadas]
+        for tentativa in tentativas:
+            tentativa.date_changed = agora
+
+        TentativaProva.objects.bulk_update(
+            tentativas, ["nota", "date_changed"], batch_size=settings.BULK_BATCH_SIZE
+        )
+        contadores.registrar_notas(tentativas)
+    estatisticas.registrar_notas([tentativa.id for tentativa in tentativas])
+    return tentativas
@@ -0,0 +1,224 @@
+import math
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from core.models import (
+    EstatisticaPendente,
+    EstatisticaQuestao,
+    EstatisticaResposta,
+    RespostaParticipante,
+)
+
+CAMPOS_CORRIGIDAS = (
+    "corrigidas",
+    "acertos_corrigidas",
+    "soma_notas",
+    "soma_notas_quadrado",
+    "soma_notas_acertos",
+)
+
+
+def _somar(model, filtro, defaults, valores, criar=True):
+    if criar:
+        model.objects.get_or_create(**filtro, defaults=defaults)
+    model.objects.filter(**filtro).update(
+        **{campo: F(campo) + valor for campo, valor in valores.items() if valor}
+    )
+
+
+def registrar_respostas(prova_id, nota, variacoes):
+    """
+    Soma (sinal=1) ou desconta (sinal=-1) respostas de participante, dadas
+    como (questao_id, resposta_id, sinal). As variações ficam pendentes até
+    consolidar, que as aplica em lote.
+    """
+    EstatisticaPendente.objects.bulk_create(
+        EstatisticaPendente(
+            prova_id=prova_id,
+            questao_id=questao_id,
+            resposta_id=resposta_id,
+            sinal=sinal,
+            nota=nota,
+        )
+        for questao_id, resposta_id, sinal in variacoes
+    )
+
+
+def consolidar(prova_id=None):
+    """
+    Aplica as variações pendentes (de todas as provas ou de uma), com uma
+    atualização por questão e por alternativa em cada lote. O acerto vem de
+    Resposta.is_correct, como em recalcular.
+    """
+    pendentes = EstatisticaPendente.objects.order_by("id")
+    if prova_id is not None:
+        pendentes = pendentes.filter(prova_id=prova_id)
+
+    while True:
+        with transaction.atomic():
+            # skip_locked: duas consolidações simultâneas não aplicam a mesma
+            # variação duas vezes.
+            ids = list(
+                pendentes.select_for_update(skip_locked=True).values_list(
+                    "id", flat=True
+                )[: settings.BULK_BATCH_SIZE]
+            )
+            if not ids:
+                return
+
+            lote = EstatisticaPendente.objects.filter(id__in=ids).order_by()
+            acerto = Q(resposta__is_correct=True)
+            corrigida = Q(nota__isnull=False)
+            nota = F("sinal") * F("nota")
+            for linha in lote.values("prova_id", "questao_id").annotate(
+                respostas=Sum("sinal"),
+                acertos=Sum("sinal", filter=acerto, default=0),
+                corrigidas=Sum("sinal", filter=corrigida, default=0),
+                acertos_corrigidas=Sum("sinal", filter=acerto & corrigida, default=0),
+                soma_notas=Sum(nota, default=0),
+                soma_notas_quadrado=Sum(nota * F("nota"), default=0),
+                soma_notas_acertos=Sum(nota, filter=acerto, default=0),
+            ):
+                _somar(
+                    EstatisticaQuestao,
+                    {"prova_id": linha["prova_id"], "questao_id": linha["questao_id"]},
+                    {},
+                    {
+                        campo: linha[campo]
+                        for campo in ("respostas", "acertos", *CAMPOS_CORRIGIDAS)
+                    },
+                )
+            for linha in lote.values("prova_id", "questao_id", "resposta_id").annotate(
+                escolhas=Sum("sinal")
+            ):
+                _somar(
+                    EstatisticaResposta,
+                    {
+                        "prova_id": linha["prova_id"],
+                        "resposta_id": linha["resposta_id"],
+                    },
+                    {"questao_id": linha["questao_id"]},
+                    {"escolhas": linha["escolhas"]},
+                )
+            lote.delete()
+
+
+def _agregar_corrigidas(respostas):
+    acerto = Q(resposta_escolhida__is_correct=True)
+    nota = F("tentativa_prova__nota")
+    return (
+        respostas.filter(tentativa_prova__nota__isnull=False)
+        .values("tentativa_prova__prova_id", "questao_id")
+        .annotate(
+            corrigidas=Count("id"),
+            acertos_corrigidas=Count("id", filter=acerto),
+            soma_notas=Sum(nota),
+            soma_notas_quadrado=Sum(nota * nota),
+            soma_notas_acertos=Sum(nota, filter=acerto, default=0),
+        )
+    )
+
+
+def registrar_notas(tentativas_ids):
+    """
+    Inclui nas estatísticas as notas de tentativas recém-corrigidas, com uma
+    atualização por questão em vez de uma por resposta.
+    """
+    respostas = RespostaParticipante.objects.filter(
+        tentativa_prova_id__in=tentativas_ids
+    )
+    for linha in _agregar_corrigidas(respostas):
+        _somar(
+            EstatisticaQuestao,
+            {
+                "prova_id": linha["tentativa_prova__prova_id"],
+                "questao_id": linha["questao_id"],
+            },
+            {},
+            {campo: linha[campo] for campo in CAMPOS_CORRIGIDAS},
+        )
+
+
+def recalcular(prova_id):
+    """Refaz do zero as estatísticas da prova, corrigindo qualquer desvio."""
+    respostas = RespostaParticipante.objects.filter(tentativa_prova__prova_id=prova_id)
+
+    # Tudo em uma transação: leitores nunca veem a prova sem estatísticas.
+    with transaction.atomic():
+        # As variações pendentes já estão nas respostas lidas abaixo.
+        EstatisticaPendente.objects.filter(prova_id=prova_id).delete()
+
+        questoes = {
+            linha["questao_id"]: EstatisticaQuestao(prova_id=prova_id, **linha)
+            for linha in respostas.values("questao_id").annotate(
+                respostas=Count("id"),
+                acertos=Count("id", filter=Q(resposta_escolhida__is_correct=True)),
+            )
+        }
+        for linha in _agregar_corrigidas(respostas):
+            for campo in CAMPOS_CORRIGIDAS:
+                setattr(questoes[linha["questao_id"]], campo, linha[campo])
+
+        EstatisticaQuestao.objects.filter(prova_id=prova_id).delete()
+        EstatisticaQuestao.objects.bulk_create(questoes.values())
+
+        EstatisticaResposta.objects.filter(prova_id=prova_id).delete()
+        EstatisticaResposta.objects.bulk_create(
+            EstatisticaResposta(
+                prova_id=prova_id,
+                questao_id=linha["questao_id"],
+                resposta_id=linha["resposta_escolhida_id"],
+                escolhas=linha["escolhas"],
+            )
+            for linha in respostas.values(
+                "questao_id", "resposta_escolhida_id"
+            ).annotate(escolhas=Count("id"))
+        )
+
+
+def discriminacao(estatistica):
+    """
+    Correlação ponto-bisserial entre acertar a questão e a nota da
+    tentativa, calculada a partir das somas acumuladas.
+    """
+    n = estatistica.corrigidas
+    x = estatistica.acertos_corrigidas
+    y = estatistica.soma_notas
+    variancia_x = n * x - x * x
+    variancia_y = n * estatistica.soma_notas_quadrado - y * y
+    if not n or variancia_x <= 0 or variancia_y <= 0:
+        return None
+    return (n * estatistica.soma_notas_acertos - x * y) / math.sqrt(
+        variancia_x * variancia_y
+    )
+
+
+def da_prova(prova_id):
+    consolidar(prova_id)
+
+    escolhas = {}
+    for linha in EstatisticaResposta.objects.filter(prova_id=prova_id).values(
+        "questao_id", "resposta_id", "escolhas"
+    ):
+        escolhas.setdefault(linha["questao_id"], {})[linha["resposta_id"]] = linha[
+            "escolhas"
+        ]
+
+    return [
+        {
+            "questao_id": estatistica.questao_id,
+            "respostas": estatistica.respostas,
+            "percentual_acerto": (
+                estatistica.acertos / estatistica.respostas
+                if estatistica.respostas
+                else None
+            ),
+            "discriminacao": discriminacao(estatistica),
+            "escolhas": escolhas.get(estatistica.questao_id, {}),
+        }
+        for estatistica in EstatisticaQuestao.objects.filter(
+            prova_id=prova_id
+        ).order_by("questao_id")
+    ]
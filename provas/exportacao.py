@@ -0,0 +1,92 @@
+import csv
+import io
+from itertools import batched
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from core.models import Ranking, RegistroRanking, RespostaParticipante, TentativaProva
+
+CAMPOS = {
+    "ranking": [
+        "posicao",
+        "nota",
+        "tentativa_prova_id",
+        "user_id",
+        "user__username",
+    ],
+    "tentativas": ["id", "user_id", "user__username", "date_completed", "nota"],
+    "respostas": [
+        "id",
+        "tentativa_prova_id",
+        "tentativa_prova__user_id",
+        "questao_id",
+        "resposta_escolhida_id",
+        "resposta_escolhida__is_correct",
+    ],
+}
+
+
+def _queryset(prova_id, recurso):
+    if recurso == "ranking":
+        ranking = Ranking.objects.filter(prova_id=prova_id).first()
+        if ranking is None:
+            return RegistroRanking.objects.none()
+        return RegistroRanking.objects.filter(
+            ranking=ranking, geracao=ranking.geracao_ativa
+        ).order_by("posicao")
+
+    if recurso == "tentativas":
+        return TentativaProva.objects.filter(prova_id=prova_id).order_by("id")
+
+    return RespostaParticipante.objects.filter(
+        tentativa_prova__prova_id=prova_id
+    ).order_by("tentativa_prova_id", "questao_id")
+
+
+def _csv(campos, linhas):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(campos)
+    yield buffer.getvalue()
+
+    for lote in linhas:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(lote)
+        yield buffer.getvalue()
+
+
+def _ndjson(campos, linhas):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for lote in linhas:
+        yield "".join(
+            encoder.encode(dict(zip(campos, linha, strict=True))) + "\n"
+            for linha in lote
+        )
+
+
+FORMATOS = {
+    "csv": (_csv, "text/csv"),
+    "ndjson": (_ndjson, "application/x-ndjson"),
+}
+
+
+def exportar(prova_id, recurso, formato):
+    """
+    Devolve (gerador de texto, content type) com as linhas do recurso da
+    prova. As linhas vêm do banco em blocos de EXPORT_CHUNK_SIZE, então a
+    memória usada não depende do tamanho da exportação.
+    """
+    campos = CAMPOS[recurso]
+    chunk_size = settings.EXPORT_CHUNK_SIZE
+    linhas = batched(
+        _queryset(prova_id, recurso)
+        .values_list(*campos)
+        .iterator(chunk_size=chunk_size),
+        chunk_size,
+    )
+
+    gerador, content_type = FORMATOS[formato]
+    return gerador(campos, linhas), content_type
@@ -0,0 +1,72 @@
+"""
+Configuração do gunicorn para produção:
+
+    gunicorn -c python:provas.gunicorn_conf
+
+Todos os valores podem ser sobrescritos por variáveis de ambiente
+GUNICORN_* ou pelas opções da linha de comando (por exemplo, --workers).
+"""
+
+import os
+
+
+def _env_int(nome, padrao):
+    return int(os.environ.get(nome, padrao))
+
+
+def _nucleos():
+    # sched_getaffinity respeita o cpuset do container; cpu_count não.
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - macOS
+        return os.cpu_count() or 1
+
+
+NUCLEOS = _nucleos()
+
+# sync: um request por processo; gthread: threads por processo, bom para
+# o tempo de espera no banco; uvicorn: ASGI (pacote uvicorn-worker).
+WORKER_CLASSES = {
+    "sync": "sync",
+    "gthread": "gthread",
+    "uvicorn": "uvicorn_worker.UvicornWorker",
+}
+WORKERS_POR_CLASSE = {
+    "sync": 2 * NUCLEOS + 1,
+    "gthread": NUCLEOS + 1,
+    "uvicorn": NUCLEOS,
+}
+
+classe = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+
+wsgi_app = (
+    "provas.asgi:application" if classe == "uvicorn" else "provas.wsgi:application"
+)
+worker_class = WORKER_CLASSES[classe]
+workers = _env_int("GUNICORN_WORKERS", WORKERS_POR_CLASSE[classe])
+threads = _env_int("GUNICORN_THREADS", 4) if classe == "gthread" else 1
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+
+# Recicla cada worker após max_requests (± jitter, para não reiniciarem
+# todos juntos), contendo vazamentos de memória.
+max_requests = _env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = _env_int("GUNICORN_MAX_REQUESTS_JITTER", 100)
+
+# Carrega a aplicação uma vez no master e compartilha a memória com os
+# workers (copy-on-write); conexões com banco e Redis só abrem depois do fork.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") == "1"
+
+# Atrás de um balanceador, keepalive deve passar do idle timeout dele.
+keepalive = _env_int("GUNICORN_KEEPALIVE", 5)
+timeout = _env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = _env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+
+# Heartbeat dos workers em memória: em containers, /tmp pode ser um disco
+# lento e travar os workers.
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+# GUNICORN_ACCESSLOG vazio desliga o log de acesso.
+accesslog = os.environ.get("GUNICORN_ACCESSLOG", "-") or None
+errorlog = "-"
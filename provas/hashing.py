@@ -0,0 +1,129 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.cache import cache
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASHING_MAX_WORKERS,
+    thread_name_prefix="password-hashing",
+)
+# Limita os hashes de login em andamento. É adquirido antes de o hash entrar
+# no pool, então nada espera na fila (sem limite) do executor: acima do
+# limite a requisição espera no máximo LOGIN_QUEUE_TIMEOUT e recebe 429.
+_semaforo = threading.BoundedSemaphore(settings.LOGIN_MAX_CONCURRENCY)
+
+# Provisionamento em lote tem pool próprio para não ocupar as vagas do login.
+_executor_lote = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASHING_BULK_WORKERS,
+    thread_name_prefix="password-hashing-lote",
+)
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    # Parâmetros mínimos recomendados pela OWASP (19 MiB, 2 iterações).
+    time_cost = 2
+    memory_cost = 19456
+    parallelism = 1
+
+
+class BCryptSHA256PasswordHasher(hashers.BCryptSHA256PasswordHasher):
+    rounds = 10
+
+
+def _erro_429(mensagem):
+    # Os hashers deste módulo também rodam nos workers do Celery, que não
+    # carregam o ninja; ele só é importado no caminho do login.
+    from ninja.errors import HttpError
+
+    return HttpError(429, mensagem)
+
+
+def _ocupado():
+    return _erro_429("Servidor ocupado, tente novamente em instantes.")
+
+
+def _executar(func, *args):
+    if not _semaforo.acquire(timeout=settings.LOGIN_QUEUE_TIMEOUT):
+        raise _ocupado()
+    try:
+        return func(*args)
+    finally:
+        _semaforo.release()
+
+
+async def _aexecutar(func, *args):
+    loop = asyncio.get_running_loop()
+    prazo = loop.time() + settings.LOGIN_QUEUE_TIMEOUT
+    # Sem bloquear o event loop esperando o semáforo.
+    while not _semaforo.acquire(blocking=False):
+        if loop.time() >= prazo:
+            raise _ocupado()
+        await asyncio.sleep(0.01)
+    try:
+        return await loop.run_in_executor(_executor, func, *args)
+    finally:
+        _semaforo.release()
+
+
+def check_password(user, raw_password):
+    if user is None:
+        # Executa o hasher padrão mesmo sem usuário para não expor, pelo tempo
+        # de resposta, quais usernames existem.
+        _executar(hashers.make_password, raw_password)
+        return False
+
+    return _executar(user.check_password, raw_password)
+
+
+def make_password(raw_password):
+    return _executar(hashers.make_password, raw_password)
+
+
+def make_passwords(raw_passwords):
+    return list(_executor_lote.map(hashers.make_password, raw_passwords))
+
+
+async def acheck_password(user, raw_password):
+    if user is None:
+        await _aexecutar(hashers.make_password, raw_password)
+        return False
+
+    # Apenas o hash roda no pool; a eventual atualização do hash (troca de
+    # perfil de hasher) é salva no próprio event loop.
+    valido = await _aexecutar(hashers.check_password, raw_password, user.password)
+    if valido and hashers.identify_hasher(user.password).must_update(user.password):
+        user.password = await amake_password(raw_password)
+        await user.asave(update_fields=["password"])
+
+    return valido
+
+
+async def amake_password(raw_password):
+    return await _aexecutar(hashers.make_password, raw_password)
+
+
+def _chave_limite(username):
+    return f"login:falhas:{username}"
+
+
+def verificar_limite_login(username):
+    tentativas, _ = settings.LOGIN_RATE_LIMIT
+    if cache.get(_chave_limite(username), 0) >= tentativas:
+        raise _erro_429("Muitas tentativas de login. Tente novamente mais tarde.")
+
+
+def registrar_falha_login(username):
+    _, janela = settings.LOGIN_RATE_LIMIT
+    chave = _chave_limite(username)
+    if not cache.add(chave, 1, janela):
+        try:
+            cache.incr(chave)
+        except ValueError:
+            cache.set(chave, 1, janela)
+
+
+def limpar_falhas_login(username):
+    cache.delete(_chave_limite(username))
@@ -0,0 +1,70 @@
+import csv
+from itertools import batched
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from provas.bulk import provisionar_usuarios
+from provas.tasks import importar_usuarios
+
+CAMPOS = ["username", "password", "first_name", "last_name", "email", "role"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Cria usuários em lote a partir de um CSV com as colunas "
+        f"{', '.join(CAMPOS)} (first_name, last_name e role são opcionais)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("arquivo")
+        parser.add_argument("--batch-size", type=int)
+        parser.add_argument(
+            "--senhas-hash",
+            action="store_true",
+            help="A coluna password já contém hashes no formato do Django.",
+        )
+        parser.add_argument(
+            "--fila",
+            action="store_true",
+            help="Envia os lotes para a fila de importação do Celery em vez de "
+            "criá-los neste processo.",
+        )
+
+    def handle(self, *args, **options):
+        with open(options["arquivo"], newline="") as arquivo:
+            usuarios = (
+                {
+                    campo: valor
+                    for campo, valor in linha.items()
+                    if campo in CAMPOS and valor
+                }
+                for linha in csv.DictReader(arquivo)
+            )
+            if options["fila"]:
+                lotes = 0
+                for lote in batched(
+                    usuarios, options["batch_size"] or settings.BULK_BATCH_SIZE
+                ):
+                    importar_usuarios.delay(list(lote), options["senhas_hash"])
+                    lotes += 1
+                self.stdout.write(
+                    self.style.SUCCESS(f"{lotes} lote(s) enviado(s) para a fila.")
+                )
+                return
+
+            criados, ignorados = provisionar_usuarios(
+                usuarios,
+                senhas_hash=options["senhas_hash"],
+                batch_size=options["batch_size"],
+            )
+
+        for ignorado in ignorados:
+            self.stdout.write(
+                self.style.WARNING(f"{ignorado['username']}: {ignorado['motivo']}")
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{criados} usuário(s) criado(s), {len(ignorados)} ignorado(s)."
+            )
+        )
@@ -0,0 +1,154 @@
+import threading
+from bisect import bisect_left
+
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BUCKETS_QUERIES = (1, 2, 5, 10, 20, 50, 100, 250, 500, 1000)
+
+
+def _escapar(valor):
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(nomes, valores):
+    if not nomes:
+        return ""
+    pares = ",".join(
+        f'{nome}="{_escapar(valor)}"'
+        for nome, valor in zip(nomes, valores, strict=True)
+    )
+    return f"{{{pares}}}"
+
+
+class Counter:
+    tipo = "counter"
+
+    def __init__(self, nome, descricao, labels=()):
+        self.nome = nome
+        self.descricao = descricao
+        self.labels = labels
+        self._valores = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, valor=1):
+        with self._lock:
+            self._valores[labels] = self._valores.get(labels, 0) + valor
+
+    def amostras(self):
+        with self._lock:
+            valores = dict(self._valores)
+        for labels, valor in valores.items():
+            yield f"{self.nome}{_labels(self.labels, labels)} {valor}"
+
+
+class Histogram:
+    tipo = "histogram"
+
+    def __init__(self, nome, descricao, labels=(), buckets=BUCKETS_SEGUNDOS):
+        self.nome = nome
+        self.descricao = descricao
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._valores = {}
+        self._lock = threading.Lock()
+
+    def observe(self, valor, *labels):
+        with self._lock:
+            contagens, soma, total = self._valores.get(
+                labels, ([0] * len(self.buckets), 0, 0)
+            )
+            indice = bisect_left(self.buckets, valor)
+            if indice < len(self.buckets):
+                contagens[indice] += 1
+            self._valores[labels] = (contagens, soma + valor, total + 1)
+
+    def amostras(self):
+        with self._lock:
+            valores = {
+                labels: (list(contagens), soma, total)
+                for labels, (contagens, soma, total) in self._valores.items()
+            }
+        nomes = (*self.labels, "le")
+        for labels, (contagens, soma, total) in valores.items():
+            acumulado = 0
+            for limite, contagem in zip(self.buckets, contagens, strict=True):
+                acumulado += contagem
+                yield f"{self.nome}_bucket{_labels(nomes, (*labels, limite))} {acumulado}"
+            yield f"{self.nome}_bucket{_labels(nomes, (*labels, '+Inf'))} {total}"
+            yield f"{self.nome}_sum{_labels(self.labels, labels)} {soma}"
+            yield f"{self.nome}_count{_labels(self.labels, labels)} {total}"
+
+
+class Registry:
+    def __init__(self):
+        self._metricas = []
+        self._coletores = []
+
+    def counter(self, *args, **kwargs):
+        metrica = Counter(*args, **kwargs)
+        self._metricas.append(metrica)
+        return metrica
+
+    def histogram(self, *args, **kwargs):
+        metrica = Histogram(*args, **kwargs)
+        self._metricas.append(metrica)
+        return metrica
+
+    def coletor(self, func):
+        """Registra uma função que devolve linhas extras no formato Prometheus."""
+        self._coletores.append(func)
+        return func
+
+    def render(self):
+        linhas = []
+        for metrica in self._metricas:
+            linhas.append(f"# HELP {metrica.nome} {metrica.descricao}")
+            linhas.append(f"# TYPE {metrica.nome} {metrica.tipo}")
+            linhas.extend(metrica.amostras())
+        for coletor in self._coletores:
+            linhas.extend(coletor())
+        return "\n".join(linhas) + "\n"
+
+
+registry = Registry()
+
+requisicoes = registry.counter(
+    "http_requests_total",
+    "Requisições atendidas, por rota, método e status.",
+    labels=("route", "method", "status"),
+)
+duracao_requisicao = registry.histogram(
+    "http_request_duration_seconds",
+    "Latência total da requisição.",
+    labels=("route", "method"),
+)
+queries_requisicao = registry.histogram(
+    "http_request_db_queries",
+    "Número de queries SQL por requisição.",
+    labels=("route", "method"),
+    buckets=BUCKETS_QUERIES,
+)
+duracao_db = registry.histogram(
+    "http_request_db_duration_seconds",
+    "Tempo gasto em queries SQL por requisição.",
+    labels=("route", "method"),
+)
+duracao_render = registry.histogram(
+    "http_request_render_duration_seconds",
+    "Tempo gasto serializando a resposta.",
+    labels=("route", "method"),
+)
+
+
+@registry.coletor
+def _token_cache():
+    from provas.auth import token_cache
+
+    stats = token_cache.stats()
+    return [
+        "# TYPE jwt_token_cache_hits_total counter",
+        f"jwt_token_cache_hits_total {stats['hits']}",
+        "# TYPE jwt_token_cache_misses_total counter",
+        f"jwt_token_cache_misses_total {stats['misses']}",
+        "# TYPE jwt_token_cache_size gauge",
+        f"jwt_token_cache_size {stats['size']}",
+    ]
@@ -0,0 +1,135 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import decorator_from_middleware
+from django.utils.deprecation import MiddlewareMixin
+
+from provas import compressao, metrics
+
+logger = logging.getLogger("provas.sql_lento")
+
+
+class _ContadorQueries:
+    def __init__(self, rota, limite_lento):
+        self.rota = rota
+        self.limite_lento = limite_lento
+        self.queries = 0
+        self.tempo = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duracao = time.perf_counter() - inicio
+            self.queries += 1
+            self.tempo += duracao
+            if self.limite_lento is not None and duracao * 1000 >= self.limite_lento:
+                logger.warning(
+                    "Query lenta (%.1f ms) em %s: %s",
+                    duracao * 1000,
+                    self.rota(),
+                    sql,
+                )
+
+
+class InstrumentationMiddleware:
+    """
+    Registra, por rota, latência total, número e tempo de queries e tempo de
+    serialização. Os valores vão para provas.metrics e para o header
+    Server-Timing da resposta.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.tempo_render = 0.0
+        contador = _ContadorQueries(
+            lambda: self._rota(request), settings.SLOW_QUERY_THRESHOLD_MS
+        )
+
+        inicio = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(contador))
+            response = self.get_response(request)
+        total = time.perf_counter() - inicio
+
+        rota, metodo = self._rota(request), request.method
+        metrics.requisicoes.inc(rota, metodo, response.status_code)
+        metrics.duracao_requisicao.observe(total, rota, metodo)
+        metrics.queries_requisicao.observe(contador.queries, rota, metodo)
+        metrics.duracao_db.observe(contador.tempo, rota, metodo)
+        metrics.duracao_render.observe(request.tempo_render, rota, metodo)
+
+        response["Server-Timing"] = (
+            f'db;dur={contador.tempo * 1000:.2f};desc="{contador.queries} queries", '
+            f"render;dur={request.tempo_render * 1000:.2f}, "
+            f"total;dur={total * 1000:.2f}"
+        )
+        return response
+
+    @staticmethod
+    def _rota(request):
+        match = getattr(request, "resolver_match", None)
+        return match.route if match else "desconhecida"
+
+
+class CompressaoMiddleware(MiddlewareMixin):
+    """
+    Comprime respostas JSON, CSV e NDJSON (inclusive em streaming) com a
+    codificação negociada em provas.compressao. O Accept-Encoding da
+    requisição é reduzido à codificação escolhida, para que cache_page
+    guarde uma única variante por codificação; usado como decorator
+    (provas.middleware.comprimir) antes do cache_page, a variante guardada
+    já vem comprimida.
+    """
+
+    def process_request(self, request):
+        codificacao = compressao.negociar(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        request.META["HTTP_ACCEPT_ENCODING"] = codificacao or "identity"
+
+    def process_response(self, request, response):
+        if response.has_header("Content-Encoding") or not compressao.compressivel(
+            response.get("Content-Type", "")
+        ):
+            return response
+        if response.streaming:
+            if response.is_async:
+                return response
+        elif len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        codificacao = compressao.negociar(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if codificacao is None:
+            return response
+        comprimir, comprimir_sequencia = compressao.CODIFICADORES[codificacao]
+
+        if response.streaming:
+            response.streaming_content = comprimir_sequencia(response.streaming_content)
+            # O tamanho comprimido só é conhecido ao fim do streaming.
+            del response.headers["Content-Length"]
+        else:
+            conteudo = comprimir(response.content)
+            if len(conteudo) >= len(response.content):
+                return response
+            response.content = conteudo
+            response.headers["Content-Length"] = str(len(conteudo))
+
+        # O corpo comprimido não é idêntico byte a byte ao original.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+
+        response.headers["Content-Encoding"] = codificacao
+        return response
+
+
+comprimir = decorator_from_middleware(CompressaoMiddleware)
@@ -0,0 +1,32 @@
+from django.core.exceptions import FieldDoesNotExist
+from ninja.errors import HttpError
+
+
+def projetar(queryset, schema, fields):
+    """
+    Restringe a listagem aos campos pedidos em ``fields`` (separados por
+    vírgula): a query passa a usar values() e a resposta, com
+    exclude_unset, traz só esses campos. Sem ``fields`` nada muda. Campos
+    anotados no queryset também podem ser pedidos.
+    """
+    if not fields:
+        return queryset
+
+    anotacoes = queryset.query.annotations
+    campos = list(dict.fromkeys(c.strip() for c in fields.split(",") if c.strip()))
+
+    invalidos = []
+    for campo in campos:
+        if campo not in schema.model_fields:
+            invalidos.append(campo)
+            continue
+        try:
+            if queryset.model._meta.get_field(campo).many_to_many:
+                invalidos.append(campo)
+        except FieldDoesNotExist:
+            if campo not in anotacoes:
+                invalidos.append(campo)
+    if invalidos:
+        raise HttpError(400, f"Campos inválidos em fields: {', '.join(invalidos)}")
+
+    return queryset.values(*campos)
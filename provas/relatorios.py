@@ -0,0 +1,115 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Avg, Count, Max, Min, Q
+from django.utils import timezone
+
+from core.models import (
+    Questao,
+    RelatorioProva,
+    Resposta,
+    RespostaParticipante,
+    TentativaProva,
+)
+
+
+def assinatura(prova_id):
+    """
+    Resume o estado da prova em um hash: quantidade e última alteração das
+    questões, respostas, tentativas e respostas dos participantes.
+    """
+    partes = [
+        queryset.aggregate(total=Count("id"), ultima=Max("date_changed"))
+        for queryset in (
+            Questao.objects.filter(provas=prova_id),
+            Resposta.objects.filter(questao__provas=prova_id),
+            TentativaProva.objects.filter(prova_id=prova_id),
+            RespostaParticipante.objects.filter(tentativa_prova__prova_id=prova_id),
+        )
+    ]
+    conteudo = json.dumps(partes, cls=DjangoJSONEncoder, sort_keys=True)
+    return hashlib.sha256(conteudo.encode()).hexdigest()
+
+
+def calcular(prova_id):
+    tentativas = TentativaProva.objects.filter(prova_id=prova_id, nota__isnull=False)
+    respostas = RespostaParticipante.objects.filter(tentativa_prova__prova_id=prova_id)
+
+    questoes = {
+        questao["questao_id"]: {
+            **questao,
+            "dificuldade": 1 - questao["acertos"] / questao["total"],
+            "frequencia_respostas": {},
+        }
+        for questao in respostas.values("questao_id")
+        .annotate(
+            total=Count("id"),
+            acertos=Count("id", filter=Q(resposta_escolhida__is_correct=True)),
+        )
+        .order_by("questao_id")
+    }
+    for linha in respostas.values("questao_id", "resposta_escolhida_id").annotate(
+        total=Count("id")
+    ):
+        questoes[linha["questao_id"]]["frequencia_respostas"][
+            linha["resposta_escolhida_id"]
+        ] = linha["total"]
+
+    return {
+        "prova_id": prova_id,
+        "notas": tentativas.aggregate(
+            total=Count("id"), media=Avg("nota"), minima=Min("nota"), maxima=Max("nota")
+        ),
+        "distribuicao_notas": {
+            linha["nota"]: linha["total"]
+            for linha in tentativas.values("nota")
+            .annotate(total=Count("id"))
+            .order_by("nota")
+        },
+        "questoes": list(questoes.values()),
+    }
+
+
+def _orfaos():
+    limite = timezone.now() - timedelta(seconds=settings.RELATORIO_TIMEOUT)
+    return Q(status=RelatorioProva.Status.PROCESSANDO, date_changed__lt=limite)
+
+
+def orfao(relatorio):
+    return RelatorioProva.objects.filter(_orfaos(), id=relatorio.id).exists()
+
+
+def reservar(relatorio_id):
+    """
+    Passa o relatório para PROCESSANDO se estiver pendente ou órfão e o
+    devolve; None se outro worker já o está gerando ou se já terminou.
+    """
+    reservado = (
+        RelatorioProva.objects.filter(id=relatorio_id)
+        .filter(Q(status=RelatorioProva.Status.PENDENTE) | _orfaos())
+        .update(status=RelatorioProva.Status.PROCESSANDO, date_changed=timezone.now())
+    )
+    if reservado:
+        return RelatorioProva.objects.get(id=relatorio_id)
+
+
+def gerar(relatorio):
+    try:
+        conteudo = json.dumps(calcular(relatorio.prova_id), cls=DjangoJSONEncoder)
+        relatorio.arquivo.save(
+            f"prova_{relatorio.prova_id}_{relatorio.assinatura[:12]}.json",
+            ContentFile(conteudo.encode()),
+            save=False,
+        )
+    except Exception as e:
+        relatorio.status = RelatorioProva.Status.ERRO
+        relatorio.erro = str(e)
+        relatorio.save(update_fields=["status", "erro", "date_changed"])
+        raise
+
+    relatorio.status = RelatorioProva.Status.PRONTO
+    relatorio.save(update_fields=["status", "arquivo", "date_changed"])
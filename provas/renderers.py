@@ -0,0 +1,49 @@
+import time
+
+from django.conf import settings
+from ninja.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class TimedJSONRenderer(JSONRenderer):
+    def render(self, request, data, *, response_status):
+        inicio = time.perf_counter()
+        try:
+            # Corpo já serializado (por exemplo, guardado em cache) vai direto.
+            if isinstance(data, bytes):
+                return data
+            return self.serializar(data)
+        finally:
+            request.tempo_render = (
+                getattr(request, "tempo_render", 0.0) + time.perf_counter() - inicio
+            )
+
+    def serializar(self, data):
+        return super().render(None, data, response_status=None)
+
+
+class OrjsonRenderer(TimedJSONRenderer):
+    # Datas e Decimal passam pelo encoder do ninja para que o JSON saia igual
+    # ao do renderer padrão ("2024-01-01T12:00:00.123Z", "1.50").
+    opcoes = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+
+    def __init__(self):
+        self._default = self.encoder_class().default
+
+    def serializar(self, data):
+        return orjson.dumps(data, default=self._default, option=self.opcoes)
+
+
+RENDERERS = {"json": TimedJSONRenderer}
+if orjson is not None:
+    RENDERERS["orjson"] = OrjsonRenderer
+
+
+def renderer(nome=None):
+    nome = nome or settings.API_JSON_RENDERER
+    # Sem orjson instalado, o padrão cai para o json da biblioteca padrão.
+    return RENDERERS.get(nome, TimedJSONRenderer)()
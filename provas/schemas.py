@@ -4,6 +4,7 @@ from core.models import (
     Prova,
     Questao,
     RegistroRanking,
+    RelatorioProva,
     Resposta,
     RespostaParticipante,
     TentativaProva,
@@ -39,6 +40,11 @@ class UserIn(ModelSchema):
         fields = ["username", "password", "first_name", "last_name", "role", "email"]
 
 
+class UsersBulkIn(Schema):
+    users: list[UserIn]
+    senhas_hash: bool = False
+
+
 class UserPatch(ModelSchema):
     class Meta:
         model = User
@@ -47,9 +53,31 @@ class UserPatch(ModelSchema):
 
 
 class ProvasOut(ModelSchema):
+    # Anotados a partir de ResumoProva (provas.contadores.com_contadores)
+    inscritos: int
+    concluidas: int
+    corrigidas: int
+    soma_notas: int
+    media_nota: float | None
+
+    class Meta:
+        model = Prova
+        fields = "__all__"
+
+
+# Os schemas *Projecao têm todos os campos opcionais: são a resposta das
+# listagens com ?fields= (provas.projecao), que devolvem só parte deles.
+class ProvasProjecao(ModelSchema):
+    inscritos: int | None = None
+    concluidas: int | None = None
+    corrigidas: int | None = None
+    soma_notas: int | None = None
+    media_nota: float | None = None
+
     class Meta:
         model = Prova
         fields = "__all__"
+        fields_optional = "__all__"
 
 
 class ProvasIn(ModelSchema):
@@ -65,12 +93,25 @@ class ProvasPatch(ModelSchema):
         fields_optional = "__all__"
 
 
+class InscricaoIn(Schema):
+    user_ids: list[int] | None = None
+    q: str | None = None
+    todos: bool = False
+
+
 class QuestoesOut(ModelSchema):
     class Meta:
         model = Questao
         fields = "__all__"
 
 
+class QuestoesProjecao(ModelSchema):
+    class Meta:
+        model = Questao
+        fields = "__all__"
+        fields_optional = "__all__"
+
+
 class QuestoesIn(ModelSchema):
     class Meta:
         model = Questao
@@ -94,6 +135,13 @@ class RespostasOut(ModelSchema):
         fields = "__all__"
 
 
+class RespostasProjecao(ModelSchema):
+    class Meta:
+        model = Resposta
+        fields = "__all__"
+        fields_optional = "__all__"
+
+
 class RespostasIn(ModelSchema):
     class Meta:
         model = Resposta
@@ -119,6 +167,13 @@ class RespostaParticipanteOut(ModelSchema):
         fields = "__all__"
 
 
+class RespostaParticipanteProjecao(ModelSchema):
+    class Meta:
+        model = RespostaParticipante
+        fields = "__all__"
+        fields_optional = "__all__"
+
+
 class RespostaParticipantePatch(Schema):
     tentativa_prova_id: int | None = None
     questao_id: int | None = None
@@ -128,10 +183,24 @@ class RespostaParticipantePatch(Schema):
 class RankingOut(ModelSchema):
     class Meta:
         model = RegistroRanking
-        fields = ["posicao", "user", "nota"]
+        fields = ["posicao", "user", "tentativa_prova", "nota"]
 
 
 class TentativaProvaOut(ModelSchema):
     class Meta:
         model = TentativaProva
         fields = ["prova", "date_completed", "nota"]
+
+
+class RelatorioOut(ModelSchema):
+    class Meta:
+        model = RelatorioProva
+        fields = ["id", "prova", "status", "erro", "date_created"]
+
+
+class EstatisticaQuestaoOut(Schema):
+    questao_id: int
+    respostas: int
+    percentual_acerto: float | None
+    discriminacao: float | None
+    escolhas: dict[int, int]
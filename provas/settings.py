@@ -1,6 +1,8 @@
 import os
 from pathlib import Path
 
+from kombu import Queue
+
 ######################################################################
 # General
 ######################################################################
@@ -42,7 +44,9 @@ INSTALLED_APPS = [
 # Middleware
 ######################################################################
 MIDDLEWARE = [
+    "provas.middleware.InstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "provas.middleware.CompressaoMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -75,10 +79,60 @@ TEMPLATES = [
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": os.environ.get("SQLITE_PATH", BASE_DIR / "db.sqlite3"),
     }
 }
 
+######################################################################
+# Caches
+######################################################################
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Métricas das tarefas Celery, escritas pelos workers e lidas em /metrics.
+    # Precisa ser compartilhado (Redis) quando web e workers rodam separados.
+    "metrics": (
+        {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["METRICS_CACHE_URL"],
+        }
+        if os.environ.get("METRICS_CACHE_URL")
+        else {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "metrics",
+        }
+    ),
+    # Gabaritos usados na correção (provas.correcao). Fica no Redis para que a
+    # invalidação feita pela API chegue aos workers; GABARITO_CACHE_URL=locmem
+    # só serve para um único processo (testes, desenvolvimento).
+    "gabarito": (
+        {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "gabarito",
+        }
+        if os.environ.get("GABARITO_CACHE_URL") == "locmem"
+        else {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ.get("GABARITO_CACHE_URL", "redis://redis:6379/2"),
+        }
+    ),
+    # Versão dos tokens de cada usuário (provas.auth). Fica no Redis para que
+    # a invalidação feita por um processo da API chegue aos demais;
+    # TOKEN_CACHE_URL=locmem só serve para um único processo.
+    "tokens": (
+        {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "tokens",
+        }
+        if os.environ.get("TOKEN_CACHE_URL") == "locmem"
+        else {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ.get("TOKEN_CACHE_URL", "redis://redis:6379/3"),
+        }
+    ),
+}
+
 ######################################################################
 # Authentication
 ######################################################################
@@ -99,6 +153,73 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+PASSWORD_HASHER_PROFILES = {
+    "pbkdf2": [
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+        "provas.hashing.Argon2PasswordHasher",
+        "provas.hashing.BCryptSHA256PasswordHasher",
+    ],
+    "argon2": [
+        "provas.hashing.Argon2PasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+        "provas.hashing.BCryptSHA256PasswordHasher",
+    ],
+    "bcrypt": [
+        "provas.hashing.BCryptSHA256PasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+        "provas.hashing.Argon2PasswordHasher",
+    ],
+}
+
+PASSWORD_HASHER_PROFILE = os.environ.get("PASSWORD_HASHER_PROFILE", "pbkdf2")
+
+PASSWORD_HASHERS = PASSWORD_HASHER_PROFILES[PASSWORD_HASHER_PROFILE]
+
+PASSWORD_HASHING_ASYNC = os.environ.get("PASSWORD_HASHING_ASYNC", "0") == "1"
+
+PASSWORD_HASHING_MAX_WORKERS = int(
+    os.environ.get("PASSWORD_HASHING_MAX_WORKERS", os.cpu_count() or 1)
+)
+
+# Hashes de login simultâneos (em andamento no pool ou nas views síncronas);
+# igual ao pool para que nenhum fique enfileirado no executor.
+LOGIN_MAX_CONCURRENCY = int(
+    os.environ.get("LOGIN_MAX_CONCURRENCY", PASSWORD_HASHING_MAX_WORKERS)
+)
+
+# Pool separado para make_passwords (provisionamento em lote)
+PASSWORD_HASHING_BULK_WORKERS = int(
+    os.environ.get("PASSWORD_HASHING_BULK_WORKERS", max(1, (os.cpu_count() or 1) // 2))
+)
+
+LOGIN_QUEUE_TIMEOUT = 5
+
+# (falhas permitidas, janela em segundos) por username
+LOGIN_RATE_LIMIT = (10, 60)
+
+# Tamanho dos lotes de bulk_create em provisionamentos e inscrições em massa
+BULK_BATCH_SIZE = 1000
+
+# Linhas lidas do banco por vez nas exportações em streaming
+EXPORT_CHUNK_SIZE = 2000
+
+# Renderer das respostas da API (provas.renderers.RENDERERS); "orjson" cai
+# para "json" se o pacote não estiver instalado.
+API_JSON_RENDERER = os.environ.get("API_JSON_RENDERER", "orjson")
+
+# Compressão das respostas (provas.middleware.CompressaoMiddleware): ordem de
+# preferência entre as codificações aceitas pelo cliente; br e zstd só valem
+# com os pacotes brotli e zstandard instalados.
+COMPRESSION_ENCODINGS = os.environ.get("COMPRESSION_ENCODINGS", "br,zstd,gzip").split(
+    ","
+)
+COMPRESSION_LEVELS = {"gzip": 6, "br": 5, "zstd": 3}
+# Corpos menores que isso (em bytes) vão sem compressão; streaming sempre vai.
+COMPRESSION_MIN_SIZE = 1024
+
 ######################################################################
 # Localization
 ######################################################################
@@ -123,6 +244,20 @@ MEDIA_ROOT = BASE_DIR / "media"
 
 MEDIA_URL = "/media/"
 
+######################################################################
+# Observability
+######################################################################
+# IPs que podem ler /metrics; lista vazia libera para qualquer origem.
+METRICS_ALLOWED_IPS = os.environ.get("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(",")
+
+# Queries acima deste tempo (ms) são logadas em "provas.sql_lento" com o SQL.
+# None desativa o log.
+SLOW_QUERY_THRESHOLD_MS = (
+    float(os.environ["SLOW_QUERY_THRESHOLD_MS"])
+    if os.environ.get("SLOW_QUERY_THRESHOLD_MS")
+    else None
+)
+
 ######################################################################
 # Celery
 ######################################################################
@@ -130,6 +265,98 @@ MEDIA_URL = "/media/"
 CELERY_BROKER_URL = os.environ.get("CELERY_BROKER", "redis://redis:6379/0")
 CELERY_RESULT_BACKEND = os.environ.get("CELERY_BACKEND", "redis://redis:6379/0")
 
+# Filas: "correcao" recebe só a correção de tentativas recém-finalizadas, para
+# que não espere atrás de correções em lote ("correcao_lote"), de rankings
+# ("ranking") ou de importações ("importacao"). Veja o docker-compose.yml.
+CELERY_TASK_DEFAULT_QUEUE = "default"
+CELERY_TASK_QUEUES = [
+    Queue("default"),
+    Queue("correcao"),
+    Queue("correcao_lote"),
+    Queue("ranking"),
+    Queue("importacao"),
+    Queue("relatorios"),
+]
+CELERY_TASK_ROUTES = {
+    "provas.tasks.corrigir_tentativa": {"queue": "correcao"},
+    "provas.tasks.corrigir_provas": {"queue": "correcao_lote"},
+    "provas.tasks.corrigir_lote": {"queue": "correcao_lote"},
+    "provas.tasks.recalcular_rankings": {"queue": "ranking"},
+    "provas.tasks.calcular_ranking": {"queue": "ranking"},
+    "provas.tasks.limpar_rankings": {"queue": "ranking"},
+    "provas.tasks.importar_usuarios": {"queue": "importacao"},
+    "provas.tasks.gerar_relatorio": {"queue": "relatorios"},
+    "provas.tasks.recalcular_estatisticas": {"queue": "relatorios"},
+    "provas.tasks.consolidar_estatisticas": {"queue": "relatorios"},
+    "provas.tasks.reconciliar_contadores": {"queue": "relatorios"},
+}
+
+# As tarefas são idempotentes (só corrigem tentativas com nota nula e
+# reconstroem rankings inteiros), então podem ser reentregues se o worker cair.
+CELERY_TASK_ACKS_LATE = True
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = int(
+    os.environ.get("CELERY_WORKER_PREFETCH_MULTIPLIER", 1)
+)
+CELERY_TASK_SOFT_TIME_LIMIT = 60
+CELERY_TASK_TIME_LIMIT = 90
+CELERY_TASK_ANNOTATIONS = {
+    "provas.tasks.corrigir_tentativa": {"soft_time_limit": 10, "time_limit": 20},
+    "provas.tasks.corrigir_lote": {"soft_time_limit": 120, "time_limit": 150},
+    # Sem GRADING_FAN_OUT, a varredura corrige tudo o que está pendente, em
+    # lotes que sobrevivem a um estouro do limite.
+    "provas.tasks.corrigir_provas": {"soft_time_limit": 600, "time_limit": 660},
+    "provas.tasks.recalcular_rankings": {"soft_time_limit": 60, "time_limit": 90},
+    "provas.tasks.calcular_ranking": {"soft_time_limit": 600, "time_limit": 660},
+    "provas.tasks.importar_usuarios": {"soft_time_limit": 600, "time_limit": 660},
+    "provas.tasks.gerar_relatorio": {"soft_time_limit": 600, "time_limit": 660},
+}
+# Um relatório em PROCESSANDO há mais tempo que o time_limit de gerar_relatorio
+# ficou órfão (o worker caiu) e volta a ser gerado.
+RELATORIO_TIMEOUT = CELERY_TASK_ANNOTATIONS["provas.tasks.gerar_relatorio"][
+    "time_limit"
+]
+
+CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+CELERY_BEAT_SCHEDULE = {
+    "corrigir-provas-pendentes": {
+        "task": "provas.tasks.corrigir_provas",
+        "schedule": int(os.environ.get("GRADING_SWEEP_INTERVAL", 60 * 5)),
+    },
+    "consolidar-estatisticas": {
+        "task": "provas.tasks.consolidar_estatisticas",
+        "schedule": int(os.environ.get("ESTATISTICAS_INTERVAL", 60)),
+    },
+    "reconciliar-contadores-provas": {
+        "task": "provas.tasks.reconciliar_contadores",
+        "schedule": 60 * 60,
+    },
+}
+
+# Com GRADING_FAN_OUT, corrigir_provas divide as tentativas pendentes em lotes
+# de até GRADING_CHUNK_SIZE (sempre de uma mesma prova) e os corrige em
+# paralelo com um chord de corrigir_lote; sem ele, corrige lotes desse tamanho
+# em sequência, cada um na sua transação.
+GRADING_FAN_OUT = os.environ.get("GRADING_FAN_OUT", "0") == "1"
+GRADING_CHUNK_SIZE = int(os.environ.get("GRADING_CHUNK_SIZE", 500))
+
+# Com GRADING_REALTIME, finalizar uma tentativa já enfileira a sua correção
+# (corrigir_tentativa); corrigir_provas fica só para o que ficou pendente.
+GRADING_REALTIME = os.environ.get("GRADING_REALTIME", "1") == "1"
+
+# Motor de correção: "gabarito" compara as respostas com o gabarito em cache;
+# "aggregate" calcula a nota com Sum(Case(When(...))) no banco.
+GRADING_ENGINE = os.environ.get("GRADING_ENGINE", "aggregate")
+GABARITO_CACHE_TIMEOUT = int(os.environ.get("GABARITO_CACHE_TIMEOUT", 60 * 60 * 24))
+
 NINJA_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
 }
+
+# Cache em memória de tokens já verificados (provas.auth.CachedJWTAuth).
+# TTL em segundos, limitado também pelo "exp" do próprio token. Cada acerto
+# confere a versão do usuário no cache "tokens", compartilhado entre processos.
+JWT_TOKEN_CACHE = {
+    "MAX_SIZE": int(os.environ.get("JWT_TOKEN_CACHE_MAX_SIZE", 10000)),
+    "TTL": int(os.environ.get("JWT_TOKEN_CACHE_TTL", 60)),
+}
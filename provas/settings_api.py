@@ -0,0 +1,39 @@
+"""
+Perfil do processo da API: o serviço só fala JSON com autenticação JWT, então
+sessões, CSRF, mensagens, clickjacking e o admin ficam de fora. O admin
+continua disponível rodando um processo separado com provas.settings.
+
+    DJANGO_SETTINGS_MODULE=provas.settings_api
+"""
+
+from provas.settings import *  # noqa: F403
+from provas.settings import INSTALLED_APPS, TEMPLATES
+
+APPS_FORA_DA_API = [
+    "django.contrib.admin",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+    # Só o celery_beat (DatabaseScheduler) usa; ele roda com provas.settings.
+    "django_celery_beat",
+]
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in APPS_FORA_DA_API]
+
+MIDDLEWARE = [
+    "provas.middleware.InstrumentationMiddleware",
+    "django.middleware.security.SecurityMiddleware",
+    "provas.middleware.CompressaoMiddleware",
+    "django.middleware.common.CommonMiddleware",
+]
+
+ROOT_URLCONF = "provas.urls_api"
+
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        "OPTIONS": {
+            "context_processors": ["django.template.context_processors.request"]
+        },
+    }
+]
@@ -0,0 +1,15 @@
+"""
+Perfil dos workers do Celery: parte do perfil da API e tira o ninja e o
+ninja_jwt, que só a API HTTP usa. Assim o boot do worker não importa a API,
+os schemas nem o admin. O beat continua com provas.settings, por causa do
+django_celery_beat.
+
+    DJANGO_SETTINGS_MODULE=provas.settings_worker celery -A provas worker
+"""
+
+from provas.settings_api import *  # noqa: F403
+from provas.settings_api import INSTALLED_APPS
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in ("ninja", "ninja_jwt")]
+
+MIDDLEWARE = []
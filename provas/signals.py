@@ -0,0 +1,173 @@
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.models import Prova, Questao, Resposta, RespostaParticipante, TentativaProva
+from provas import contadores, estatisticas, tasks
+from provas.correcao import invalidar_gabaritos
+
+
+def _invalidar(provas_ids):
+    provas_ids = set(provas_ids)
+    if provas_ids:
+        transaction.on_commit(lambda: invalidar_gabaritos(provas_ids))
+
+
+def _origem(origin):
+    """Modelo cuja exclusão começou a cascata (origin é instância ou queryset)."""
+    return origin.model if isinstance(origin, QuerySet) else type(origin)
+
+
+def _provas_da_questao(questao_id):
+    return Questao.provas.through.objects.filter(questao_id=questao_id).values_list(
+        "prova_id", flat=True
+    )
+
+
+@receiver(post_save, sender=Questao)
+@receiver(pre_delete, sender=Questao)
+def _questao_alterada(instance, **kwargs):
+    _invalidar(_provas_da_questao(instance.pk))
+
+
+@receiver(post_save, sender=Resposta)
+@receiver(pre_delete, sender=Resposta)
+def _resposta_alterada(instance, origin=None, **kwargs):
+    # Na exclusão da questão, _questao_alterada já invalidou os gabaritos e
+    # as estatísticas da questão saem na cascata.
+    if _origem(origin) is Questao:
+        return
+
+    provas_ids = set(_provas_da_questao(instance.questao_id))
+    _invalidar(provas_ids)
+
+    # Mudou o gabarito de uma questão já respondida: as estatísticas
+    # incrementais deixam de valer e são refeitas.
+    if RespostaParticipante.objects.filter(questao_id=instance.questao_id).exists():
+        for prova_id in provas_ids:
+            transaction.on_commit(
+                lambda prova_id=prova_id: tasks.recalcular_estatisticas.delay(prova_id)
+            )
+
+
+@receiver(m2m_changed, sender=Questao.provas.through)
+def _provas_da_questao_alteradas(instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if isinstance(instance, Prova):
+        _invalidar([instance.pk])
+        if action == "pre_clear":
+            pk_set = Questao.provas.through.objects.filter(prova_id=instance.pk).values(
+                "questao_id"
+            )
+        questoes = Questao.objects.filter(id__in=pk_set)
+    else:
+        if action == "pre_clear":
+            _invalidar(_provas_da_questao(instance.pk))
+        else:
+            _invalidar(pk_set)
+        questoes = Questao.objects.filter(id=instance.pk)
+
+    # QuestoesOut inclui as provas da questão: ela muda de versão (ETag).
+    questoes.update(date_changed=timezone.now())
+
+
+######################################################################
+# Estatísticas das questões
+######################################################################
+
+
+@receiver(post_init, sender=RespostaParticipante)
+def _guardar_resposta_original(instance, **kwargs):
+    # __dict__ para não disparar queries em campos adiados com only()/defer().
+    campos = instance.__dict__
+    instance._resposta_original = (
+        (campos.get("questao_id"), campos.get("resposta_escolhida_id"))
+        if instance.pk
+        else None
+    )
+
+
+def _registrar(tentativa_prova_id, *variacoes):
+    prova_id, nota = (
+        TentativaProva.objects.filter(id=tentativa_prova_id)
+        .values_list("prova_id", "nota")
+        .get()
+    )
+    estatisticas.registrar_respostas(prova_id, nota, variacoes)
+
+
+@receiver(post_save, sender=RespostaParticipante)
+def _resposta_participante_salva(instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    atual = (instance.questao_id, instance.resposta_escolhida_id)
+    original = None if created else instance._resposta_original
+    if atual == original:
+        return
+
+    variacoes = [(*atual, 1)]
+    if original is not None:
+        variacoes.insert(0, (*original, -1))
+    _registrar(instance.tentativa_prova_id, *variacoes)
+    instance._resposta_original = atual
+
+
+@receiver(post_delete, sender=RespostaParticipante)
+def _resposta_participante_removida(instance, origin=None, **kwargs):
+    # Em cascata, quem é apagado cuida das estatísticas em lote: a tentativa
+    # desconta suas respostas (_tentativa_removida_das_estatisticas); prova,
+    # questão e alternativa levam as próprias linhas de estatística, e a
+    # alternativa pede o recálculo (_resposta_alterada).
+    if _origem(origin) is not RespostaParticipante:
+        return
+    _registrar(instance.tentativa_prova_id, (*instance._resposta_original, -1))
+
+
+@receiver(pre_delete, sender=TentativaProva)
+def _tentativa_removida_das_estatisticas(instance, origin=None, **kwargs):
+    if _origem(origin) is Prova:
+        return
+    # A nota vem do banco: a instância pode ser anterior à correção.
+    respostas = RespostaParticipante.objects.filter(
+        tentativa_prova_id=instance.pk
+    ).values_list("questao_id", "resposta_escolhida_id", "tentativa_prova__nota")
+    if respostas := list(respostas):
+        estatisticas.registrar_respostas(
+            instance.prova_id,
+            respostas[0][2],
+            [(questao_id, resposta_id, -1) for questao_id, resposta_id, _ in respostas],
+        )
+
+
+######################################################################
+# Contadores da prova
+######################################################################
+
+
+@receiver(post_save, sender=TentativaProva)
+def _tentativa_criada(instance, created, raw=False, **kwargs):
+    if created and not raw:
+        contadores.somar(instance.prova_id, **contadores.valores_da_tentativa(instance))
+
+
+@receiver(post_delete, sender=TentativaProva)
+def _tentativa_removida(instance, origin=None, **kwargs):
+    # Apagando a prova, o resumo sai na mesma cascata.
+    if _origem(origin) is Prova:
+        return
+    contadores.somar(
+        instance.prova_id,
+        criar=False,
+        **contadores.valores_da_tentativa(instance, sinal=-1),
+    )
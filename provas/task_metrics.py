@@ -0,0 +1,174 @@
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from celery import current_app
+from celery.signals import task_failure, task_postrun, task_prerun, task_retry
+from django.conf import settings
+from django.core.cache import caches
+
+from provas.metrics import BUCKETS_SEGUNDOS, registry
+
+# As tarefas rodam em vários processos (workers e seus filhos), então as
+# métricas ficam no cache "metrics", compartilhado via Redis em produção, e
+# não no registry em memória de provas.metrics.
+FASES = ("select", "aggregate", "write", "enqueue")
+ESTADOS = ("SUCCESS", "FAILURE", "RETRY")
+CONTADORES = ("tentativas_corrigidas", "registros_ranking", "rankings_descartados")
+
+_inicios = {}
+
+
+def _cache():
+    return caches["metrics"]
+
+
+def _incr(chave, valor=1):
+    cache = _cache()
+    if cache.add(chave, valor, timeout=None):
+        return
+    try:
+        cache.incr(chave, valor)
+    except ValueError:
+        cache.set(chave, valor, timeout=None)
+
+
+def _observar(nome, segundos, *labels):
+    chave = ":".join(("tm", nome, *labels))
+    for indice, limite in enumerate(BUCKETS_SEGUNDOS):
+        if segundos <= limite:
+            _incr(f"{chave}:b{indice}")
+            break
+    _incr(f"{chave}:sum", int(segundos * 1_000_000))
+    _incr(f"{chave}:count")
+
+
+def contar(nome, valor=1):
+    _incr(f"tm:contador:{nome}", valor)
+
+
+@contextmanager
+def fase(tarefa, nome):
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        _observar("fase", time.perf_counter() - inicio, tarefa, nome)
+
+
+@task_prerun.connect
+def _task_prerun(task_id=None, **kwargs):
+    _inicios[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _task_postrun(task_id=None, task=None, state=None, **kwargs):
+    inicio = _inicios.pop(task_id, None)
+    if inicio is not None:
+        _observar("duracao", time.perf_counter() - inicio, task.name)
+    if state == "SUCCESS":
+        _incr(f"tm:estado:{task.name}:SUCCESS")
+
+
+@task_failure.connect
+def _task_failure(sender=None, **kwargs):
+    _incr(f"tm:estado:{sender.name}:FAILURE")
+
+
+@task_retry.connect
+def _task_retry(sender=None, **kwargs):
+    _incr(f"tm:estado:{sender.name}:RETRY")
+
+
+def _tarefas():
+    return sorted(nome for nome in current_app.tasks if nome.startswith("provas."))
+
+
+def _histograma(nome_metrica, chave, nomes_labels, labels, valores):
+    base = ":".join(("tm", chave, *labels))
+    if f"{base}:count" not in valores:
+        return
+
+    def formatar(extra=()):
+        pares = [*zip(nomes_labels, labels, strict=True), *extra]
+        return "{" + ",".join(f'{n}="{v}"' for n, v in pares) + "}"
+
+    acumulado = 0
+    for indice, limite in enumerate(BUCKETS_SEGUNDOS):
+        acumulado += valores.get(f"{base}:b{indice}", 0)
+        yield f"{nome_metrica}_bucket{formatar([('le', limite)])} {acumulado}"
+    total = valores[f"{base}:count"]
+    yield f"{nome_metrica}_bucket{formatar([('le', '+Inf')])} {total}"
+    yield f"{nome_metrica}_sum{formatar()} {valores.get(f'{base}:sum', 0) / 1_000_000}"
+    yield f"{nome_metrica}_count{formatar()} {total}"
+
+
+def _profundidade_filas():
+    url = settings.CELERY_BROKER_URL
+    if urlparse(url).scheme not in ("redis", "rediss"):
+        return {}
+
+    # Só o /metrics usa; importar aqui poupa o boot dos processos.
+    import redis
+
+    filas = {current_app.conf.task_default_queue}
+    filas.update(fila.name for fila in current_app.conf.task_queues or ())
+    try:
+        cliente = redis.Redis.from_url(
+            url, socket_connect_timeout=0.5, socket_timeout=0.5
+        )
+        return {fila: cliente.llen(fila) for fila in sorted(filas)}
+    except redis.RedisError:
+        return {}
+
+
+@registry.coletor
+def render():
+    tarefas = _tarefas()
+    chaves = []
+    for tarefa in tarefas:
+        labels = [(tarefa,), *((tarefa, f) for f in FASES)]
+        for label in labels:
+            nome = "duracao" if len(label) == 1 else "fase"
+            base = ":".join(("tm", nome, *label))
+            chaves += [f"{base}:b{i}" for i in range(len(BUCKETS_SEGUNDOS))]
+            chaves += [f"{base}:sum", f"{base}:count"]
+        chaves += [f"tm:estado:{tarefa}:{estado}" for estado in ESTADOS]
+    chaves += [f"tm:contador:{nome}" for nome in CONTADORES]
+    valores = _cache().get_many(chaves)
+
+    linhas = ["# TYPE celery_task_duration_seconds histogram"]
+    for tarefa in tarefas:
+        linhas += _histograma(
+            "celery_task_duration_seconds", "duracao", ("task",), (tarefa,), valores
+        )
+
+    linhas.append("# TYPE celery_task_phase_duration_seconds histogram")
+    for tarefa in tarefas:
+        for nome_fase in FASES:
+            linhas += _histograma(
+                "celery_task_phase_duration_seconds",
+                "fase",
+                ("task", "phase"),
+                (tarefa, nome_fase),
+                valores,
+            )
+
+    linhas.append("# TYPE celery_tasks_total counter")
+    for tarefa in tarefas:
+        for estado in ESTADOS:
+            valor = valores.get(f"tm:estado:{tarefa}:{estado}")
+            if valor is not None:
+                linhas.append(
+                    f'celery_tasks_total{{task="{tarefa}",state="{estado}"}} {valor}'
+                )
+
+    for nome in CONTADORES:
+        linhas.append(f"# TYPE celery_{nome}_total counter")
+        linhas.append(f"celery_{nome}_total {valores.get(f'tm:contador:{nome}', 0)}")
+
+    linhas.append("# TYPE celery_queue_depth gauge")
+    for fila, profundidade in _profundidade_filas().items():
+        linhas.append(f'celery_queue_depth{{queue="{fila}"}} {profundidade}')
+
+    return linhas
@@ -1,52 +1,258 @@
-from celery import shared_task
-from django.db.models import Case, DecimalField, F, Sum, When
+from itertools import batched
+
+from celery import chord, shared_task
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
 
 from core.models import Ranking, RegistroRanking, TentativaProva
+from provas import contadores, estatisticas, relatorios
+from provas.bulk import provisionar_usuarios
+from provas.correcao import calcular_notas, gravar_notas, pendentes
+from provas.task_metrics import contar, fase
+
+
+def _corrigir(tentativas, tarefa):
+    with fase(tarefa, "aggregate"):
+        tentativas = calcular_notas(tentativas)
+
+    with fase(tarefa, "write"):
+        tentativas = gravar_notas(tentativas)
+    contar("tentativas_corrigidas", len(tentativas))
+
+    return {tentativa.prova_id for tentativa in tentativas}
 
 
 @shared_task
-def corrigir_provas():
-    tentativas = TentativaProva.objects.filter(nota=None)
-    tentativas_ids = tentativas.values_list("id", flat=True).distinct()
+def corrigir_provas(paralelo=None):
+    if paralelo is None:
+        paralelo = settings.GRADING_FAN_OUT
+
+    tentativas = pendentes()
+
+    if paralelo:
+        with fase("provas.tasks.corrigir_provas", "select"):
+            por_prova = {}
+            for tentativa_id, prova_id in tentativas.values_list(
+                "id", "prova_id"
+            ).order_by("prova_id", "id"):
+                por_prova.setdefault(prova_id, []).append(tentativa_id)
 
-    tentativas = tentativas.annotate(
-        resultado_nota=Sum(
-            Case(
-                When(
-                    tentativas_resposta__resposta_escolhida__is_correct=True,
-                    then=F("tentativas_resposta__questao__peso"),
-                ),
-                default=0,
-                output_field=DecimalField(),
+        if not por_prova:
+            return
+
+        with fase("provas.tasks.corrigir_provas", "enqueue"):
+            chord(
+                corrigir_lote.s(list(lote))
+                for ids in por_prova.values()
+                for lote in batched(ids, settings.GRADING_CHUNK_SIZE)
+            )(recalcular_rankings.s())
+        return
+
+    # Em lotes de GRADING_CHUNK_SIZE, cada um gravado na sua transação: se a
+    # varredura estourar o soft_time_limit, o que já foi corrigido fica e a
+    # próxima varredura continua do resto. O cursor por id evita voltar às
+    # tentativas que outra correção reservou (gravar_notas as pula).
+    provas_ids = set()
+    ultimo = 0
+    try:
+        while ids := list(
+            tentativas.filter(id__gt=ultimo)
+            .order_by("id")
+            .values_list("id", flat=True)[: settings.GRADING_CHUNK_SIZE]
+        ):
+            provas_ids |= _corrigir(
+                tentativas.filter(id__in=ids), "provas.tasks.corrigir_provas"
             )
-        )
-    )
+            ultimo = ids[-1]
+    finally:
+        with fase("provas.tasks.corrigir_provas", "enqueue"):
+            for prova_id in provas_ids:
+                solicitar_ranking(prova_id)
 
-    for tentativa in tentativas:
-        tentativa.nota = tentativa.resultado_nota
-        tentativa.save()
 
-    for tentativa_id in tentativas_ids:
-        calcular_ranking.delay(tentativa_id)
+@shared_task
+def corrigir_lote(tentativas_ids):
+    tentativas = pendentes().filter(id__in=tentativas_ids)
+    return sorted(_corrigir(tentativas, "provas.tasks.corrigir_lote"))
 
 
 @shared_task
-def calcular_ranking(prova_id):
-    tentativas = (
-        TentativaProva.objects.filter(prova_id=prova_id, nota__isnull=False)
-        .select_related("user")
-        .order_by("-nota")
-    )
+def recalcular_rankings(provas_por_lote):
+    provas_ids = {prova_id for lote in provas_por_lote for prova_id in lote}
 
-    ranking, created = Ranking.objects.get_or_create(prova_id=prova_id)
+    with fase("provas.tasks.recalcular_rankings", "enqueue"):
+        for prova_id in sorted(provas_ids):
+            solicitar_ranking(prova_id)
+
+
+@shared_task
+def corrigir_tentativa(tentativa_id):
+    tentativas = pendentes().filter(id=tentativa_id)
 
-    ranking.registroranking_set.all().delete()
+    # Para uma única tentativa, a agregação no banco é uma query só.
+    with fase("provas.tasks.corrigir_tentativa", "aggregate"):
+        tentativas = calcular_notas(tentativas, motor="aggregate")
+    if not tentativas:
+        return
+
+    # Nota e ranking na mesma transação: se o worker cair no meio, a tarefa
+    # é reentregue (acks_late) e a tentativa ainda está sem nota.
+    with fase("provas.tasks.corrigir_tentativa", "write"), transaction.atomic():
+        if not gravar_notas(tentativas):
+            return
+        inserir_no_ranking(tentativas[0])
+    contar("tentativas_corrigidas")
+
+
+def inserir_no_ranking(tentativa):
+    """
+    Insere a tentativa no ranking da prova sem recalculá-lo: desloca uma
+    posição os registros com nota menor e ocupa a vaga aberta.
+    """
+    with transaction.atomic():
+        ranking, _ = Ranking.objects.select_for_update().get_or_create(
+            prova_id=tentativa.prova_id
+        )
+        registros = ranking.registroranking_set.filter(geracao=ranking.geracao_ativa)
+
+        if registros.filter(tentativa_prova_id=tentativa.id).exists():
+            transaction.on_commit(lambda: solicitar_ranking(tentativa.prova_id))
+            return
+
+        nota = int(tentativa.nota)
+        total = registros.count()
+        posicao = registros.filter(nota__gte=nota).count() + 1
+
+        # (ranking, geracao, posicao) é único: os registros passam primeiro por
+        # posições acima de total para não colidir no meio do update.
+        deslocados = registros.filter(posicao__gte=posicao)
+        deslocados.update(posicao=F("posicao") + total + 1)
+        registros.filter(posicao__gt=total).update(posicao=F("posicao") - total)
 
-    for posicao, tentativa in enumerate(tentativas, start=1):
         RegistroRanking.objects.create(
             ranking=ranking,
-            user=tentativa.user,
-            prova=tentativa.prova,
+            user_id=tentativa.user_id,
+            tentativa_prova_id=tentativa.id,
+            geracao=ranking.geracao_ativa,
             posicao=posicao,
-            nota=tentativa.nota,
+            nota=nota,
+        )
+        # A geração ativa mudou no lugar; date_changed muda o ETag do ranking.
+        ranking.save(update_fields=["date_changed"])
+    contar("registros_ranking")
+
+
+@shared_task
+def gerar_relatorio(relatorio_id):
+    # Reentregue depois que o worker caiu, a tarefa encontra o relatório em
+    # PROCESSANDO; reservar só o devolve quando já passou do time_limit.
+    relatorio = relatorios.reservar(relatorio_id)
+    if relatorio is not None:
+        relatorios.gerar(relatorio)
+
+
+@shared_task
+def recalcular_estatisticas(prova_id):
+    estatisticas.recalcular(prova_id)
+
+
+@shared_task
+def consolidar_estatisticas():
+    estatisticas.consolidar()
+
+
+@shared_task
+def reconciliar_contadores():
+    return contadores.reconciliar()
+
+
+@shared_task
+def importar_usuarios(usuarios, senhas_hash=False):
+    criados, ignorados = provisionar_usuarios(usuarios, senhas_hash=senhas_hash)
+    return {"criados": criados, "ignorados": ignorados}
+
+
+def solicitar_ranking(prova_id):
+    """
+    Enfileira o recálculo do ranking da prova com uma nova geração. Se outro
+    recálculo for solicitado antes deste rodar, este é descartado.
+    """
+    with transaction.atomic():
+        ranking, _ = Ranking.objects.select_for_update().get_or_create(
+            prova_id=prova_id
         )
+        ranking.geracao_solicitada += 1
+        ranking.save(update_fields=["geracao_solicitada"])
+
+    calcular_ranking.delay(prova_id, ranking.geracao_solicitada)
+
+
+@shared_task
+def calcular_ranking(prova_id, geracao=None):
+    if geracao is None:
+        with transaction.atomic():
+            ranking, _ = Ranking.objects.select_for_update().get_or_create(
+                prova_id=prova_id
+            )
+            ranking.geracao_solicitada += 1
+            ranking.save(update_fields=["geracao_solicitada"])
+        geracao = ranking.geracao_solicitada
+    elif Ranking.objects.filter(
+        prova_id=prova_id, geracao_solicitada__gt=geracao
+    ).exists():
+        contar("rankings_descartados")
+        return
+
+    # A geração nova é gravada ao lado da ativa; os leitores continuam vendo
+    # a ativa até a troca do ponteiro, na mesma transação.
+    with fase("provas.tasks.calcular_ranking", "select"):
+        tentativas = list(
+            TentativaProva.objects.filter(prova_id=prova_id, nota__isnull=False)
+            .order_by("-nota")
+            .values_list("id", "user_id", "nota")
+        )
+
+    with fase("provas.tasks.calcular_ranking", "write"), transaction.atomic():
+        ranking = Ranking.objects.get(prova_id=prova_id)
+        # Reentregue (acks_late) depois de gravar, a tarefa regrava a geração.
+        ranking.registroranking_set.filter(geracao=geracao).delete()
+        RegistroRanking.objects.bulk_create(
+            (
+                RegistroRanking(
+                    ranking=ranking,
+                    user_id=user_id,
+                    tentativa_prova_id=tentativa_id,
+                    geracao=geracao,
+                    posicao=posicao,
+                    nota=nota,
+                )
+                for posicao, (tentativa_id, user_id, nota) in enumerate(
+                    tentativas, start=1
+                )
+            ),
+            batch_size=settings.BULK_BATCH_SIZE,
+        )
+
+        ranking = Ranking.objects.select_for_update().get(prova_id=prova_id)
+        if geracao > ranking.geracao_ativa:
+            ranking.geracao_ativa = geracao
+            ranking.save(update_fields=["geracao_ativa", "date_changed"])
+
+            # Uma tentativa corrigida durante a leitura acima ficaria de
+            # fora desta geração.
+            corrigidas = TentativaProva.objects.filter(
+                prova_id=prova_id, nota__isnull=False
+            ).count()
+            if corrigidas != len(tentativas):
+                transaction.on_commit(lambda: solicitar_ranking(prova_id))
+
+        transaction.on_commit(lambda: limpar_rankings.delay(prova_id))
+    contar("registros_ranking", len(tentativas))
+
+
+@shared_task
+def limpar_rankings(prova_id):
+    ranking = Ranking.objects.filter(prova_id=prova_id).first()
+    if ranking is not None:
+        ranking.registroranking_set.filter(geracao__lt=ranking.geracao_ativa).delete()
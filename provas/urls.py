@@ -2,5 +2,10 @@ from django.contrib import admin
 from django.urls import path
 
 from .api import api
+from .views import metrics
 
-urlpatterns = [path("admin/", admin.site.urls), path("api/", api.urls)]
+urlpatterns = [
+    path("admin/", admin.site.urls),
+    path("api/", api.urls),
+    path("metrics", metrics),
+]
@@ -0,0 +1,9 @@
+from django.urls import path
+
+from .api import api
+from .views import metrics
+
+urlpatterns = [
+    path("api/", api.urls),
+    path("metrics", metrics),
+]
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+from provas import task_metrics  # noqa: F401 - registra o coletor das tarefas
+from provas.metrics import registry
+
+
+def metrics(request):
+    ips = settings.METRICS_ALLOWED_IPS
+    if ips and request.META.get("REMOTE_ADDR") not in ips:
+        return HttpResponseForbidden()
+
+    return HttpResponse(
+        registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )